@@ -0,0 +1,29 @@
+"""ingest_fetches: article download and AI rewrite timings
+
+Revision ID: 0a1b2c3d4e5f
+Revises: 9e0f1a2b3c4d
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0a1b2c3d4e5f"
+down_revision: Union[str, Sequence[str], None] = "9e0f1a2b3c4d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("ingest_fetches") as batch:
+        batch.add_column(sa.Column("article_ms", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("ai_ms", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("ingest_fetches") as batch:
+        batch.drop_column("ai_ms")
+        batch.drop_column("article_ms")
@@ -0,0 +1,30 @@
+"""add catalog_versions table
+
+Revision ID: 1c2d3e4f5a6b
+Revises: 9a8b7c6d5e4f
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "1c2d3e4f5a6b"
+down_revision: Union[str, Sequence[str], None] = "9a8b7c6d5e4f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    catalog_versions = op.create_table(
+        "catalog_versions",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.bulk_insert(catalog_versions, [{"name": "topics", "version": 0}])
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_versions")
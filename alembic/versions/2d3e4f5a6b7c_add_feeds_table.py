@@ -0,0 +1,44 @@
+"""add feeds table (conditional GET validators + high-water mark)
+
+Revision ID: 2d3e4f5a6b7c
+Revises: 1c2d3e4f5a6b
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "2d3e4f5a6b7c"
+down_revision: Union[str, Sequence[str], None] = "1c2d3e4f5a6b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "feeds",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "topic_id",
+            sa.Integer(),
+            sa.ForeignKey("topics.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("url", sa.String(length=1024), nullable=False),
+        sa.Column("etag", sa.String(length=255), nullable=True),
+        sa.Column("last_modified", sa.String(length=64), nullable=True),
+        sa.Column("last_content_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_entry_id", sa.String(length=1024), nullable=True),
+        sa.Column("last_entry_published_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("url"),
+    )
+    op.create_index("ix_feeds_topic_id", "feeds", ["topic_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feeds_topic_id", table_name="feeds")
+    op.drop_table("feeds")
@@ -0,0 +1,43 @@
+"""feed registry: activation and adaptive polling schedule
+
+Revision ID: 3e4f5a6b7c8d
+Revises: 2d3e4f5a6b7c
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "3e4f5a6b7c8d"
+down_revision: Union[str, Sequence[str], None] = "2d3e4f5a6b7c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("feeds") as batch:
+        batch.add_column(sa.Column("is_active", sa.Boolean(), nullable=False, server_default="1"))
+        batch.add_column(sa.Column(
+            "poll_interval_minutes", sa.Integer(), nullable=False, server_default="360"))
+        batch.add_column(sa.Column(
+            "next_fetch_at", sa.DateTime(), nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP")))
+        batch.add_column(sa.Column("last_fetch_at", sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column("last_status", sa.String(length=20), nullable=True))
+        batch.add_column(sa.Column("last_error", sa.String(length=255), nullable=True))
+        batch.add_column(sa.Column("failure_streak", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("avg_new_entries", sa.Float(), nullable=False, server_default="0"))
+    op.create_index("ix_feeds_due", "feeds", ["is_active", "next_fetch_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feeds_due", table_name="feeds")
+    with op.batch_alter_table("feeds") as batch:
+        for column in (
+            "avg_new_entries", "failure_streak", "last_error", "last_status",
+            "last_fetch_at", "next_fetch_at", "poll_interval_minutes", "is_active",
+        ):
+            batch.drop_column(column)
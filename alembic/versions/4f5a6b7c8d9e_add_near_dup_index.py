@@ -0,0 +1,44 @@
+"""near-duplicate detection: tips.minhash and tip_lsh_buckets
+
+Revision ID: 4f5a6b7c8d9e
+Revises: 3e4f5a6b7c8d
+Create Date: 2026-10-19
+
+Existing tips are indexed with `python -m app.scripts.rebuild_near_dup_index`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "4f5a6b7c8d9e"
+down_revision: Union[str, Sequence[str], None] = "3e4f5a6b7c8d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("tips") as batch:
+        batch.add_column(sa.Column("minhash", sa.LargeBinary(), nullable=True))
+    op.create_table(
+        "tip_lsh_buckets",
+        sa.Column(
+            "tip_id",
+            sa.Integer(),
+            sa.ForeignKey("tips.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("bucket", sa.BigInteger(), primary_key=True),
+        sa.Column("topic_id", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_tip_lsh_buckets_bucket", "tip_lsh_buckets", ["bucket"])
+    op.create_index("ix_tip_lsh_buckets_topic", "tip_lsh_buckets", ["topic_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tip_lsh_buckets_topic", table_name="tip_lsh_buckets")
+    op.drop_index("ix_tip_lsh_buckets_bucket", table_name="tip_lsh_buckets")
+    op.drop_table("tip_lsh_buckets")
+    with op.batch_alter_table("tips") as batch:
+        batch.drop_column("minhash")
@@ -0,0 +1,27 @@
+"""add tips.quality_score
+
+Revision ID: 5a6b7c8d9e0f
+Revises: 4f5a6b7c8d9e
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "5a6b7c8d9e0f"
+down_revision: Union[str, Sequence[str], None] = "4f5a6b7c8d9e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("tips") as batch:
+        batch.add_column(sa.Column("quality_score", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("tips") as batch:
+        batch.drop_column("quality_score")
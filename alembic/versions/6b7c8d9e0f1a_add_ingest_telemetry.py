@@ -0,0 +1,66 @@
+"""ingest telemetry: ingest_runs and ingest_fetches
+
+Revision ID: 6b7c8d9e0f1a
+Revises: 5a6b7c8d9e0f
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "6b7c8d9e0f1a"
+down_revision: Union[str, Sequence[str], None] = "5a6b7c8d9e0f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingest_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("feeds", sa.Integer(), nullable=False),
+        sa.Column("new_tips", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_ingest_runs_started_at", "ingest_runs", ["started_at"])
+    op.create_table(
+        "ingest_fetches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "run_id",
+            sa.Integer(),
+            sa.ForeignKey("ingest_runs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "feed_id",
+            sa.Integer(),
+            sa.ForeignKey("feeds.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("http_status", sa.Integer(), nullable=True),
+        sa.Column("error", sa.String(length=255), nullable=True),
+        sa.Column("bytes", sa.Integer(), nullable=False),
+        sa.Column("entries_seen", sa.Integer(), nullable=False),
+        sa.Column("duplicates", sa.Integer(), nullable=False),
+        sa.Column("new_tips", sa.Integer(), nullable=False),
+        sa.Column("fetch_ms", sa.Integer(), nullable=False),
+        sa.Column("parse_ms", sa.Integer(), nullable=False),
+        sa.Column("db_ms", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_ingest_fetches_run_id", "ingest_fetches", ["run_id"])
+    op.create_index("ix_ingest_fetches_feed_id", "ingest_fetches", ["feed_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingest_fetches_feed_id", table_name="ingest_fetches")
+    op.drop_index("ix_ingest_fetches_run_id", table_name="ingest_fetches")
+    op.drop_table("ingest_fetches")
+    op.drop_index("ix_ingest_runs_started_at", table_name="ingest_runs")
+    op.drop_table("ingest_runs")
@@ -0,0 +1,31 @@
+"""ingest_runs: tip generator counters (requests, fallbacks, breaker opens)
+
+Revision ID: 7c8d9e0f1a2b
+Revises: 6b7c8d9e0f1a
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "7c8d9e0f1a2b"
+down_revision: Union[str, Sequence[str], None] = "6b7c8d9e0f1a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("ingest_runs") as batch:
+        batch.add_column(sa.Column("ai_requests", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("ai_fallbacks", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("breaker_opens", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("ingest_runs") as batch:
+        batch.drop_column("breaker_opens")
+        batch.drop_column("ai_fallbacks")
+        batch.drop_column("ai_requests")
@@ -0,0 +1,27 @@
+"""feeds: deleted_at tombstone so deleted seed feeds are not re-registered
+
+Revision ID: 9e0f1a2b3c4d
+Revises: 8d9e0f1a2b3c
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "9e0f1a2b3c4d"
+down_revision: Union[str, Sequence[str], None] = "8d9e0f1a2b3c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("feeds") as batch:
+        batch.add_column(sa.Column("deleted_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("feeds") as batch:
+        batch.drop_column("deleted_at")
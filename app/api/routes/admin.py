@@ -5,8 +5,13 @@ from sqlalchemy import select
 from app.db.session import get_db
 from app.db.models import User
 from app.api.deps import require_admin
+from app.schemas.feed import FeedCreate, FeedList, FeedRead, FeedUpdate
+from app.schemas.ingest import IngestReport
 from app.schemas.tip import TipList, TipRead
+from app.services.feeds import create_feed, delete_feed, get_feed, list_feeds, update_feed
+from app.services.ingest_telemetry import ingest_report
 from app.services.tips import list_tips, get_tip
+from app.core.response_cache import invalidate_public_cache
 
 
 # Create an APIRouter instance for admin-related endpoints
@@ -112,4 +117,94 @@ def update_tip_status(
     db.add(tip)
     db.commit()
     db.refresh(tip)
+    invalidate_public_cache("/tips")
     return tip
+
+
+# ------------------------------
+# Feed registry
+# ------------------------------
+def _feed_error(e: ValueError) -> HTTPException:
+    msg = str(e)
+    code = status.HTTP_400_BAD_REQUEST if "Topic" in msg else status.HTTP_409_CONFLICT
+    return HTTPException(status_code=code, detail=msg)
+
+
+def _get_feed_or_404(db: Session, feed_id: int):
+    feed = get_feed(db, feed_id)
+    if not feed:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Feed not found")
+    return feed
+
+
+@router.get("/feeds", response_model=FeedList)
+def list_feeds_for_admin(
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=200),
+    topic_id: int | None = Query(None),
+    is_active: bool | None = Query(None),
+    db: Session = Depends(get_db),
+    _admin=Depends(require_admin),
+):
+    items, total = list_feeds(
+        db, page=page, size=size, topic_id=topic_id, is_active=is_active)
+    return FeedList(total=total, page=page, size=size, items=items)
+
+
+@router.post("/feeds", response_model=FeedRead, status_code=status.HTTP_201_CREATED)
+def create_feed_for_admin(
+    payload: FeedCreate,
+    db: Session = Depends(get_db),
+    _admin=Depends(require_admin),
+):
+    try:
+        return create_feed(db, payload)
+    except ValueError as e:
+        raise _feed_error(e)
+
+
+@router.get("/feeds/{feed_id}", response_model=FeedRead)
+def get_feed_for_admin(
+    feed_id: int,
+    db: Session = Depends(get_db),
+    _admin=Depends(require_admin),
+):
+    return _get_feed_or_404(db, feed_id)
+
+
+@router.patch("/feeds/{feed_id}", response_model=FeedRead)
+def update_feed_for_admin(
+    feed_id: int,
+    payload: FeedUpdate,
+    db: Session = Depends(get_db),
+    _admin=Depends(require_admin),
+):
+    feed = _get_feed_or_404(db, feed_id)
+    try:
+        return update_feed(db, feed, payload)
+    except ValueError as e:
+        raise _feed_error(e)
+
+
+@router.delete("/feeds/{feed_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_feed_for_admin(
+    feed_id: int,
+    db: Session = Depends(get_db),
+    _admin=Depends(require_admin),
+):
+    delete_feed(db, _get_feed_or_404(db, feed_id))
+    return
+
+
+# ------------------------------
+# Ingestion telemetry
+# ------------------------------
+@router.get("/ingest/runs", response_model=IngestReport)
+def ingest_runs_for_admin(
+    runs: int = Query(20, ge=1, le=200),
+    slowest: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    _admin=Depends(require_admin),
+):
+    return ingest_report(db, runs=runs, slowest=slowest)
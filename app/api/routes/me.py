@@ -7,11 +7,12 @@ from zoneinfo import ZoneInfo
 
 from app.db.session import get_db
 from app.api.deps import get_current_active_user
-from app.schemas.tip import TodayTips, TipRead
+from app.schemas.tip import TodayTips
 from app.db.models import User
 from app.schemas.me_tips import HistoryList, DeliveryStatusResponse
 from app.schemas.preferences import UserPreferencesRead, UserPreferencesUpdate
 from app.core.timezones import resolve_effective_timezone
+from app.api.serialize import FastJSONResponse, tip_read_dicts
 
 from app.services.tips import (
     register_deliveries_if_missing,
@@ -95,14 +96,14 @@ def get_my_today_tips(
         db, user_id=current_user.id, tips=tips_flat, channel="app", status="sent"
     )
 
-    # Build response items as Pydantic models.
-    items = [TipRead.model_validate(t) for t in tips_flat]
+    # Build the TodayTips shape directly from trusted ORM rows (no re-validation).
+    items = tip_read_dicts(tips_flat)
     # TodayTips intentionally omits plan metadata to keep the response stable.
-    return TodayTips(
-        date=datetime.now(ZoneInfo(tz_effective)).date(),
-        count=len(items),
-        items=items,
-    )
+    return FastJSONResponse({
+        "date": datetime.now(ZoneInfo(tz_effective)).date(),
+        "count": len(items),
+        "items": items,
+    })
 
 
 @router.get("/tips/history", response_model=HistoryList)
@@ -124,8 +125,14 @@ def get_my_tips_history(
         size=size,
         topic_id=topic_id,
     )
-    # Return a typed, paginated response.
-    return HistoryList(user_id=current_user.id, page=page, size=size, total=total, items=items)
+    # Items already follow the HistoryItem shape; encode without re-validation.
+    return FastJSONResponse({
+        "user_id": current_user.id,
+        "page": page,
+        "size": size,
+        "total": total,
+        "items": items,
+    })
 
 
 @router.patch("/tips/{delivery_id}/read", response_model=DeliveryStatusResponse)
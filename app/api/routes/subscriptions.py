@@ -7,6 +7,7 @@ from app.db.session import get_db
 from app.db import models
 from app.schemas.subscription import SubscriptionRead
 from app.api.deps import get_current_active_user
+from app.services.topic_catalog import get_topic
 
 # Create router for subscription-related endpoints
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
@@ -37,8 +38,8 @@ def subscribe(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
-    # Find topic by ID
-    topic = db.query(models.Topic).get(payload.topic_id)
+    # Find topic by ID (in-memory catalog)
+    topic = get_topic(db, payload.topic_id)
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found.")
     if not topic.is_active:
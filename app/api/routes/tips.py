@@ -6,6 +6,8 @@ from app.db.session import get_db
 from app.schemas.tip import TipCreate, TipRead, TipUpdate, TipList
 from app.services.tips import create_tip, get_tip, list_tips, update_tip, hard_delete_tip
 from app.api.deps import get_current_active_user, require_admin
+from app.core.response_cache import invalidate_public_cache
+from app.api.serialize import FastJSONResponse, tip_read_dicts
 
 # Create a router for all "tips" endpoints
 router = APIRouter(prefix="/tips", tags=["tips"])
@@ -22,8 +24,13 @@ def list_tips_endpoint(
 ):
     # Call service layer to get paginated list and total count
     items, total = list_tips(db, page=page, size=size, topic_id=topic_id, q=q)
-    # Return a TipList schema with metadata and items
-    return TipList(total=total, page=page, size=size, items=items)
+    # Return the TipList shape, encoded without re-validating trusted rows
+    return FastJSONResponse({
+        "total": total,
+        "page": page,
+        "size": size,
+        "items": tip_read_dicts(items),
+    })
 
 
 # Get a single tip by its ID
@@ -47,12 +54,14 @@ def create_tip_endpoint(
 ):
     try:
         # Try to create a new tip using the service layer
-        return create_tip(db, payload)
+        tip = create_tip(db, payload)
     except ValueError as e:
         # Handle errors from service (e.g. invalid topic or duplicate)
         msg = str(e)
         code = status.HTTP_400_BAD_REQUEST if "Topic" in msg else status.HTTP_409_CONFLICT
         raise HTTPException(status_code=code, detail=msg)
+    invalidate_public_cache("/tips")
+    return tip
 
 
 # Update an existing tip (requires admin privileges)
@@ -70,7 +79,9 @@ def update_tip_endpoint(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Tip not found")
     # Apply updates and return the updated tip
-    return update_tip(db, tip, payload)
+    tip = update_tip(db, tip, payload)
+    invalidate_public_cache("/tips")
+    return tip
 
 
 # Permanently delete a tip (requires admin privileges)
@@ -87,3 +98,4 @@ def delete_tip_endpoint(
         return
     # Permanently remove tip from database
     hard_delete_tip(db, tip_id)
+    invalidate_public_cache("/tips")
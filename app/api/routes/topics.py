@@ -7,6 +7,13 @@ from app.db.session import get_db
 from app.db import models
 from app.schemas.topic import TopicCreate, TopicUpdate, TopicRead
 from app.api.deps import get_current_active_user, require_admin
+from app.core.response_cache import invalidate_public_cache
+from app.services.topic_catalog import (
+    commit_topic_changes,
+    get_topic_catalog,
+    get_topic as get_catalog_topic,
+    get_topic_by_slug as get_catalog_topic_by_slug,
+)
 
 # Create router for topic-related endpoints
 router = APIRouter(prefix="/topics", tags=["topics"])
@@ -21,25 +28,26 @@ def list_topics(
     only_active: bool = False,
     db: Session = Depends(get_db),
 ):
-    # Build base query
-    query = db.query(models.Topic)
-    # Filter by search string (matches name or slug)
+    # Read from the in-memory catalog snapshot (ordered by id)
+    topics = get_topic_catalog(db).entries
+    # Filter by search string (case-insensitive, matches name or slug)
     if q:
-        like = f"%{q}%"
-        query = query.filter(
-            (models.Topic.name.ilike(like)) | (models.Topic.slug.ilike(like))
-        )
+        needle = q.lower()
+        topics = [
+            t for t in topics
+            if needle in t.name.lower() or needle in t.slug.lower()
+        ]
     # Optionally filter only active topics
     if only_active:
-        query = query.filter(models.Topic.is_active.is_(True))
+        topics = [t for t in topics if t.is_active]
     # Apply pagination and return results
-    return query.offset(skip).limit(limit).all()
+    return list(topics[skip:skip + limit])
 
 
 # Get a topic by its ID
 @router.get("/{topic_id}", response_model=TopicRead)
 def get_topic(topic_id: int, db: Session = Depends(get_db)):
-    topic = db.query(models.Topic).get(topic_id)
+    topic = get_catalog_topic(db, topic_id)
     if not topic:
         # Return 404 if topic not found
         raise HTTPException(status_code=404, detail="Topic not found.")
@@ -49,7 +57,7 @@ def get_topic(topic_id: int, db: Session = Depends(get_db)):
 # Get a topic by its slug
 @router.get("/by-slug/{slug}", response_model=TopicRead)
 def get_topic_by_slug(slug: str, db: Session = Depends(get_db)):
-    topic = db.query(models.Topic).filter(models.Topic.slug == slug).first()
+    topic = get_catalog_topic_by_slug(db, slug)
     if not topic:
         # Return 404 if topic not found
         raise HTTPException(status_code=404, detail="Topic not found.")
@@ -70,13 +78,14 @@ def create_topic(
     )
     db.add(new_topic)
     try:
-        db.commit()  # Save changes
+        commit_topic_changes(db)  # Save changes and bump catalog version
     except IntegrityError:
         db.rollback()  # Undo transaction if slug already exists
         raise HTTPException(
             status_code=400, detail="Topic with this slug already exists."
         )
     db.refresh(new_topic)  # Reload instance with DB-generated values
+    invalidate_public_cache("/topics")
     return new_topic
 
 
@@ -103,13 +112,14 @@ def update_topic(
     topic.slug = payload.slug
     topic.is_active = payload.is_active
     try:
-        db.commit()
+        commit_topic_changes(db)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
             status_code=400, detail="Topic with this slug already exists."
         )
     db.refresh(topic)
+    invalidate_public_cache("/topics")
     return topic
 
 
@@ -133,13 +143,14 @@ def patch_topic(
     if payload.is_active is not None:
         topic.is_active = payload.is_active
     try:
-        db.commit()
+        commit_topic_changes(db)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
             status_code=400, detail="Topic with this slug already exists."
         )
     db.refresh(topic)
+    invalidate_public_cache("/topics")
     return topic
 
 
@@ -156,5 +167,7 @@ def delete_topic(
         # Return 404 if topic not found
         raise HTTPException(status_code=404, detail="Topic not found.")
     db.delete(topic)
-    db.commit()  # Commit deletion
+    commit_topic_changes(db)  # Commit deletion and bump catalog version
+    # Deleting a topic cascades to its tips
+    invalidate_public_cache("/topics", "/tips")
     return None
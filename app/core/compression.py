@@ -0,0 +1,126 @@
+"""
+Compresión negociada (br/gzip) de respuestas de la API.
+
+Solo se comprimen cuerpos completos (no streaming) de tipos de texto/JSON por
+encima de COMPRESSION_MIN_BYTES. Las respuestas que ya traen Content-Encoding
+(p. ej. los estáticos precomprimidos) pasan tal cual. Brotli es opcional:
+si el paquete `brotli` no está instalado, se negocia solo gzip.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # dependencia opcional: pip install brotli
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "text/html",
+    "text/css",
+    "text/javascript",
+    "text/plain",
+)
+
+MIN_SIZE = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+
+def _accepted_codings(accept_encoding: str) -> dict[str, float]:
+    """Parsea Accept-Encoding a {coding: q}."""
+    codings: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[token.strip().lower()] = q
+    return codings
+
+
+def negotiate_encoding(accept_encoding: str, available: tuple[str, ...]) -> Optional[str]:
+    """Elige la primera codificación de `available` aceptada con q > 0."""
+    codings = _accepted_codings(accept_encoding)
+    for coding in available:
+        q = codings.get(coding, codings.get("*", 0.0))
+        if q > 0:
+            return coding
+    return None
+
+
+def supported_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = MIN_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), supported_encodings()
+        )
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+
+            initial, start = start, None
+            headers = MutableHeaders(raw=initial["headers"])
+            body = message.get("body", b"")
+            compressible = headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+            if (
+                message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or "content-encoding" in headers
+                or not compressible
+            ):
+                await send(initial)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) >= self.minimum_size:
+                body = compress(body, coding)
+                headers["Content-Encoding"] = coding
+                headers["Content-Length"] = str(len(body))
+                message = {**message, "body": body}
+            await send(initial)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,214 @@
+"""
+Caché HTTP en proceso para los GET públicos (/topics, /tips).
+
+Middleware ASGI: un acierto responde directamente desde memoria, sin entrar en
+el router, SQLAlchemy ni la serialización de Pydantic. Añade ETag y
+Cache-Control, responde 304 a If-None-Match y limita el tamaño total con una
+expulsión LRU por bytes. Las escrituras de admin sobre tips/topics invalidan
+por prefijo; los cambios hechos desde otros procesos (ingesta, otros workers)
+se ven como mucho tras RESPONSE_CACHE_MAX_AGE segundos.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Prefijos de rutas públicas (sin autenticación) que se pueden cachear.
+CACHEABLE_PREFIXES = ("/topics", "/tips")
+
+MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+MAX_AGE_SECONDS = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "30"))
+
+_SKIPPED_HEADERS = {b"content-length", b"etag", b"cache-control"}
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    headers: tuple[tuple[bytes, bytes], ...]
+    etag: str
+    stored_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+
+class ResponseCache:
+    """LRU acotado por bytes con caducidad por antigüedad."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES, ttl: float = MAX_AGE_SECONDS) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def current_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, *prefixes: str) -> None:
+        """Borra las entradas cuyo path empieza por algún prefijo (todas si no hay)."""
+        with self._lock:
+            if not prefixes:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for key in [k for k in self._entries if _matches(k, prefixes)]:
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+# Instancia compartida por el middleware y las rutas que escriben.
+response_cache = ResponseCache()
+
+
+def invalidate_public_cache(*prefixes: str) -> None:
+    response_cache.invalidate(*prefixes)
+
+
+def _matches(path: str, prefixes: tuple[str, ...]) -> bool:
+    return any(path == p or path.startswith(p + "/") or path.startswith(p + "?")
+               for p in prefixes)
+
+
+def cache_key(scope: Scope) -> str:
+    """Path sin barra final + query string con parámetros ordenados."""
+    path = scope["path"].rstrip("/") or "/"
+    query = scope.get("query_string", b"").decode("latin-1")
+    if not query:
+        return path
+    params = sorted(parse_qsl(query, keep_blank_values=True))
+    return f"{path}?{urlencode(params)}"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (c.strip() for c in if_none_match.split(","))
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+class ResponseCacheMiddleware:
+    def __init__(self, app: ASGIApp, cache: ResponseCache = response_cache) -> None:
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not _matches(scope["path"], CACHEABLE_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope)
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            await self._send_cached(send, cached, if_none_match)
+            return
+
+        start: Message = {}
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def capture(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                if message["status"] != 200:
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = tuple(
+                (k, v) for k, v in start.get("headers", [])
+                if k.lower() not in _SKIPPED_HEADERS
+            )
+            entry = CachedResponse(
+                body=body,
+                headers=headers,
+                etag=f"\"{hashlib.blake2b(body, digest_size=16).hexdigest()}\"",
+                stored_at=time.monotonic(),
+            )
+            self.cache.put(key, entry)
+            await self._send_cached(send, entry, if_none_match)
+
+        await self.app(scope, receive, capture)
+
+    async def _send_cached(self, send: Send, entry: CachedResponse, if_none_match: str) -> None:
+        validators = [
+            (b"etag", entry.etag.encode("latin-1")),
+            (b"cache-control", f"public, max-age={MAX_AGE_SECONDS}".encode("latin-1")),
+        ]
+        if _etag_matches(if_none_match, entry.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers = [
+            *entry.headers,
+            (b"content-length", str(len(entry.body)).encode("latin-1")),
+            *validators,
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
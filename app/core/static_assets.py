@@ -0,0 +1,126 @@
+"""
+Estáticos del MVP con URLs con hash de contenido y copias precomprimidas.
+
+- Al arrancar se calcula un hash de cada fichero de static/ y se expone con una
+  URL versionada (`/static/app.<hash>.js`), servida con caché inmutable de un año.
+  index.html se reescribe para apuntar a esas URLs.
+- Si existen `<fichero>.br` / `<fichero>.gz` (generados con
+  `python -m app.scripts.build_static`) y el cliente los acepta, se sirven
+  directamente con Content-Encoding, sin comprimir en cada petición.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import stat
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.compression import negotiate_encoding
+
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+def hashed_name(relative: str, digest: str) -> str:
+    """app.js + 3f2a… -> app.3f2a….js"""
+    stem, dot, ext = relative.rpartition(".")
+    if not dot:
+        return f"{relative}.{digest}"
+    return f"{stem}.{digest}.{ext}"
+
+
+class AssetManifest:
+    """Mapa nombre original <-> nombre con hash de los ficheros de un directorio."""
+
+    def __init__(self, directory: Path, url_prefix: str = "/static") -> None:
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.hashed: dict[str, str] = {}
+        self.original: dict[str, str] = {}
+        for path in sorted(self.directory.rglob("*")):
+            if not path.is_file() or path.suffix in (".gz", ".br"):
+                continue
+            relative = path.relative_to(self.directory).as_posix()
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+            name = hashed_name(relative, digest)
+            self.hashed[relative] = name
+            self.original[name] = relative
+
+    def url(self, relative: str) -> str:
+        return f"{self.url_prefix}/{self.hashed.get(relative, relative)}"
+
+    def rewrite_html(self, text: str) -> str:
+        """Sustituye las referencias /static/<fichero> por su URL con hash."""
+        for relative in self.hashed:
+            text = text.replace(
+                f'"{self.url_prefix}/{relative}"', f'"{self.url(relative)}"'
+            )
+        return text
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    def __init__(self, *, directory: Path, manifest: AssetManifest) -> None:
+        super().__init__(directory=directory)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        original = self.manifest.original.get(path)
+        target = original or path
+
+        response = await self._precompressed_response(target, scope)
+        if response is None:
+            response = await super().get_response(target, scope)
+
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = (
+                IMMUTABLE_CACHE if original is not None else REVALIDATE_CACHE
+            )
+        return response
+
+    async def _precompressed_response(self, target: str, scope: Scope) -> Optional[Response]:
+        if scope["method"] not in ("GET", "HEAD"):
+            return None
+        request_headers = Headers(scope=scope)
+        available = tuple(
+            coding for coding, suffix in PRECOMPRESSED_SUFFIXES.items()
+            if self._is_fresh_copy(target, target + suffix)
+        )
+        coding = negotiate_encoding(request_headers.get("accept-encoding", ""), available)
+        if coding is None:
+            return None
+
+        full_path, stat_result = await anyio.to_thread.run_sync(
+            self.lookup_path, target + PRECOMPRESSED_SUFFIXES[coding]
+        )
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return None
+
+        media_type = mimetypes.guess_type(target)[0] or "application/octet-stream"
+        response = FileResponse(
+            full_path,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers={"Content-Encoding": coding, "Vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _is_fresh_copy(self, target: str, copy: str) -> bool:
+        """La copia existe y no es más antigua que el original."""
+        try:
+            source_mtime = os.stat(os.path.join(self.directory, target)).st_mtime
+            copy_mtime = os.stat(os.path.join(self.directory, copy)).st_mtime
+        except OSError:
+            return False
+        return copy_mtime >= source_mtime
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 
 from sqlalchemy import (
-    String, Integer, Boolean, DateTime, ForeignKey, Text,
+    String, Integer, BigInteger, Boolean, Date, DateTime, Float, ForeignKey,
+    LargeBinary, Text,
     UniqueConstraint, Index
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -66,6 +67,8 @@ class Topic(Base):
         back_populates="topic", cascade="all, delete-orphan")
     subscriptions: Mapped[List["Subscription"]
                           ] = relationship(back_populates="topic")
+    feeds: Mapped[List["Feed"]] = relationship(
+        back_populates="topic", cascade="all, delete-orphan")
 
 
 # -------------------------------
@@ -113,6 +116,10 @@ class Tip(Base):
     source_url: Mapped[Optional[str]] = mapped_column(String(1024))
     fingerprint: Mapped[Optional[str]] = mapped_column(
         String(64), index=True)  # Used for deduplication
+    # 0-100, computed at ingest (app/services/quality.py)
+    quality_score: Mapped[Optional[int]] = mapped_column(Integer)
+    # MinHash signature for near-duplicate detection (app/services/near_dup.py)
+    minhash: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False)
 
@@ -122,6 +129,23 @@ class Tip(Base):
         back_populates="tip", cascade="all, delete-orphan")
 
 
+# -------------------------------
+# TIP LSH BUCKET MODEL
+# -------------------------------
+class TipLshBucket(Base):
+    """One row per (tip, LSH band bucket); looked up by bucket only."""
+    __tablename__ = "tip_lsh_buckets"
+    __table_args__ = (
+        Index("ix_tip_lsh_buckets_bucket", "bucket"),
+        Index("ix_tip_lsh_buckets_topic", "topic_id"),
+    )
+
+    tip_id: Mapped[int] = mapped_column(ForeignKey(
+        "tips.id", ondelete="CASCADE"), primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    topic_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 # -------------------------------
 # DELIVERY MODEL
 # -------------------------------
@@ -146,3 +170,146 @@ class Delivery(Base):
     # Relationships
     tip: Mapped["Tip"] = relationship(back_populates="deliveries")
     user: Mapped["User"] = relationship(back_populates="deliveries")
+
+
+# -------------------------------
+# FEED MODEL
+# -------------------------------
+class Feed(Base):
+    __tablename__ = "feeds"
+    __table_args__ = (
+        # El planificador solo lee los feeds activos cuyo next_fetch_at ya pasó
+        Index("ix_feeds_due", "is_active", "next_fetch_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    topic_id: Mapped[int] = mapped_column(ForeignKey(
+        "topics.id", ondelete="CASCADE"), nullable=False, index=True)
+    url: Mapped[str] = mapped_column(String(1024), unique=True, nullable=False)
+    is_active: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=True, server_default="1")
+    # Planificación adaptativa (app/services/feed_schedule.py)
+    poll_interval_minutes: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=360, server_default="360")
+    next_fetch_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow)
+    last_fetch_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    last_status: Mapped[Optional[str]] = mapped_column(
+        String(20))  # ok | not_modified | error
+    last_error: Mapped[Optional[str]] = mapped_column(String(255))
+    failure_streak: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
+    avg_new_entries: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0")
+    # HTTP validators from the last 200 response (conditional GET)
+    etag: Mapped[Optional[str]] = mapped_column(String(255))
+    last_modified: Mapped[Optional[str]] = mapped_column(String(64))
+    last_content_bytes: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
+    # High-water mark: newest entry already processed
+    last_entry_id: Mapped[Optional[str]] = mapped_column(String(1024))
+    last_entry_published_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    # Borrado desde el admin (lápida): la fila se queda para que la ingesta no
+    # vuelva a registrar la URL si sigue en FEEDS_BY_TOPIC_SLUG
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    topic: Mapped["Topic"] = relationship(back_populates="feeds")
+
+
+# -------------------------------
+# INGEST TELEMETRY MODELS
+# -------------------------------
+class IngestRun(Base):
+    __tablename__ = "ingest_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, index=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="running")  # running | ok | error
+    feeds: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    new_tips: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Tip generator: model requests, items that fell back, breaker openings
+    ai_requests: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ai_fallbacks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    breaker_opens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    fetches: Mapped[List["IngestFetch"]] = relationship(
+        back_populates="run", cascade="all, delete-orphan")
+
+
+class IngestFetch(Base):
+    """One row per feed processed in a run. Times in milliseconds."""
+    __tablename__ = "ingest_fetches"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    run_id: Mapped[int] = mapped_column(ForeignKey(
+        "ingest_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    feed_id: Mapped[Optional[int]] = mapped_column(ForeignKey(
+        "feeds.id", ondelete="SET NULL"), index=True)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False)
+    http_status: Mapped[Optional[int]] = mapped_column(Integer)
+    error: Mapped[Optional[str]] = mapped_column(String(255))
+    bytes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    entries_seen: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    duplicates: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    new_tips: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    fetch_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    parse_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Article downloads for entries without summary, and AI rewrite
+    article_ms: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
+    ai_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    db_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    run: Mapped["IngestRun"] = relationship(back_populates="fetches")
+
+
+# -------------------------------
+# EMAIL OUTBOX MODEL
+# -------------------------------
+class EmailOutbox(Base):
+    """
+    One digest email per (user, digest_date), rendered when enqueued.
+    status: pending | sending (leased until lease_until) | sent | failed | skipped
+    (nothing to send that day).
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        UniqueConstraint("user_id", "digest_date", name="uq_outbox_user_date"),
+        Index("ix_email_outbox_claim", "digest_date", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey(
+        "users.id", ondelete="CASCADE"), nullable=False)
+    digest_date: Mapped[date] = mapped_column(Date, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(String(255))
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[Optional[str]] = mapped_column(Text)  # full RFC 5322 message
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False)
+    lease_until: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+
+# -------------------------------
+# CATALOG VERSION MODEL
+# -------------------------------
+class CatalogVersion(Base):
+    """Contador por catálogo cacheado en memoria (p. ej. "topics")."""
+    __tablename__ = "catalog_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
@@ -3,14 +3,17 @@
 from pathlib import Path
 
 from app.api.routes import users, topics, subscriptions, tips, auth, me, admin
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
 import os
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.db.session import SessionLocal
 from app.db.models import User
+from app.core.response_cache import ResponseCacheMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.static_assets import AssetManifest, PrecompressedStaticFiles
+import hashlib
 
 # ==============================
 # FastAPI Application Entry Point
@@ -22,7 +25,12 @@ from app.db.models import User
 # ------------------------------
 # Create FastAPI instance
 # ------------------------------
-app = FastAPI(title="Tips API", version="0.6.0")
+# orjson is used as the default encoder for every JSON response.
+app = FastAPI(
+    title="Tips API",
+    version="0.6.0",
+    default_response_class=ORJSONResponse,
+)
 
 # ------------------------------
 # Load environment variables
@@ -68,6 +76,18 @@ def bootstrap_admin():
         db.close()
 
 
+# ------------------------------
+# In-process cache for public GET endpoints
+# ------------------------------
+# Serves /topics and /tips reads from memory (ETag + 304 support);
+# admin writes invalidate it. See app/core/response_cache.py.
+app.add_middleware(ResponseCacheMiddleware)
+
+# Negotiated br/gzip for JSON/HTML bodies above COMPRESSION_MIN_BYTES.
+# Added last so it wraps the cache: cached bodies are stored uncompressed.
+app.add_middleware(CompressionMiddleware)
+
+
 # ------------------------------
 # Register API routers
 # ------------------------------
@@ -86,15 +106,25 @@ app.include_router(admin.router)
 # ------------------------------
 _STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
 
+# Content-hashed asset URLs (/static/app.<hash>.js), computed once at startup.
+_ASSETS = AssetManifest(_STATIC_DIR)
+_INDEX_HTML = _ASSETS.rewrite_html(
+    (_STATIC_DIR / "index.html").read_text(encoding="utf-8"))
+_INDEX_ETAG = f"\"{hashlib.sha256(_INDEX_HTML.encode('utf-8')).hexdigest()[:16]}\""
+
 
 @app.get("/")
-def web_app():
+def web_app(request: Request):
     """Sirve la mini-app del MVP; la API sigue en /auth, /topics, /me, etc."""
-    return FileResponse(_STATIC_DIR / "index.html")
+    # index.html is always revalidated; the hashed assets it references are immutable.
+    headers = {"Cache-Control": "no-cache", "ETag": _INDEX_ETAG}
+    if request.headers.get("if-none-match") == _INDEX_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(_INDEX_HTML, media_type="text/html", headers=headers)
 
 
 app.mount(
     "/static",
-    StaticFiles(directory=_STATIC_DIR),
+    PrecompressedStaticFiles(directory=_STATIC_DIR, manifest=_ASSETS),
     name="static",
 )
@@ -0,0 +1,69 @@
+# app/schemas/feed.py
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+
+# ==============================
+# Feed Schemas
+# ==============================
+# These models define the data structures used by the admin
+# feed registry: the RSS/Atom sources ingested for each topic.
+
+# ------------------------------
+# Schema for registering a new feed
+# ------------------------------
+
+
+class FeedCreate(BaseModel):
+    # Topic the feed's tips belong to
+    topic_id: int
+    # RSS/Atom URL
+    url: HttpUrl
+    # Initial polling interval (the scheduler adapts it afterwards)
+    poll_interval_minutes: int = Field(default=360, ge=5, le=10080)
+    # Inactive feeds are never polled
+    is_active: bool = True
+
+
+# ------------------------------
+# Schema for updating a feed
+# ------------------------------
+class FeedUpdate(BaseModel):
+    topic_id: Optional[int] = None
+    url: Optional[HttpUrl] = None
+    poll_interval_minutes: Optional[int] = Field(default=None, ge=5, le=10080)
+    is_active: Optional[bool] = None
+    # Make the feed due on the next ingestion run
+    fetch_now: bool = False
+
+
+# ------------------------------
+# Schema for reading a feed
+# ------------------------------
+class FeedRead(BaseModel):
+    id: int
+    topic_id: int
+    url: str
+    is_active: bool
+    poll_interval_minutes: int
+    next_fetch_at: datetime
+    last_fetch_at: Optional[datetime]
+    last_status: Optional[str]
+    last_error: Optional[str]
+    failure_streak: int
+    avg_new_entries: float
+    created_at: datetime
+
+    # Allow building this model directly from ORM (SQLAlchemy) objects
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ------------------------------
+# Schema for paginated feed lists
+# ------------------------------
+class FeedList(BaseModel):
+    total: int
+    page: int
+    size: int
+    items: List[FeedRead]
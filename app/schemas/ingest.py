@@ -0,0 +1,55 @@
+# app/schemas/ingest.py
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+# ==============================
+# Ingest Telemetry Schemas
+# ==============================
+# Read-only models for the admin ingestion report: recent runs and
+# per-feed fetch timings aggregated over those runs.
+
+# ------------------------------
+# Schema for one ingestion run
+# ------------------------------
+
+
+class IngestRunRead(BaseModel):
+    id: int
+    started_at: datetime
+    finished_at: Optional[datetime]
+    # running | ok | error
+    status: str
+    feeds: int
+    new_tips: int
+    # Tip generator: model requests, fallbacks, circuit breaker openings
+    ai_requests: int
+    ai_fallbacks: int
+    breaker_opens: int
+
+    # Allow building this model directly from ORM (SQLAlchemy) objects
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ------------------------------
+# Schema for per-feed timings (milliseconds)
+# ------------------------------
+class FeedTiming(BaseModel):
+    feed_id: int
+    url: str
+    fetches: int
+    errors: int
+    p50_fetch_ms: float
+    p95_fetch_ms: float
+    # Fetch + parse + article + AI + DB time
+    p95_total_ms: float
+
+
+# ------------------------------
+# Schema for the ingestion report
+# ------------------------------
+class IngestReport(BaseModel):
+    runs: List[IngestRunRead]
+    feeds: List[FeedTiming]
+    slowest_feeds: List[FeedTiming]
@@ -75,6 +75,8 @@ class TipRead(BaseModel):
     fingerprint: Optional[str]
     # Timestamp when the tip was created
     created_at: datetime
+    # Ingest quality score (0-100); None for tips scored before it existed
+    quality_score: Optional[int] = None
 
     class Config:
         # Allow Pydantic to build this model directly from ORM objects
@@ -0,0 +1,46 @@
+"""
+Backfill offline de un topic desde un directorio de volcados RSS/Atom/OPML.
+
+Reanudable: los ficheros ya procesados quedan en el manifiesto
+(<dir>/.backfill-manifest.jsonl por defecto) y se saltan al relanzar.
+
+Uso (desde la raíz del repo):
+  python -m app.scripts.backfill --topic nutricion archivos/nutricion/
+  python -m app.scripts.backfill --topic nutricion --workers 4 archivos/
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from app.db.session import SessionLocal
+from app.services.backfill import run_backfill
+from app.services.topic_catalog import get_topic_by_slug
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Backfill offline de feeds locales.")
+    p.add_argument("directory", type=Path)
+    p.add_argument("--topic", required=True, help="Slug del topic destino")
+    p.add_argument("--workers", type=int, default=None, help="Procesos de parseo (def.: CPUs)")
+    p.add_argument("--manifest", type=Path, default=None)
+    args = p.parse_args(argv)
+
+    if not args.directory.is_dir():
+        p.error(f"{args.directory} no es un directorio")
+
+    db = SessionLocal()
+    try:
+        topic = get_topic_by_slug(db, args.topic)
+        if topic is None:
+            p.error(f"Topic con slug='{args.topic}' no encontrado")
+        stats = run_backfill(db, topic.id, args.directory,
+                             workers=args.workers, manifest=args.manifest)
+    finally:
+        db.close()
+    print(stats.summary())
+    return 1 if stats.files_failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
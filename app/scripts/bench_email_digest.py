@@ -0,0 +1,152 @@
+"""
+Benchmark de extremo a extremo del digest por email contra el sumidero SMTP
+local (app.scripts.smtp_sink): siembra N usuarios con suscripciones en una BD
+SQLite temporal, ejecuta `send_daily_email_digests` y muestra mensajes/s,
+p50/p95 de latencia por mensaje (lo que tarda cada envío SMTP), pico de
+memoria de Python (tracemalloc) y el estado final de la bandeja.
+
+No toca la BD de la app: DATABASE_URL apunta a un fichero temporal salvo que
+se pase `--database-url`.
+
+Uso (desde la raíz del repo):
+  python -m app.scripts.bench_email_digest
+  python -m app.scripts.bench_email_digest --users 20000 --latency 0.005 --workers 8
+  python -m app.scripts.bench_email_digest --fail-rate 0.02 --drop-rate 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date
+from typing import List
+
+
+def _seed(db, users: int, topics: int, tips_per_topic: int, subs_per_user: int) -> None:
+    from sqlalchemy import insert, select
+
+    from app.db.models import Subscription, Tip, Topic, User
+    from app.services.tips import make_fingerprint
+    from app.services.topic_catalog import commit_topic_changes
+
+    rnd = random.Random(42)
+    topic_rows = [Topic(name=f"Tema {i}", slug=f"bench-{i}", is_active=True) for i in range(topics)]
+    db.add_all(topic_rows)
+    commit_topic_changes(db)
+    db.execute(insert(Tip), [
+        {"topic_id": t.id, "title": f"Consejo {j} de {t.name}",
+         "body": "Una frase corta con un consejo útil para hoy. " * 6, "status": "published",
+         "fingerprint": make_fingerprint(t.id, f"Consejo {j}", "bench")}
+        for t in topic_rows for j in range(tips_per_topic)
+    ])
+    db.execute(insert(User), [
+        {"email": f"bench{u}@example.com", "hashed_password": "x", "is_active": True,
+         "email_digest_enabled": True}
+        for u in range(users)
+    ])
+    db.commit()
+    user_ids = list(db.scalars(select(User.id)))
+    db.execute(insert(Subscription), [
+        {"user_id": uid, "topic_id": t.id, "is_active": True}
+        for uid in user_ids
+        for t in rnd.sample(topic_rows, min(subs_per_user, len(topic_rows)))
+    ])
+    db.commit()
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark de extremo a extremo del digest por email.")
+    p.add_argument("--users", type=int, default=2000)
+    p.add_argument("--topics", type=int, default=8)
+    p.add_argument("--tips-per-topic", type=int, default=5)
+    p.add_argument("--subs-per-user", type=int, default=3)
+    p.add_argument("--workers", type=int, default=4, help="hilos de envío (EMAIL_WORKERS)")
+    p.add_argument("--rate", type=float, default=0.0, help="límite msg/s (0 = sin límite)")
+    p.add_argument("--latency", type=float, default=0.002, help="segundos por mensaje en el sumidero")
+    p.add_argument("--connect-latency", type=float, default=0.02)
+    p.add_argument("--fail-rate", type=float, default=0.0)
+    p.add_argument("--fail-code", type=int, default=451)
+    p.add_argument("--drop-rate", type=float, default=0.0)
+    p.add_argument("--database-url", default=None)
+    p.add_argument("--no-trace-memory", action="store_true",
+                   help="sin tracemalloc (más rápido); solo el pico RSS del proceso")
+    args = p.parse_args(argv)
+
+    tmpdir = tempfile.TemporaryDirectory(prefix="bench-digest-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmpdir.name}/bench.db"
+    os.environ["EMAIL_WORKERS"] = str(args.workers)
+    os.environ["EMAIL_RATE_PER_SECOND"] = str(args.rate)
+    os.environ["SMTP_POOL_SIZE"] = str(args.workers)
+
+    from app.scripts.smtp_sink import SmtpSink
+
+    with SmtpSink(latency=args.latency, connect_latency=args.connect_latency,
+                  fail_rate=args.fail_rate, fail_code=args.fail_code,
+                  drop_rate=args.drop_rate, seed=1) as sink:
+        os.environ.update({"SMTP_HOST": sink.host, "SMTP_PORT": str(sink.port),
+                           "SMTP_FROM": "tips@example.com", "SMTP_USE_TLS": "0"})
+
+        # Importes tras fijar el entorno: los módulos leen su configuración al importarse
+        from app.db.models import Base
+        from app.db.session import SessionLocal, engine
+        from app.services import mail
+        from app.services.email_digest import send_daily_email_digests
+        from app.services.email_outbox import outbox_counts
+        from app.services.ingest_telemetry import percentile
+
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+        started = time.perf_counter()
+        _seed(db, args.users, args.topics, args.tips_per_topic, args.subs_per_user)
+        print(f"[BENCH] {args.users} usuarios sembrados en {time.perf_counter() - started:.1f} s")
+
+        # Latencia por mensaje: lo que tarda cada envío en el transporte
+        latencies: List[float] = []
+        lock = threading.Lock()
+        transport = mail.configure_transport()
+        original = transport.send_message
+
+        def timed_send(to: str, message: str) -> None:
+            t0 = time.perf_counter()
+            try:
+                original(to, message)
+            finally:
+                with lock:
+                    latencies.append(time.perf_counter() - t0)
+
+        transport.send_message = timed_send  # type: ignore[method-assign]
+
+        if not args.no_trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            sent = send_daily_email_digests(db, date.today())
+        finally:
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+            tracemalloc.stop()
+            counts = outbox_counts(db, date.today())
+            mail.close_transport()
+            db.close()
+
+    print(f"[BENCH] enviados={sent} en {elapsed:.2f} s -> {sent / elapsed:,.0f} msg/s")
+    print(f"[BENCH] latencia por mensaje: p50={percentile(latencies, 50) * 1000:.1f} ms "
+          f"p95={percentile(latencies, 95) * 1000:.1f} ms")
+    if peak:
+        print(f"[BENCH] pico de memoria (tracemalloc): {peak / 1024 / 1024:.1f} MiB")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB en Linux
+    print(f"[BENCH] pico RSS del proceso: {rss:.0f} MiB")
+    print(f"[BENCH] sumidero: conexiones={sink.connections} mensajes={sink.messages} "
+          f"fallos inyectados={sink.failures}")
+    print("[BENCH] bandeja: " + " ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+    tmpdir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+"""
+Perfil de tiempo de importación (`python -X importtime`) de los puntos de entrada.
+
+Cada módulo se importa en un intérprete nuevo varias veces; se toma la mediana
+del tiempo acumulado y se compara con el presupuesto documentado en
+docs/13-Runbook.md. También comprueba que las integraciones pesadas
+(feedparser, openai, fastapi en los jobs) no se carguen al arrancar.
+
+Uso (desde la raíz del repo):
+  python -m app.scripts.bench_import_time
+  python -m app.scripts.bench_import_time --runs 7 --top 15
+  python -m app.scripts.bench_import_time app.jobs.daily
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Presupuesto de arranque (ms, mediana del tiempo acumulado de importación).
+STARTUP_BUDGET_MS: dict[str, int] = {
+    "app.main": 1500,
+    "app.jobs.daily": 700,
+    "app.jobs.send_email_digest": 700,
+    "app.scripts.run_ingest": 700,
+    "app.scripts.seed_user": 700,
+    "app.scripts.seed_demo": 700,
+    "app.scripts.ensure_admin": 900,
+}
+
+# Módulos que un punto de entrada NO debe cargar al importarse.
+LAZY_MODULES: dict[str, tuple[str, ...]] = {
+    "app.main": ("feedparser", "openai"),
+    "app.jobs.daily": ("feedparser", "openai", "fastapi"),
+    "app.jobs.send_email_digest": ("feedparser", "openai", "fastapi"),
+    "app.scripts.run_ingest": ("feedparser", "openai", "fastapi"),
+    "app.scripts.seed_user": ("feedparser", "openai", "fastapi"),
+    "app.scripts.seed_demo": ("feedparser", "openai", "fastapi"),
+    "app.scripts.ensure_admin": ("feedparser", "openai", "fastapi"),
+}
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Devuelve [(módulo, self_us, cumulative_us)] a partir de la salida de -X importtime."""
+    rows: list[tuple[str, int, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cum_us = int(parts[1].strip())
+        except ValueError:
+            continue  # cabecera "self [us] | cumulative | imported package"
+        rows.append((parts[2].strip(), self_us, cum_us))
+    return rows
+
+
+def profile_module(module: str) -> tuple[int, list[tuple[str, int, int]], set[str]]:
+    """
+    Importa `module` en un proceso nuevo.
+    Devuelve (cumulative_us del módulo, filas de importtime, módulos cargados).
+    """
+    code = (
+        f"import {module}, sys; "
+        "print('\\n'.join(sorted(sys.modules)))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = _parse_importtime(proc.stderr)
+    total = next((cum for name, _, cum in reversed(rows) if name == module), 0)
+    loaded = set(proc.stdout.split())
+    return total, rows, loaded
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Perfil de importación de los entry points.")
+    p.add_argument("modules", nargs="*", help="Módulos a medir (por defecto, todos)")
+    p.add_argument("--runs", type=int, default=5, help="Repeticiones por módulo")
+    p.add_argument("--top", type=int, default=10, help="Módulos más lentos a listar (self time)")
+    args = p.parse_args(argv)
+
+    modules = args.modules or list(STARTUP_BUDGET_MS)
+    failures = 0
+
+    for module in modules:
+        totals: list[int] = []
+        rows: list[tuple[str, int, int]] = []
+        loaded: set[str] = set()
+        for _ in range(max(1, args.runs)):
+            total, rows, loaded = profile_module(module)
+            totals.append(total)
+
+        median_ms = statistics.median(totals) / 1000
+        budget = STARTUP_BUDGET_MS.get(module)
+        leaked = [
+            m for m in LAZY_MODULES.get(module, ())
+            if m in loaded
+        ]
+        over = budget is not None and median_ms > budget
+        verdict = "OK" if not over and not leaked else "FAIL"
+        failures += verdict == "FAIL"
+
+        budget_txt = f"{budget} ms" if budget is not None else "sin presupuesto"
+        print(f"[IMPORT] {module}: {median_ms:.0f} ms (budget {budget_txt}) {verdict}")
+        if leaked:
+            print(f"[IMPORT]   cargados sin necesidad: {', '.join(leaked)}")
+        for name, self_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[: args.top]:
+            print(f"[IMPORT]   {self_us / 1000:8.1f} ms  {name}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+"""
+Benchmark de la etapa de puntuación de calidad: lote vectorizado
+(app.services.quality.score_tips) frente a puntuar tip a tip con bucles de
+Python, sobre un fixture sintético de 100k entradas. Comprueba que ambos
+caminos dan las mismas puntuaciones.
+
+Uso (desde la raíz del repo):
+  python -m app.scripts.bench_quality
+  python -m app.scripts.bench_quality --items 100000 --batch 5000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.services import quality
+from app.services.quality import score_tips
+
+_WORDS = (
+    "agua rutina sueño proteína verdura paseo estiramiento respiración fibra "
+    "descanso hidratación fruta legumbres caminar entrenamiento"
+).split()
+_SPICE = ("cura", "milagroso", "garantizado", "¡Increíble!", "DETOX", "sin esfuerzo")
+
+
+def _fixture(n: int, seed: int = 7) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+    titles, bodies = [], []
+    for i in range(n):
+        words = rng.choices(_WORDS, k=rng.randint(3, 90))
+        if rng.random() < 0.15:
+            words.insert(rng.randrange(len(words)), rng.choice(_SPICE))
+        body = " ".join(words).capitalize() + "."
+        title = f"Consejo {i}: {words[0]}"
+        if rng.random() < 0.05:
+            body = title
+        elif rng.random() < 0.05:
+            body = body.upper()
+        titles.append(title)
+        bodies.append(body)
+    return titles, bodies
+
+
+def _score_one(title: str, body: str) -> int:
+    """Misma regla que score_tips, tip a tip y carácter a carácter."""
+    score = quality.BASE_SCORE
+    if len(body) > quality.LONG_BODY_CHARS:
+        score -= quality.LONG_PENALTY
+    if len(body) < quality.SHORT_BODY_CHARS:
+        score -= quality.SHORT_PENALTY
+    claims = len(quality._CLAIMS_RE.findall(f"{title}\x00{body}"))
+    score -= quality.CLAIM_PENALTY * min(claims, quality.MAX_CLAIMS_PENALIZED)
+    if title.strip() == body.strip():
+        score -= quality.NO_SUMMARY_PENALTY
+    upper = sum(1 for c in body if "A" <= c <= "Z" or ("\xc0" <= c <= "\xde" and c != "\xd7"))
+    lower = sum(1 for c in body if "a" <= c <= "z" or ("\xdf" <= c <= "\xff" and c != "\xf7"))
+    if upper + lower and upper / (upper + lower) > quality.SHOUTING_RATIO:
+        score -= quality.SHOUTING_PENALTY
+    if sum(1 for c in body if c in "!¡") >= quality.EXCLAMATIONS:
+        score -= quality.EXCLAMATION_PENALTY
+    return max(0, min(100, score))
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark de puntuación de calidad.")
+    p.add_argument("--items", type=int, default=100_000)
+    p.add_argument("--batch", type=int, default=5_000)
+    args = p.parse_args(argv)
+
+    titles, bodies = _fixture(args.items)
+
+    start = time.perf_counter()
+    scalar = [_score_one(t, b) for t, b in zip(titles, bodies)]
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched: list[int] = []
+    for i in range(0, args.items, args.batch):
+        batched.extend(score_tips(titles[i:i + args.batch], bodies[i:i + args.batch]))
+    batched_s = time.perf_counter() - start
+
+    same = scalar == batched
+    drafts = sum(1 for s in batched if s < quality.PUBLISH_THRESHOLD)
+    print(f"[BENCH] {args.items} tips, lotes de {args.batch}, draft={drafts}")
+    print(f"[BENCH] tip a tip : {args.items / scalar_s:12,.0f} tips/s")
+    print(f"[BENCH] vectorizado: {args.items / batched_s:12,.0f} tips/s  "
+          f"x{scalar_s / batched_s:4.1f}  puntuaciones iguales={'sí' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+"""
+Benchmark de serialización de páginas de 100 tips (/tips, /me/tips/today,
+/me/tips/history): camino anterior (Pydantic + response_model + json.dumps)
+frente al camino rápido (dicts con la forma del esquema + orjson).
+
+No necesita base de datos: usa objetos en memoria con los mismos atributos
+que las filas ORM. Comprueba además que ambos caminos producen los mismos bytes.
+
+Uso (desde la raíz del repo):
+  python -m app.scripts.bench_serialization
+  python -m app.scripts.bench_serialization --items 100 --repeat 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.api.serialize import FastJSONResponse, tip_read_dicts
+from app.schemas.me_tips import HistoryList
+from app.schemas.tip import TipList, TipRead, TodayTips
+
+
+def _fake_tips(n: int) -> list[SimpleNamespace]:
+    base = datetime(2026, 1, 1, 8, 30, 15, 123456)
+    return [
+        SimpleNamespace(
+            id=i,
+            topic_id=1 + i % 5,
+            title=f"Consejo número {i}",
+            body=("Bebe agua al levantarte y mantén una rutina estable. " * 6).strip(),
+            status="published",
+            source_url=f"https://example.com/articulo/{i}",
+            fingerprint=f"{i:064x}",
+            created_at=base + timedelta(minutes=i),
+            quality_score=70,
+        )
+        for i in range(n)
+    ]
+
+
+def _history_items(tips: list[SimpleNamespace]) -> list[dict]:
+    return [
+        {
+            "delivery_id": t.id,
+            "delivered_at": t.created_at,
+            "channel": "app",
+            "status": "sent",
+            "tip": {
+                "id": t.id,
+                "title": t.title,
+                "body": t.body,
+                "source_url": t.source_url,
+                "created_at": t.created_at,
+            },
+            "topic": {"id": t.topic_id, "name": "Nutrición", "slug": "nutricion"},
+        }
+        for t in tips
+    ]
+
+
+def _legacy_bytes(adapter: TypeAdapter, value) -> bytes:
+    """Aproxima el camino anterior: validar contra response_model y json.dumps."""
+    validated = adapter.validate_python(value, from_attributes=True)
+    data = adapter.dump_python(validated, mode="json")
+    return json.dumps(
+        data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark de serialización JSON.")
+    p.add_argument("--items", type=int, default=100)
+    p.add_argument("--repeat", type=int, default=200)
+    args = p.parse_args(argv)
+
+    tips = _fake_tips(args.items)
+    history = _history_items(tips)
+    today = date(2026, 1, 1)
+
+    cases = {
+        "/tips": (
+            lambda: _legacy_bytes(
+                TypeAdapter(TipList),
+                TipList(total=len(tips), page=1, size=len(tips),
+                        items=[TipRead.model_validate(t) for t in tips]),
+            ),
+            lambda: FastJSONResponse({
+                "total": len(tips), "page": 1, "size": len(tips),
+                "items": tip_read_dicts(tips),
+            }).body,
+        ),
+        "/me/tips/today": (
+            lambda: _legacy_bytes(
+                TypeAdapter(TodayTips),
+                TodayTips(date=today, count=len(tips),
+                          items=[TipRead.model_validate(t) for t in tips]),
+            ),
+            lambda: FastJSONResponse({
+                "date": today, "count": len(tips), "items": tip_read_dicts(tips),
+            }).body,
+        ),
+        "/me/tips/history": (
+            lambda: _legacy_bytes(
+                TypeAdapter(HistoryList),
+                HistoryList(user_id=1, page=1, size=len(history),
+                            total=len(history), items=history),
+            ),
+            lambda: FastJSONResponse({
+                "user_id": 1, "page": 1, "size": len(history),
+                "total": len(history), "items": history,
+            }).body,
+        ),
+    }
+
+    mismatches = 0
+    for name, (legacy, fast) in cases.items():
+        same = legacy() == fast()
+        mismatches += not same
+        before = _time(legacy, args.repeat)
+        after = _time(fast, args.repeat)
+        print(
+            f"[BENCH] {name:<18} {args.items} items: "
+            f"antes {before * 1e3:7.3f} ms  después {after * 1e3:7.3f} ms  "
+            f"x{before / after:5.1f}  bytes iguales={'sí' if same else 'NO'}"
+        )
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
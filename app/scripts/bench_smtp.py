@@ -0,0 +1,68 @@
+"""
+Benchmark de envío SMTP contra un sumidero local (app.scripts.smtp_sink):
+una conexión por mensaje (lo que hacía send_email) frente al pool de sesiones
+de SmtpTransport, en serie y con varios hilos.
+
+`--connect-latency` simula el coste de abrir sesión (TCP + STARTTLS + login)
+de un servidor real; `--latency` el de aceptar cada mensaje.
+
+Uso (desde la raíz del repo):
+  python -m app.scripts.bench_smtp
+  python -m app.scripts.bench_smtp --messages 5000 --pool 8 --connect-latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.scripts.smtp_sink import SmtpSink
+from app.services.mail import SmtpSettings, SmtpTransport, build_message
+
+
+def _run(sink: SmtpSink, messages: int, pool: int, per_session: int, workers: int) -> tuple[float, int]:
+    settings = SmtpSettings(host=sink.host, port=sink.port, from_addr="tips@example.com",
+                            use_tls=False, pool_size=pool, max_messages_per_session=per_session)
+    transport = SmtpTransport(settings)
+    body = build_message(settings.from_addr, "user@example.com", "Tips del día",
+                         "Bebe agua.\n" * 20, "<p>Bebe agua.</p>" * 20)
+    start = time.perf_counter()
+    if workers == 1:
+        for _ in range(messages):
+            transport.send_message("user@example.com", body)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(lambda _: transport.send_message("user@example.com", body), range(messages)))
+    elapsed = time.perf_counter() - start
+    transport.close()
+    return elapsed, transport.connects
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark del pool SMTP.")
+    p.add_argument("--messages", type=int, default=1000)
+    p.add_argument("--pool", type=int, default=4)
+    p.add_argument("--connect-latency", type=float, default=0.02)
+    p.add_argument("--latency", type=float, default=0.002)
+    args = p.parse_args(argv)
+
+    with SmtpSink(latency=args.latency, connect_latency=args.connect_latency) as sink:
+        cases = [
+            ("conexión por mensaje", 1, 1, 1),
+            ("pool, 1 sesión", 1, 10**9, 1),
+            (f"pool, {args.pool} sesiones", args.pool, 10**9, args.pool),
+        ]
+        print(f"[BENCH] {args.messages} mensajes, conexión={args.connect_latency * 1000:.0f} ms, "
+              f"mensaje={args.latency * 1000:.0f} ms")
+        baseline = None
+        for label, pool, per_session, workers in cases:
+            elapsed, connects = _run(sink, args.messages, pool, per_session, workers)
+            rate = args.messages / elapsed
+            baseline = baseline or rate
+            print(f"[BENCH] {label:<22}: {rate:10,.0f} msg/s  conexiones={connects:<6} "
+                  f"x{rate / baseline:5.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
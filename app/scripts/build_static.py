@@ -0,0 +1,60 @@
+"""
+Genera copias precomprimidas (.gz y, si está instalado `brotli`, .br) de los
+ficheros de static/ para que la app las sirva sin comprimir en cada petición.
+
+Solo reescribe una copia si el original es más reciente.
+
+Uso (desde la raíz del repo):
+  python -m app.scripts.build_static
+  python -m app.scripts.build_static --dir otra/carpeta
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+from pathlib import Path
+
+from app.core.compression import brotli
+
+STATIC_DIR = Path(__file__).resolve().parents[2] / "static"
+
+
+def _write_if_stale(source: Path, target: Path, data: bytes) -> bool:
+    if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+        return False
+    target.write_bytes(data)
+    return True
+
+
+def build(directory: Path = STATIC_DIR) -> list[Path]:
+    """Precomprime todos los ficheros de `directory`; devuelve los escritos."""
+    written: list[Path] = []
+    for source in sorted(directory.rglob("*")):
+        if not source.is_file() or source.suffix in (".gz", ".br"):
+            continue
+        raw = source.read_bytes()
+        gz_path = source.with_name(source.name + ".gz")
+        # mtime=0 -> salida reproducible entre builds
+        if _write_if_stale(source, gz_path, gzip.compress(raw, compresslevel=9, mtime=0)):
+            written.append(gz_path)
+        if brotli is not None:
+            br_path = source.with_name(source.name + ".br")
+            if _write_if_stale(source, br_path, brotli.compress(raw, quality=11)):
+                written.append(br_path)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Precomprimir estáticos.")
+    p.add_argument("--dir", type=Path, default=STATIC_DIR, help="Directorio de estáticos")
+    args = p.parse_args(argv)
+
+    for path in build(args.dir):
+        print(f"[STATIC] {path.name}: {path.stat().st_size} bytes")
+    if brotli is None:
+        print("[STATIC] brotli no instalado: solo se generan copias .gz")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
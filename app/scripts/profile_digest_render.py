@@ -0,0 +1,98 @@
+"""
+Perfil de CPU del render de digests: por mensaje, antes (build_tip_digest_bodies
++ build_message por usuario) y después (mail.DigestRenderer, con fragmentos por
+tip y cuerpos MIME compartidos durante la ejecución).
+
+Simula `--users` destinatarios que reciben 3 tips de un conjunto pequeño de
+`--tips` tips populares (el caso habitual: pocos temas, muchos usuarios).
+`--cprofile` muestra además las funciones más costosas de cada variante.
+
+Uso (desde la raíz del repo):
+  python -m app.scripts.profile_digest_render
+  python -m app.scripts.profile_digest_render --users 20000 --tips 30 --cprofile
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import pstats
+import random
+import time
+from types import SimpleNamespace
+from typing import Callable, List
+
+from app.services.mail import DigestRenderer, build_message, build_tip_digest_bodies
+
+DATE_LABEL = "2026-01-01"
+FROM_ADDR = "tips@example.com"
+
+
+def _fake_tips(n: int) -> list:
+    topics = [SimpleNamespace(name=f"Tema {i}") for i in range(5)]
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            title=f"Consejo número {i} <importante>",
+            body=("Una frase con acentos, comillas \"dobles\" y & ampersand. " * 12).strip(),
+            topic=topics[i % len(topics)],
+        )
+        for i in range(n)
+    ]
+
+
+def _recipients(users: int, tips: list, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    return [(f"user{u}@example.com", sorted(rnd.sample(tips, 3), key=lambda t: t.id))
+            for u in range(users)]
+
+
+def _before(recipients: list) -> None:
+    for to, tips in recipients:
+        subject = f"Tips — {DATE_LABEL} ({len(tips)} tip(s))"
+        text_body, html_body = build_tip_digest_bodies(tips, DATE_LABEL)
+        build_message(FROM_ADDR, to, subject, text_body, html_body)
+
+
+def _after(recipients: list) -> None:
+    renderer = DigestRenderer()
+    for to, tips in recipients:
+        subject = f"Tips — {DATE_LABEL} ({len(tips)} tip(s))"
+        renderer.message(FROM_ADDR, to, subject, tips, DATE_LABEL)
+
+
+def _measure(fn: Callable[[list], None], recipients: list, profile: bool) -> float:
+    profiler = cProfile.Profile() if profile else None
+    start = time.process_time()
+    if profiler:
+        profiler.enable()
+    fn(recipients)
+    if profiler:
+        profiler.disable()
+    elapsed = time.process_time() - start
+    if profiler:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(8)
+        print(out.getvalue())
+    return elapsed
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Perfil de CPU del render de digests.")
+    p.add_argument("--users", type=int, default=5000)
+    p.add_argument("--tips", type=int, default=20)
+    p.add_argument("--cprofile", action="store_true")
+    args = p.parse_args(argv)
+
+    recipients = _recipients(args.users, _fake_tips(args.tips))
+    print(f"[PROFILE] {args.users} mensajes, {args.tips} tips distintos, 3 por mensaje")
+    before = _measure(_before, recipients, args.cprofile)
+    after = _measure(_after, recipients, args.cprofile)
+    for label, cpu in (("antes (por usuario)", before), ("después (compartido)", after)):
+        print(f"[PROFILE] {label:<21}: {cpu / args.users * 1e6:8.1f} µs CPU/mensaje")
+    print(f"[PROFILE] x{before / max(after, 1e-9):.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,32 @@
+"""
+Recalcula firmas MinHash e índice LSH de casi duplicados (tips existentes
+antes de la migración 4f5a6b7c8d9e, o tras cambiar los parámetros).
+
+Uso (desde la raíz del repo):
+  python -m app.scripts.rebuild_near_dup_index
+  python -m app.scripts.rebuild_near_dup_index --topic-id 3
+"""
+from __future__ import annotations
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.services.near_dup import rebuild_index
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Reconstruir el índice de casi duplicados.")
+    p.add_argument("--topic-id", type=int, default=None)
+    args = p.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        count = rebuild_index(db, topic_id=args.topic_id)
+    finally:
+        db.close()
+    print(f"[NEAR-DUP] Tips indexados: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,36 @@
 # scripts/run_ingest.py
+"""
+Uso (desde la raíz del repo):
+  python -m app.scripts.run_ingest                      # feeds vencidos
+  python -m app.scripts.run_ingest --file volcado.xml --topic nutricion
+"""
+import argparse
+
 from app.db.session import SessionLocal
-from app.services.ingest import ingest_all_configured_feeds
+from app.services.ingest import (
+    ingest_all_configured_feeds,
+    ingest_feed_file,
+)
+from app.services.topic_catalog import get_topic_by_slug
+
 
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Ingesta de feeds.")
+    p.add_argument("--file", help="Feed RSS/Atom local (lector incremental)")
+    p.add_argument("--topic", help="Slug del topic para --file")
+    args = p.parse_args(argv)
+    if args.file and not args.topic:
+        p.error("--file requiere --topic")
 
-def main():
     db = SessionLocal()
     try:
-        ingest_all_configured_feeds(db)
+        if args.file:
+            topic = get_topic_by_slug(db, args.topic)
+            if topic is None:
+                p.error(f"Topic con slug='{args.topic}' no encontrado")
+            ingest_feed_file(db, topic, args.file)
+        else:
+            ingest_all_configured_feeds(db)
     finally:
         db.close()
 
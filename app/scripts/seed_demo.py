@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.db.models import Topic, Tip
 from app.services.tips import make_fingerprint
+from app.services.topic_catalog import commit_topic_changes
 
 
 TOPICS_DEMO = [
@@ -104,7 +105,7 @@ def seed_topics_and_tips(db: Session) -> None:
                 is_active=True,
             )
             db.add(topic)
-            db.commit()
+            commit_topic_changes(db)
             db.refresh(topic)
             created_topics += 1
             print(f"[SEED] Creado topic: {topic.name} ({topic.slug})")
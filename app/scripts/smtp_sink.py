@@ -0,0 +1,225 @@
+"""
+Servidor SMTP local que acepta y cuenta mensajes sin entregarlos (stdlib asyncio).
+
+Sirve para los tests y benchmarks de envío de correo: habla lo justo de SMTP
+(EHLO/HELO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT) y cuenta
+conexiones, mensajes y RSET. `connect_latency` simula el coste del
+establecimiento de sesión (TCP + TLS) y `latency` el de aceptar cada mensaje.
+
+Inyección de fallos: con probabilidad `fail_rate` un mensaje se rechaza al
+final de DATA con `fail_code` (451 = temporal, 550 = permanente, 421 = el
+servidor además cierra la sesión) y con probabilidad `drop_rate` se corta la
+conexión sin responder. `seed` hace la secuencia reproducible.
+
+Uso:
+  python -m app.scripts.smtp_sink --port 2525 --latency 0.005
+  python -m app.scripts.smtp_sink --fail-rate 0.05 --fail-code 451 --drop-rate 0.01
+  SMTP_HOST=127.0.0.1 SMTP_PORT=2525 SMTP_USE_TLS=0 SMTP_FROM=tips@example.com ...
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+class SmtpSink:
+    """Sumidero SMTP en un hilo propio. `start()` devuelve cuando ya escucha."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        connect_latency: float = 0.0,
+        keep_messages: bool = False,
+        fail_rate: float = 0.0,
+        fail_code: int = 451,
+        drop_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.keep_messages = keep_messages
+        self.fail_rate = fail_rate
+        self.fail_code = fail_code
+        self.drop_rate = drop_rate
+        self.connections = 0
+        self.messages = 0
+        self.rsets = 0
+        self.failures = 0  # mensajes rechazados o cortados a propósito
+        self._random = random.Random(seed)
+        # (remitente, destinatarios, datos) si keep_messages
+        self.received: List[Tuple[str, List[str], bytes]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    # ------------------------------
+    # Lifecycle
+    # ------------------------------
+    def start(self) -> "SmtpSink":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def __enter__(self) -> "SmtpSink":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _fault(self) -> Optional[str]:
+        """None, "fail" o "drop" para el mensaje actual (y lo cuenta)."""
+        if not self.fail_rate and not self.drop_rate:
+            return None
+        with self._lock:
+            roll = self._random.random()
+            if roll < self.drop_rate:
+                fault = "drop"
+            elif roll < self.drop_rate + self.fail_rate:
+                fault = "fail"
+            else:
+                return None
+            self.failures += 1
+        return fault
+
+    # ------------------------------
+    # SMTP dialogue
+    # ------------------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._count("connections")
+
+        async def reply(line: str) -> None:
+            writer.write(line.encode("ascii") + b"\r\n")
+            await writer.drain()
+
+        mail_from, rcpts = "", []
+        try:
+            if self.connect_latency:
+                await asyncio.sleep(self.connect_latency)
+            await reply("220 smtp-sink ESMTP")
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                verb = line.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    await reply("250-smtp-sink\r\n250-PIPELINING\r\n250-8BITMIME\r\n250 AUTH PLAIN LOGIN")
+                elif verb == "HELO":
+                    await reply("250 smtp-sink")
+                elif verb == "AUTH":
+                    if line.upper().startswith("AUTH LOGIN"):
+                        await reply("334 VXNlcm5hbWU6")
+                        await reader.readline()
+                        await reply("334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                    await reply("235 2.7.0 Authentication successful")
+                elif verb == "MAIL":
+                    mail_from, rcpts = line[10:].strip(), []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    rcpts.append(line[8:].strip())
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    chunks = []
+                    while True:
+                        data_line = await reader.readline()
+                        if not data_line or data_line == b".\r\n":
+                            break
+                        if self.keep_messages:
+                            chunks.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    fault = self._fault()
+                    if fault == "drop":
+                        break
+                    if fault == "fail":
+                        await reply(f"{self.fail_code} Injected failure")
+                        if self.fail_code == 421:
+                            break
+                        continue
+                    with self._lock:
+                        self.messages += 1
+                        if self.keep_messages:
+                            self.received.append((mail_from, rcpts, b"".join(chunks)))
+                    await reply("250 OK queued")
+                elif verb == "RSET":
+                    self._count("rsets")
+                    mail_from, rcpts = "", []
+                    await reply("250 OK")
+                elif verb == "NOOP":
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Servidor SMTP local que solo cuenta mensajes.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=2525)
+    p.add_argument("--latency", type=float, default=0.0, help="segundos por mensaje")
+    p.add_argument("--connect-latency", type=float, default=0.0, help="segundos por conexión")
+    p.add_argument("--fail-rate", type=float, default=0.0, help="fracción de mensajes rechazados")
+    p.add_argument("--fail-code", type=int, default=451)
+    p.add_argument("--drop-rate", type=float, default=0.0, help="fracción de conexiones cortadas")
+    p.add_argument("--seed", type=int, default=None)
+    args = p.parse_args(argv)
+
+    sink = SmtpSink(args.host, args.port, args.latency, args.connect_latency,
+                    fail_rate=args.fail_rate, fail_code=args.fail_code,
+                    drop_rate=args.drop_rate, seed=args.seed).start()
+    print(f"[SINK] Escuchando en {sink.host}:{sink.port}")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"[SINK] conexiones={sink.connections} mensajes={sink.messages} "
+                  f"rset={sink.rsets} fallos={sink.failures}")
+    except KeyboardInterrupt:
+        sink.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,331 @@
+"""
+Fallback de resumen: primer párrafo del artículo HTML.
+
+Cuando una entrada del feed no trae summary (docs/07-Ingestion-Pipeline.md,
+paso 2) se descarga la página enlazada y se extrae su primer párrafo con
+contenido:
+
+- Las descargas van en un pool de hilos con límite global
+  (ARTICLE_MAX_CONCURRENCY) y por host, como las de los feeds.
+- El HTML se lee por bloques y se pasa a un `HTMLParser` incremental; en
+  cuanto aparece un `<p>` con al menos ARTICLE_MIN_PARAGRAPH_CHARS caracteres
+  (fuera de script/style/nav/header/footer/aside...) se deja de leer. Nunca se
+  leen más de ARTICLE_MAX_BYTES.
+- Caché en disco (ARTICLE_CACHE_DIR) direccionada por contenido: el párrafo
+  se guarda en `blobs/` con la clave sha256(URL + ETag) y `urls/` apunta de
+  cada URL a su clave actual. Durante ARTICLE_CACHE_TTL_HOURS no se vuelve a
+  pedir nada; después se revalida con If-None-Match y un 304 reutiliza el
+  párrafo guardado. También se guarda "sin párrafo" (cadena vacía) para no
+  reintentar páginas que no lo tienen; los errores de red no se guardan.
+  Si el ETag cambia se borra el blob anterior, y el total en disco está
+  acotado (ARTICLE_CACHE_MAX_BYTES): al pasarse se desalojan las URLs
+  descargadas hace más tiempo.
+"""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+from app.services.feed_fetch import PER_HOST_LIMIT, USER_AGENT, _HostLimiter
+
+ENABLED = os.getenv("ARTICLE_FALLBACK", "1") == "1"
+MAX_CONCURRENCY = int(os.getenv("ARTICLE_MAX_CONCURRENCY", "4"))
+FETCH_TIMEOUT_SECONDS = float(os.getenv("ARTICLE_FETCH_TIMEOUT_SECONDS", "10"))
+MAX_BYTES = int(os.getenv("ARTICLE_MAX_BYTES", str(256 * 1024)))
+MIN_PARAGRAPH_CHARS = int(os.getenv("ARTICLE_MIN_PARAGRAPH_CHARS", "40"))
+CACHE_DIR = os.getenv("ARTICLE_CACHE_DIR", ".cache/articles")
+CACHE_TTL_HOURS = float(os.getenv("ARTICLE_CACHE_TTL_HOURS", "168"))
+CACHE_MAX_BYTES = int(os.getenv("ARTICLE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Al desalojar se baja hasta este porcentaje del máximo (histéresis)
+EVICT_TO = 0.9
+
+READ_CHUNK_BYTES = 8 * 1024
+
+# Contenedores cuyo texto nunca es el cuerpo del artículo
+_SKIP_TAGS = {"script", "style", "noscript", "template", "nav", "header",
+              "footer", "aside", "form", "figure", "svg"}
+_SPACES = re.compile(r"\s+")
+
+
+# ------------------------------
+# Streaming extractor
+# ------------------------------
+class _FirstParagraphParser(HTMLParser):
+    def __init__(self, min_chars: int) -> None:
+        super().__init__(convert_charrefs=True)
+        self.min_chars = min_chars
+        self.paragraph: Optional[str] = None
+        self._skip_depth = 0
+        self._in_p = False
+        self._parts: list = []
+
+    @property
+    def done(self) -> bool:
+        return self.paragraph is not None
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "p" and not self._skip_depth:
+            # Un <p> sin cerrar termina al abrir el siguiente
+            self._close_paragraph()
+            self._in_p = True
+
+    def handle_endtag(self, tag) -> None:
+        if tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "p":
+            self._close_paragraph()
+
+    def handle_data(self, data) -> None:
+        if self._in_p and not self._skip_depth and not self.done:
+            self._parts.append(data)
+
+    def _close_paragraph(self) -> None:
+        if not self._in_p or self.done:
+            return
+        text = _SPACES.sub(" ", "".join(self._parts)).strip()
+        self._in_p = False
+        self._parts = []
+        if len(text) >= self.min_chars:
+            self.paragraph = text
+
+
+def extract_first_paragraph(
+    chunks: Iterable[bytes],
+    encoding: str = "utf-8",
+    min_chars: Optional[int] = None,
+) -> Optional[str]:
+    """
+    Primer párrafo con contenido de un HTML recibido por bloques.
+    Deja de consumir `chunks` en cuanto lo encuentra.
+    """
+    parser = _FirstParagraphParser(min_chars or MIN_PARAGRAPH_CHARS)
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            return parser.paragraph
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    parser._close_paragraph()
+    return parser.paragraph
+
+
+# ------------------------------
+# Disk cache
+# ------------------------------
+@dataclass
+class CachedArticle:
+    etag: Optional[str]
+    paragraph: str
+    fetched_at: float
+
+
+class ArticleCache:
+    """
+    Caché en disco URL -> (ETag, párrafo). Segura entre hilos (escrituras
+    atómicas). El tamaño se calcula recorriendo el directorio la primera vez
+    que se escribe y luego se lleva en memoria: otro proceso escribiendo en el
+    mismo directorio lo desvía hasta la siguiente instancia.
+    """
+
+    def __init__(self, directory: Union[str, Path], ttl_hours: Optional[float] = None,
+                 max_bytes: Optional[int] = None) -> None:
+        self.directory = Path(directory)
+        self.ttl_seconds = (CACHE_TTL_HOURS if ttl_hours is None else ttl_hours) * 3600
+        self.max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, etag: Optional[str]) -> str:
+        return hashlib.sha256(f"{url}\n{etag or ''}".encode("utf-8")).hexdigest()
+
+    def _url_path(self, url: str) -> Path:
+        return self.directory / "urls" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _blob_path(self, key: str) -> Path:
+        return self.directory / "blobs" / key[:2] / key
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _read_key(pointer_path: Path) -> Optional[str]:
+        try:
+            return json.loads(pointer_path.read_text("utf-8"))["key"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _used(self) -> int:
+        if self._bytes is None:
+            self._bytes = sum(self._size(path) for path in self.directory.rglob("*")
+                              if path.is_file())
+        return self._bytes
+
+    def _evict(self) -> None:
+        """Borra las URLs descargadas hace más tiempo hasta bajar de EVICT_TO * max_bytes."""
+        target = self.max_bytes * EVICT_TO
+        pointers = sorted(((self._size(p), p.stat().st_mtime, p)
+                           for p in (self.directory / "urls").glob("*.json")),
+                          key=lambda item: item[1])
+        for size, _, pointer_path in pointers:
+            if self._bytes <= target:
+                break
+            key = self._read_key(pointer_path)
+            if key is not None:
+                blob_path = self._blob_path(key)
+                self._bytes -= self._size(blob_path)
+                blob_path.unlink(missing_ok=True)
+            pointer_path.unlink(missing_ok=True)
+            self._bytes -= size
+            self.evictions += 1
+
+    def get(self, url: str) -> Optional[CachedArticle]:
+        try:
+            pointer = json.loads(self._url_path(url).read_text("utf-8"))
+            paragraph = self._blob_path(pointer["key"]).read_text("utf-8")
+        except (OSError, ValueError, KeyError):
+            return None
+        return CachedArticle(pointer.get("etag"), paragraph, pointer.get("fetched_at", 0.0))
+
+    def is_fresh(self, article: CachedArticle) -> bool:
+        return time.time() - article.fetched_at < self.ttl_seconds
+
+    def put(self, url: str, etag: Optional[str], paragraph: str) -> None:
+        key = self.key(url, etag)
+        blob = paragraph.encode("utf-8")
+        pointer = json.dumps(
+            {"url": url, "etag": etag, "key": key, "fetched_at": time.time()}).encode("utf-8")
+        url_path = self._url_path(url)
+        with self._lock:
+            used = self._used()
+            old_key = self._read_key(url_path)
+            old_blob = self._blob_path(old_key) if old_key is not None else None
+            replaced = self._size(url_path) + (self._size(old_blob) if old_blob else 0)
+            self._write(self._blob_path(key), blob)
+            self._write(url_path, pointer)
+            # El ETag cambió: el blob anterior ya no lo apunta nadie
+            if old_blob is not None and old_key != key:
+                old_blob.unlink(missing_ok=True)
+            self._bytes = used - replaced + len(blob) + len(pointer)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+
+def default_cache() -> ArticleCache:
+    return ArticleCache(CACHE_DIR)
+
+
+# ------------------------------
+# Fetching
+# ------------------------------
+def _charset(content_type: str) -> str:
+    match = re.search(r"charset=([\w.-]+)", content_type or "", re.IGNORECASE)
+    return match.group(1) if match else "utf-8"
+
+
+def _read_chunks(resp, max_bytes: int) -> Iterable[bytes]:
+    read = 0
+    while read < max_bytes:
+        chunk = resp.read(min(READ_CHUNK_BYTES, max_bytes - read))
+        if not chunk:
+            return
+        read += len(chunk)
+        yield chunk
+
+
+def fetch_first_paragraph(
+    url: str,
+    cache: Optional[ArticleCache] = None,
+    timeout: float = FETCH_TIMEOUT_SECONDS,
+    limiter: Optional[_HostLimiter] = None,
+) -> Optional[str]:
+    """
+    Primer párrafo del artículo en `url`, usando la caché si se pasa.
+    Nunca lanza: ante un error de red devuelve None (y no se cachea).
+    """
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None and cache.is_fresh(cached):
+        cache.hits += 1
+        return cached.paragraph or None
+
+    headers = {"User-Agent": USER_AGENT, "Accept": "text/html"}
+    if cached is not None and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    limiter = limiter or _HostLimiter(PER_HOST_LIMIT)
+    request = urllib.request.Request(url, headers=headers)
+
+    with limiter.for_url(url):
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as resp:
+                etag = resp.headers.get("ETag")
+                paragraph = extract_first_paragraph(
+                    _read_chunks(resp, MAX_BYTES), _charset(resp.headers.get("Content-Type")))
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304 and cached is not None:
+                cache.revalidated += 1
+                cache.put(url, cached.etag, cached.paragraph)
+                return cached.paragraph or None
+            return None
+        except (urllib.error.URLError, TimeoutError, OSError, ValueError):
+            return None
+
+    if cache is not None:
+        cache.misses += 1
+        cache.put(url, etag, paragraph or "")
+    return paragraph
+
+
+def fetch_first_paragraphs(
+    urls: Sequence[str],
+    cache: Optional[ArticleCache] = None,
+    max_concurrency: Optional[int] = None,
+    per_host_limit: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, Optional[str]]:
+    """Primer párrafo de cada URL (en paralelo y acotado). URL -> párrafo o None."""
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return {}
+    limiter = _HostLimiter(per_host_limit or PER_HOST_LIMIT)
+    timeout = FETCH_TIMEOUT_SECONDS if timeout is None else timeout
+    workers = max(1, min(max_concurrency or MAX_CONCURRENCY, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        paragraphs = pool.map(
+            lambda url: fetch_first_paragraph(url, cache, timeout, limiter), unique)
+        return dict(zip(unique, paragraphs))
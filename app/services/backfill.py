@@ -0,0 +1,264 @@
+"""
+Backfill offline: ingesta de volcados locales de feeds (XML/OPML) sin red.
+
+- Se recorren los `.xml/.rss/.atom` de un directorio y los feeds a los que
+  apuntan los `.opml` (atributo xmlUrl con ruta relativa al OPML).
+- Un pool de procesos parsea cada fichero con el lector incremental y prepara
+  las filas: normalización, fingerprint, puntuación de calidad y firma MinHash
+  (lo caro en CPU). Las filas salen en trozos de BACKFILL_CHUNK_ROWS por una
+  cola acotada (2 x workers trozos): un fichero enorme no se materializa
+  entero ni en el worker ni aquí, y si el escritor va más lento que el pool
+  los workers esperan. La memoria depende del tamaño del trozo, no del fichero.
+- Un único escritor (este proceso) inserta en `tips` con bulk_insert_tips los
+  trozos según llegan. Si el escritor falla, se avisa a los workers para que
+  paren (no se quedan esperando en la cola llena) y el error llega a quien
+  llama.
+- Cuando un fichero termina (su último trozo ya con commit) se añade una
+  línea al manifiesto (JSON lines). Al relanzar, los ficheros ya anotados con
+  el mismo tamaño y mtime se saltan. Repetir un fichero a medias es seguro: la
+  inserción es idempotente por fingerprint. De un fichero que se rompe a
+  medias se queda lo ya insertado y no se anota.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import Manager
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.services import near_dup
+from app.services.feed_stream import iter_feed_entries
+from app.services.ingest import score_rows, tip_row
+from app.services.tips import bulk_insert_tips
+
+FEED_SUFFIXES = {".xml", ".rss", ".atom"}
+MANIFEST_NAME = ".backfill-manifest.jsonl"
+CHUNK_ROWS = int(os.getenv("BACKFILL_CHUNK_ROWS", "1000"))
+
+
+@dataclass
+class BackfillStats:
+    files: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    entries: int = 0
+    tips: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def tips_per_second(self) -> float:
+        return self.tips / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"[BACKFILL] ficheros={self.files} saltados={self.files_skipped} "
+            f"fallidos={self.files_failed} entradas={self.entries} tips_nuevos={self.tips} "
+            f"en {self.elapsed:.1f}s ({self.files_per_second:.1f} ficheros/s, "
+            f"{self.tips_per_second:.0f} tips/s)"
+        )
+
+
+def _opml_feeds(path: Path) -> List[Path]:
+    """Ficheros locales referenciados por los <outline xmlUrl=...> de un OPML."""
+    feeds = []
+    try:
+        outlines = list(ET.parse(path).iter("outline"))
+    except ET.ParseError as exc:
+        print(f"[BACKFILL] OPML ilegible {path}: {exc!r}")
+        return feeds
+    for outline in outlines:
+        url = outline.get("xmlUrl")
+        if not url or ("://" in url and not url.startswith("file://")):
+            continue  # offline: las URLs remotas se ignoran
+        target = (path.parent / url.removeprefix("file://")).resolve()
+        if target.is_file():
+            feeds.append(target)
+    return feeds
+
+
+def discover_files(directory: Path) -> List[Path]:
+    """Feeds del directorio (recursivo) más los referenciados por sus OPML."""
+    found: Dict[Path, None] = {}
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file():
+            continue
+        if path.suffix.lower() in FEED_SUFFIXES:
+            found[path.resolve()] = None
+        elif path.suffix.lower() == ".opml":
+            for feed in _opml_feeds(path):
+                found[feed] = None
+    return list(found)
+
+
+def _file_key(path: Path) -> Tuple[str, int, int]:
+    st = path.stat()
+    return str(path), st.st_size, int(st.st_mtime)
+
+
+def load_manifest(manifest: Path) -> Set[Tuple[str, int, int]]:
+    done: Set[Tuple[str, int, int]] = set()
+    if not manifest.exists():
+        return done
+    with manifest.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                item = json.loads(line)
+                done.add((item["path"], item["size"], item["mtime"]))
+            except (ValueError, KeyError):
+                continue  # línea truncada por una interrupción
+    return done
+
+
+# Cada cuánto mira un worker bloqueado en la cola llena si debe parar
+PUT_POLL_SECONDS = 0.5
+
+
+class _Stopped(Exception):
+    """El escritor falló y pidió parar: el worker abandona su fichero."""
+
+
+def _put(out, stop, message: tuple) -> None:
+    while True:
+        if stop is not None and stop.is_set():
+            raise _Stopped()
+        try:
+            out.put(message, timeout=PUT_POLL_SECONDS)
+            return
+        except queue.Full:
+            continue
+
+
+def _send_rows(out, stop, path: str, rows: List[dict]) -> None:
+    score_rows(rows)
+    _put(out, stop, ("rows", path, rows))
+
+
+def parse_file(path: str, topic_id: int, out, chunk_rows: int = CHUNK_ROWS, stop=None) -> None:
+    """
+    Worker: parsea un fichero y manda por la cola `out` trozos ("rows", ruta,
+    filas listas para insertar) y al final ("done", ruta, (entradas leídas,
+    error)). No toca la BD. Si se activa el evento `stop` deja de enviar y
+    termina sin avisar.
+    """
+    try:
+        _parse_file(path, topic_id, out, chunk_rows, stop)
+    except _Stopped:
+        return
+
+
+def _parse_file(path: str, topic_id: int, out, chunk_rows: int, stop) -> None:
+    rows: List[dict] = []
+    entries = 0
+    error: Optional[str] = None
+    try:
+        for entry in iter_feed_entries(path):
+            entries += 1
+            row = tip_row(topic_id, entry.title, entry.summary, entry.link)
+            if row is not None:
+                row["minhash"] = near_dup.pack_signature(
+                    near_dup.signature(row["title"], row["body"]))
+                rows.append(row)
+                if len(rows) >= chunk_rows:
+                    _send_rows(out, stop, path, rows)
+                    rows = []
+    except (ET.ParseError, OSError) as exc:
+        error = repr(exc)
+    if rows:
+        _send_rows(out, stop, path, rows)
+    _put(out, stop, ("done", path, (entries, error)))
+
+
+def _drain(chunks) -> None:
+    while True:
+        try:
+            chunks.get_nowait()
+        except queue.Empty:
+            return
+
+
+def _write_chunks(db: Session, chunks, futures: List[Future], stats: BackfillStats,
+                  log, tips_by_file: Dict[str, int]) -> None:
+    """Escritor: inserta los trozos según llegan y anota cada fichero terminado."""
+    open_files = len(futures)
+    while open_files:
+        try:
+            kind, path, payload = chunks.get(timeout=1)
+        except queue.Empty:
+            for future in futures:
+                if future.done() and not future.cancelled() and future.exception() is not None:
+                    raise future.exception()  # el worker murió sin avisar
+            continue
+        if kind == "rows":
+            inserted = bulk_insert_tips(db, payload)
+            stats.tips += inserted.inserted
+            tips_by_file[path] += inserted.inserted
+            continue
+        open_files -= 1
+        entries, error = payload
+        stats.entries += entries
+        if error:
+            stats.files_failed += 1
+            print(f"[BACKFILL] Error en {path}: {error}")
+            continue
+        stats.files += 1
+        _, size, mtime = _file_key(Path(path))
+        log.write(json.dumps({"path": path, "size": size, "mtime": mtime,
+                              "tips": tips_by_file.pop(path)}) + "\n")
+        log.flush()
+
+
+def run_backfill(
+    db: Session,
+    topic_id: int,
+    directory: Path,
+    workers: Optional[int] = None,
+    manifest: Optional[Path] = None,
+    chunk_rows: Optional[int] = None,
+) -> BackfillStats:
+    directory = Path(directory)
+    manifest = Path(manifest) if manifest else directory / MANIFEST_NAME
+    stats = BackfillStats()
+    started = time.perf_counter()
+
+    done = load_manifest(manifest)
+    pending: List[str] = []
+    for path in discover_files(directory):
+        if _file_key(path) in done:
+            stats.files_skipped += 1
+        else:
+            pending.append(str(path))
+
+    workers = workers or os.cpu_count() or 1
+    with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool, \
+            manifest.open("a", encoding="utf-8") as log:
+        chunks = manager.Queue(maxsize=2 * workers)
+        stop = manager.Event()
+        futures = [pool.submit(parse_file, path, topic_id, chunks, chunk_rows or CHUNK_ROWS, stop)
+                   for path in pending]
+        try:
+            _write_chunks(db, chunks, futures, stats, log, {path: 0 for path in pending})
+        except BaseException:
+            # Sin esto, la salida del `with` esperaría para siempre a workers
+            # bloqueados en la cola llena. Con `stop` cada worker lo deja en
+            # PUT_POLL_SECONDS como mucho; se espera a que salgan antes de
+            # cerrar el Manager, que es quien sirve `stop` y la cola.
+            stop.set()
+            _drain(chunks)
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
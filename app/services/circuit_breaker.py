@@ -0,0 +1,109 @@
+"""
+Circuit breaker para llamadas a un servicio externo lento o caído.
+
+Guarda el resultado de las últimas `window` llamadas; una llamada cuenta como
+mala si falla o si tarda más de `slow_seconds`. Estados:
+
+- closed: todo pasa. Si hay al menos `min_calls` en la ventana y la fracción
+  de malas llega a `failure_ratio`, se abre.
+- open: nada pasa (quien llama usa su fallback al momento) durante
+  `open_seconds`.
+- half_open: pasada la espera, se deja pasar una única llamada de prueba; si
+  va bien se cierra (ventana limpia) y si no, se vuelve a abrir.
+
+Cada cambio de estado se imprime, se cuenta en `transitions` y se notifica a
+los `listeners` (p. ej. para las métricas de la ejecución).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, List
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+Listener = Callable[[str, str], None]
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        slow_seconds: float = 10.0,
+        open_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.transitions: Counter = Counter()
+        self.listeners: List[Listener] = []
+        self._results: Deque[bool] = deque(maxlen=window)  # True = llamada mala
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+                self._set_state(HALF_OPEN)
+            return self._state
+
+    def allow(self) -> bool:
+        """¿Puede salir una llamada ahora? En half_open solo una a la vez."""
+        with self._lock:
+            if self._state == OPEN:
+                if self.clock() - self._opened_at < self.open_seconds:
+                    return False
+                self._set_state(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record(self, ok: bool, elapsed: float = 0.0) -> None:
+        """Resultado de una llamada que `allow()` dejó pasar."""
+        bad = not ok or elapsed > self.slow_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if bad:
+                    self._open()
+                else:
+                    self._results.clear()
+                    self._set_state(CLOSED)
+                return
+            self._results.append(bad)
+            if (
+                self._state == CLOSED
+                and len(self._results) >= self.min_calls
+                and sum(self._results) / len(self._results) >= self.failure_ratio
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        self._opened_at = self.clock()
+        self._set_state(OPEN)
+
+    def _set_state(self, new: str) -> None:
+        old = self._state
+        if old == new:
+            return
+        self._state = new
+        self.transitions[f"{old}->{new}"] += 1
+        print(f"[BREAKER] {self.name}: {old} -> {new}")
+        for listener in self.listeners:
+            listener(old, new)
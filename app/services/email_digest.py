@@ -1,67 +1,359 @@
-"""Resumen diario por email (Fase C): misma lógica de selección que la app."""
+"""
+Resumen diario por email (Fase C): misma lógica de selección que la app.
+
+El envío es un pipeline productor/consumidor sobre la bandeja `email_outbox`
+(ver email_outbox.py):
+
+- Productor (hilo principal, dueño de la sesión de BD): recorre los usuarios
+  en lotes de EMAIL_USER_CHUNK (paginación por id, memoria plana). Por lote,
+  descarta a quien ya tiene fila ese día, hace una consulta de suscripciones,
+  la selección de todo el lote en bloque (selector.DailyBundleSelector, con
+  los topics de los tips precargados) y el render del mensaje MIME de cada
+  usuario (mail.DigestRenderer: fragmentos por tip y cuerpos MIME compartidos
+  durante la ejecución), y lo encola en la bandeja. Después reclama las filas
+  enviables, sin pasar de lo que cabe en una cola acotada (EMAIL_QUEUE_SIZE):
+  si el SMTP va lento el productor espera (renovando los leases de lo
+  reclamado) en vez de acumular mensajes en memoria.
+- Consumidores: EMAIL_WORKERS hilos (por defecto, el tamaño del pool SMTP)
+  que envían por el transporte compartido (mail.SmtpTransport), con un límite
+  global de EMAIL_RATE_PER_SECOND mensajes por segundo (0 = sin límite). El
+  productor escribe sus resultados en la bandeja entre lote y lote.
+
+Relanzar el job el mismo día no repite selección ni envíos: solo procesa lo
+que quedó pendiente. Un fallo (de selección o de envío) solo afecta a ese
+usuario.
+"""
 
 from __future__ import annotations
 
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
 from datetime import date
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db.models import User
 from app.core.timezones import resolve_effective_timezone
-from app.services.mail import smtp_configured, send_email, build_tip_digest_bodies
-from app.services.plan_policy import apply_plan_policy
-from app.services.selector import pick_daily_bundle
+from app.services.email_outbox import (
+    EMAIL_CLAIM_BATCH,
+    EMAIL_LEASE_SECONDS,
+    ClaimedEmail,
+    claim_batch,
+    enqueue,
+    outbox_counts,
+    queued_user_ids,
+    record_results,
+    renew_leases,
+)
+from app.services.mail import (
+    DigestRenderer,
+    SmtpTransport,
+    close_transport,
+    get_transport,
+    smtp_configured,
+)
+from app.services.plan_policy import apply_plan_policy, plan_topics
+from app.services.rate_limit import RateLimiter
+from app.services.selector import (
+    BundleRequest,
+    DailyBundleSelector,
+    get_subscribed_topics_for_users,
+    pick_daily_bundle,
+)
 
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "0"))  # 0 = SMTP_POOL_SIZE
+EMAIL_RATE_PER_SECOND = float(os.getenv("EMAIL_RATE_PER_SECOND", "0"))
+EMAIL_QUEUE_SIZE = int(os.getenv("EMAIL_QUEUE_SIZE", "100"))
+EMAIL_USER_CHUNK = int(os.getenv("EMAIL_USER_CHUNK", "500"))
 
-def send_daily_email_digests(db: Session, target_date: date) -> int:
+
+@dataclass
+class DigestMessage:
+    """Mensaje ya renderizado (None si ese día no hay tips para el usuario)."""
+    user_id: int
+    email: str
+    message: Optional[str]
+    outbox_id: Optional[int] = None
+
+
+@dataclass
+class DeliveryStats:
+    sent: int = 0
+    failed: int = 0
+
+
+def _digest_users(db: Session, chunk_size: Optional[int] = None) -> Iterator[Sequence[User]]:
     """
-    Envía un correo por usuario activo con email_digest_enabled.
-    No crea filas Delivery (evita duplicar con canal app); es aviso/digest.
-    Devuelve cuántos correos se enviaron.
+    Destinatarios del digest en lotes por clave (id > último id del lote
+    anterior): memoria plana como con yield_per, pero sin cursor abierto entre
+    lotes, así que el llamante puede hacer commit entre uno y otro (en
+    PostgreSQL el commit cierra los cursores de servidor de yield_per).
     """
-    if not smtp_configured():
-        return 0
-
-    users = list(
-        db.scalars(
-            select(User).where(
+    size = chunk_size or EMAIL_USER_CHUNK
+    last_id = 0
+    while True:
+        users = list(db.scalars(
+            select(User)
+            .where(
                 User.is_active.is_(True),
                 User.email_digest_enabled.is_(True),
+                User.id > last_id,
             )
-        ).all()
+            .order_by(User.id)
+            .limit(size)
+        ))
+        if not users:
+            return
+        yield users
+        last_id = users[-1].id
+
+
+def _pick_bundle_for_user(db: Session, user: User, tz: str) -> list:
+    """Selección de un solo usuario (la de la app); respaldo si falla el lote."""
+    topics_allowed, per_topic_eff = apply_plan_policy(db, user, 1)
+    return pick_daily_bundle(
+        db=db,
+        user_id=user.id,
+        per_topic=per_topic_eff,
+        strategy="latest",
+        tz_name=tz,
+        topics_override=topics_allowed,
     )
-    sent = 0
-    date_label = target_date.isoformat()
 
+
+def _render_chunk(
+    db: Session,
+    users: Sequence[User],
+    target_date: date,
+    from_addr: str,
+    selector: DailyBundleSelector,
+    renderer: DigestRenderer,
+) -> Iterator[DigestMessage]:
+    """Selección en bloque + render por usuario; los errores se aíslan por usuario."""
+    date_label = target_date.isoformat()
+    ready: List[User] = []
+    timezones = {}
     for user in users:
         try:
-            tz = resolve_effective_timezone(None, user.iana_timezone)
-            topics_allowed, per_topic_eff = apply_plan_policy(db, user, 1)
-            bundle = pick_daily_bundle(
-                db=db,
-                user_id=user.id,
-                per_topic=per_topic_eff,
-                strategy="latest",
-                tz_name=tz,
-                topics_override=topics_allowed,
-            )
+            timezones[user.id] = resolve_effective_timezone(None, user.iana_timezone)
+            ready.append(user)
+        except Exception as exc:
+            print(f"[EMAIL] No se pudo preparar el digest de {user.email!r}: {exc!r}")
+    try:
+        subscribed = get_subscribed_topics_for_users(db, [user.id for user in ready])
+        requests = []
+        for user in ready:
+            topics_allowed, per_topic_eff = plan_topics(user, subscribed[user.id], 1)
+            requests.append(BundleRequest(user.id, topics_allowed, per_topic_eff, timezones[user.id]))
+        bundles = selector.pick(requests)
+    except Exception as exc:
+        print(f"[EMAIL] Falló la selección del lote; se sigue usuario a usuario: {exc!r}")
+        bundles = None
+
+    for user in ready:
+        try:
+            if bundles is not None:
+                bundle = bundles[user.id]
+            else:
+                bundle = _pick_bundle_for_user(db, user, timezones[user.id])
             tips_flat = [tip for _, tips_list in bundle for tip in tips_list]
 
             if not tips_flat:
+                yield DigestMessage(user.id, user.email, None)
                 continue
 
-            for tip in tips_flat:
-                _ = tip.topic
-
             subject = f"Tips — {date_label} ({len(tips_flat)} tip(s))"
-            text_body, html_body = build_tip_digest_bodies(tips_flat, date_label)
-            send_email(user.email, subject, text_body, html_body)
-            sent += 1
+            yield DigestMessage(
+                user.id, user.email,
+                renderer.message(from_addr, user.email, subject, tips_flat, date_label))
         except Exception as exc:
-            print(f"[EMAIL] No se pudo enviar a {user.email!r}: {exc!r}")
+            print(f"[EMAIL] No se pudo preparar el digest de {user.email!r}: {exc!r}")
+
+
+def deliver_messages(
+    messages: Iterable[DigestMessage],
+    transport: Optional[SmtpTransport] = None,
+    workers: Optional[int] = None,
+    rate_per_second: Optional[float] = None,
+    queue_size: Optional[int] = None,
+    on_result: Optional[Callable[[DigestMessage, Optional[str]], None]] = None,
+) -> DeliveryStats:
+    """
+    Consumidores: envía los mensajes con `workers` hilos y como mucho
+    `rate_per_second` mensajes por segundo. `messages` se consume en el hilo
+    que llama, al ritmo que permite la cola acotada. `on_result(mensaje,
+    error)` se llama desde los hilos de envío (error None si se envió).
+    """
+    transport = transport or get_transport()
+    workers = max(1, workers or EMAIL_WORKERS or transport.settings.pool_size)
+    limiter = RateLimiter(EMAIL_RATE_PER_SECOND if rate_per_second is None else rate_per_second)
+    pending: "queue.Queue[Optional[DigestMessage]]" = queue.Queue(
+        maxsize=max(1, queue_size or EMAIL_QUEUE_SIZE))
+    stats = DeliveryStats()
+    lock = threading.Lock()
+
+    def consume() -> None:
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            limiter.wait()
+            error = None
+            try:
+                transport.send_message(item.email, item.message)
+                with lock:
+                    stats.sent += 1
+            except Exception as exc:
+                error = repr(exc)
+                with lock:
+                    stats.failed += 1
+                print(f"[EMAIL] No se pudo enviar a {item.email!r}: {error}")
+            if on_result is not None:
+                on_result(item, error)
+
+    threads: List[threading.Thread] = [
+        threading.Thread(target=consume, name=f"email-{i}", daemon=True) for i in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for message in messages:
+            pending.put(message)
+    finally:
+        for _ in threads:
+            pending.put(None)
+        for thread in threads:
+            thread.join()
+    return stats
+
+
+class _OutboxPump:
+    """
+    Productor con bandeja de salida: por lote de usuarios, encola (selección +
+    render) a quien aún no tiene fila ese día y reclama lo enviable; entre
+    lote y lote escribe en BD los resultados que van dejando los hilos de
+    envío. Todo el acceso a la BD ocurre en el hilo que llama.
+
+    Nunca tiene más filas reclamadas sin resultado que `capacity` (lo que cabe
+    en la cola): con la cola llena espera resultados y, mientras, renueva el
+    lease de lo reclamado cada tercio de lease. Así un SMTP lento o un límite
+    de ritmo bajo no dejan vencer el lease de filas que siguen en cola (otro
+    proceso, o este mismo, las reclamaría y se enviarían dos veces).
+    """
+
+    def __init__(self, db: Session, target_date: date, from_addr: str,
+                 capacity: int, lease_seconds: float) -> None:
+        self.db = db
+        self.target_date = target_date
+        self.from_addr = from_addr
+        self.capacity = max(1, capacity)
+        self.lease_seconds = lease_seconds
+        self.enqueued = 0
+        self._claimed: Dict[int, ClaimedEmail] = {}
+        self._results: List[tuple] = []
+        self._results_ready = threading.Condition()
+        self._renewed_at = time.monotonic()
+
+    def on_result(self, message: DigestMessage, error: Optional[str]) -> None:
+        with self._results_ready:
+            self._results.append((message.outbox_id, error))
+            self._results_ready.notify()
+
+    def flush(self) -> None:
+        with self._results_ready:
+            results, self._results = self._results, []
+        if not results:
+            return
+        sent = [outbox_id for outbox_id, error in results if error is None]
+        failed = [(self._claimed.pop(outbox_id), error) for outbox_id, error in results if error]
+        for outbox_id in sent:
+            self._claimed.pop(outbox_id, None)
+        record_results(self.db, sent, failed)
+
+    def _renew(self) -> None:
+        if not self._claimed or time.monotonic() - self._renewed_at < self.lease_seconds / 3:
+            return
+        renew_leases(self.db, list(self._claimed), self.lease_seconds)
+        self._renewed_at = time.monotonic()
+
+    def _await_results(self) -> None:
+        """Espera algún resultado (o un tercio de lease), lo guarda y renueva leases."""
+        with self._results_ready:
+            if not self._results:
+                self._results_ready.wait(self.lease_seconds / 3)
+        self.flush()
+        self._renew()
+
+    def _enqueue(self, users: Sequence[User], selector: DailyBundleSelector,
+                 renderer: DigestRenderer) -> None:
+        self._renew()
+        queued = queued_user_ids(self.db, self.target_date, [user.id for user in users])
+        todo = [user for user in users if user.id not in queued]
+        rows = [
+            {"user_id": m.user_id, "digest_date": self.target_date, "email": m.email,
+             "payload": m.message}
+            for m in _render_chunk(self.db, todo, self.target_date, self.from_addr,
+                                   selector, renderer)
+        ]
+        self.enqueued += enqueue(self.db, rows)
+        self.db.commit()
+
+    def _drain(self) -> Iterator[DigestMessage]:
+        while True:
+            self.flush()
+            while len(self._claimed) >= self.capacity:
+                self._await_results()
+            self._renew()
+            batch = claim_batch(self.db, self.target_date,
+                                limit=min(EMAIL_CLAIM_BATCH, self.capacity - len(self._claimed)),
+                                lease_seconds=self.lease_seconds)
+            if not batch:
+                return
+            for item in batch:
+                self._claimed[item.id] = item
+                yield DigestMessage(item.user_id, item.email, item.payload, item.id)
+
+    def messages(self) -> Iterator[DigestMessage]:
+        selector = DailyBundleSelector(self.db)
+        renderer = DigestRenderer()
+        for users in _digest_users(self.db):
+            self._enqueue(users, selector, renderer)
+            yield from self._drain()
+        yield from self._drain()
+        # Lo último reclamado sigue en cola: mantener sus leases hasta el final
+        while self._claimed:
+            self._await_results()
+
+
+def send_daily_email_digests(db: Session, target_date: date) -> int:
+    """
+    Envía un correo por usuario activo con email_digest_enabled.
+    No crea filas Delivery (evita duplicar con canal app); es aviso/digest.
+    Pasa por la bandeja `email_outbox`: se puede relanzar para el mismo día y
+    solo envía lo pendiente. Devuelve cuántos correos se enviaron.
+    """
+    if not smtp_configured():
+        return 0
 
-    return sent
+    transport = get_transport()
+    queue_size = max(1, EMAIL_QUEUE_SIZE)
+    # Como mucho una cola llena reclamada a la vez: `put` nunca espera
+    pump = _OutboxPump(db, target_date, transport.settings.from_addr,
+                       capacity=queue_size, lease_seconds=EMAIL_LEASE_SECONDS)
+    stats = deliver_messages(pump.messages(), transport, queue_size=queue_size,
+                             on_result=pump.on_result)
+    pump.flush()
+    if stats.failed:
+        print(f"[EMAIL] Envíos fallidos: {stats.failed}")
+    counts = outbox_counts(db, target_date)
+    print(f"[EMAIL] Bandeja {target_date.isoformat()}: encolados={pump.enqueued} "
+          + " ".join(f"{status}={n}" for status, n in sorted(counts.items())))
+    return stats.sent
 
 
 def run_email_digest(db: Session, target_date: date | None = None) -> int:
@@ -70,6 +362,10 @@ def run_email_digest(db: Session, target_date: date | None = None) -> int:
     if not smtp_configured():
         print("[EMAIL] SMTP no configurado (SMTP_HOST); se omite el digest.")
         return 0
-    n = send_daily_email_digests(db, target_date)
+    try:
+        n = send_daily_email_digests(db, target_date)
+    finally:
+        # Cierra (QUIT) las sesiones SMTP del pool al terminar el job
+        close_transport()
     print(f"[EMAIL] Digest enviado a {n} usuario(s).")
     return n
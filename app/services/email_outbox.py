@@ -0,0 +1,211 @@
+"""
+Bandeja de salida persistente del digest por email (tabla `email_outbox`).
+
+Una fila por (usuario, fecha del digest), con el mensaje ya renderizado:
+
+- La selección encola las filas (pending, o skipped si ese día no hay tips).
+  INSERT ... ON CONFLICT DO NOTHING sobre uq_outbox_user_date: encolar dos
+  veces el mismo usuario y día no duplica nada.
+- Los envíos reclaman lotes de filas pendientes con un lease: UPDATE ...
+  WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING. En PostgreSQL
+  varios procesos reparten el trabajo sin pisarse; en SQLite el UPDATE ya es
+  atómico (FOR UPDATE no se emite). Una fila `sending` con el lease vencido
+  (el proceso murió) vuelve a poder reclamarse; mientras vive, el proceso
+  renueva el lease de lo que tiene reclamado y aún no ha enviado.
+- Un fallo reprograma la fila con backoff exponencial (EMAIL_RETRY_BASE_SECONDS
+  x 2^(intentos-1), hasta EMAIL_RETRY_MAX_SECONDS) y, tras EMAIL_MAX_ATTEMPTS
+  intentos, la deja en `failed`.
+
+Si el job se cae a mitad, la siguiente ejecución solo selecciona a quien no
+tiene fila y solo envía lo que quedó sin enviar. La entrega es "al menos una
+vez": si el proceso muere entre la aceptación SMTP y el commit del lote, ese
+mensaje se reenvía al vencer el lease.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import EmailOutbox
+
+STATUS_PENDING = "pending"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "60"))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "3600"))
+EMAIL_LEASE_SECONDS = float(os.getenv("EMAIL_LEASE_SECONDS", "300"))
+EMAIL_CLAIM_BATCH = int(os.getenv("EMAIL_CLAIM_BATCH", "200"))
+
+
+@dataclass
+class ClaimedEmail:
+    id: int
+    user_id: int
+    email: str
+    payload: str
+    attempts: int
+
+
+def queued_user_ids(db: Session, digest_date: date, user_ids: Sequence[int]) -> Set[int]:
+    """Usuarios del lote que ya tienen fila para ese día (en cualquier estado)."""
+    if not user_ids:
+        return set()
+    return set(db.execute(
+        select(EmailOutbox.user_id).where(
+            EmailOutbox.digest_date == digest_date,
+            EmailOutbox.user_id.in_(list(user_ids)),
+        )
+    ).scalars())
+
+
+def enqueue(db: Session, rows: List[dict], now: Optional[datetime] = None) -> int:
+    """
+    Inserta filas (user_id, digest_date, email, payload; payload None = skipped)
+    ignorando las que ya existen. Devuelve cuántas se insertaron; el commit lo
+    hace quien llama.
+    """
+    if not rows:
+        return 0
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:  # pragma: no cover - solo usamos SQLite y PostgreSQL
+        raise RuntimeError(f"Bulk insert not supported for dialect {dialect!r}")
+    now = now or datetime.utcnow()
+    values = [
+        {
+            "user_id": row["user_id"],
+            "digest_date": row["digest_date"],
+            "email": row["email"],
+            "payload": row["payload"],
+            "status": STATUS_PENDING if row["payload"] is not None else STATUS_SKIPPED,
+            "attempts": 0,
+            "created_at": now,
+            "next_attempt_at": now,
+        }
+        for row in rows
+    ]
+    stmt = (
+        insert(EmailOutbox).values(values)
+        .on_conflict_do_nothing(index_elements=[EmailOutbox.user_id, EmailOutbox.digest_date])
+        .returning(EmailOutbox.id)
+    )
+    return len(db.execute(stmt).all())
+
+
+def claim_batch(
+    db: Session,
+    digest_date: date,
+    limit: Optional[int] = None,
+    lease_seconds: Optional[float] = None,
+    now: Optional[datetime] = None,
+) -> List[ClaimedEmail]:
+    """Reclama (y hace commit) hasta `limit` filas enviables ahora."""
+    now = now or datetime.utcnow()
+    lease = EMAIL_LEASE_SECONDS if lease_seconds is None else lease_seconds
+    claimable = (
+        select(EmailOutbox.id)
+        .where(
+            EmailOutbox.digest_date == digest_date,
+            or_(
+                (EmailOutbox.status == STATUS_PENDING) & (EmailOutbox.next_attempt_at <= now),
+                (EmailOutbox.status == STATUS_SENDING) & (EmailOutbox.lease_until < now),
+            ),
+        )
+        .order_by(EmailOutbox.id)
+        .limit(limit or EMAIL_CLAIM_BATCH)
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(claimable.scalar_subquery()))
+        .values(
+            status=STATUS_SENDING,
+            attempts=EmailOutbox.attempts + 1,
+            lease_until=now + timedelta(seconds=lease),
+        )
+        .returning(EmailOutbox.id, EmailOutbox.user_id, EmailOutbox.email,
+                   EmailOutbox.payload, EmailOutbox.attempts)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return sorted((ClaimedEmail(*row) for row in rows), key=lambda c: c.id)
+
+
+def renew_leases(
+    db: Session,
+    ids: Iterable[int],
+    lease_seconds: Optional[float] = None,
+    now: Optional[datetime] = None,
+) -> None:
+    """Alarga (con commit) el lease de filas reclamadas que siguen sin resultado."""
+    id_list = list(ids)
+    if not id_list:
+        return
+    now = now or datetime.utcnow()
+    lease = EMAIL_LEASE_SECONDS if lease_seconds is None else lease_seconds
+    db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(id_list), EmailOutbox.status == STATUS_SENDING)
+        .values(lease_until=now + timedelta(seconds=lease))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def retry_delay(attempts: int) -> float:
+    """Segundos hasta el siguiente intento tras `attempts` intentos fallidos."""
+    return min(EMAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), EMAIL_RETRY_MAX_SECONDS)
+
+
+def record_results(
+    db: Session,
+    sent: Iterable[int],
+    failed: Iterable[Tuple[ClaimedEmail, str]],
+    now: Optional[datetime] = None,
+) -> None:
+    """Marca enviadas / reprograma o da por fallidas las filas de un lote (con commit)."""
+    now = now or datetime.utcnow()
+    sent_ids = list(sent)
+    if sent_ids:
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(sent_ids))
+            .values(status=STATUS_SENT, sent_at=now, lease_until=None, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+    for item, error in failed:
+        exhausted = item.attempts >= EMAIL_MAX_ATTEMPTS
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == item.id)
+            .values(
+                status=STATUS_FAILED if exhausted else STATUS_PENDING,
+                next_attempt_at=now + timedelta(seconds=retry_delay(item.attempts)),
+                lease_until=None,
+                last_error=error[:255],
+            )
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+
+def outbox_counts(db: Session, digest_date: date) -> Dict[str, int]:
+    """Filas por estado para un día."""
+    return dict(db.execute(
+        select(EmailOutbox.status, func.count())
+        .where(EmailOutbox.digest_date == digest_date)
+        .group_by(EmailOutbox.status)
+    ).all())
@@ -0,0 +1,167 @@
+"""
+Descarga concurrente de feeds RSS/Atom (etapa de red de la ingesta).
+
+Las descargas van en un pool de hilos con un límite global
+(INGEST_MAX_CONCURRENCY) y otro por host (INGEST_PER_HOST_LIMIT). Cada petición
+tiene timeout y se reintenta con backoff exponencial ante errores de red,
+429 y 5xx, como pide docs/07-Ingestion-Pipeline.md. El parseo y la escritura
+en BD se hacen después, en app/services/ingest.py.
+
+Admite GET condicional: si se pasan cabeceras If-None-Match/If-Modified-Since
+y el servidor responde 304, el resultado queda con `not_modified` y sin cuerpo.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+MAX_CONCURRENCY = int(os.getenv("INGEST_MAX_CONCURRENCY", "8"))
+PER_HOST_LIMIT = int(os.getenv("INGEST_PER_HOST_LIMIT", "2"))
+FETCH_TIMEOUT_SECONDS = float(os.getenv("INGEST_FETCH_TIMEOUT_SECONDS", "15"))
+FETCH_RETRIES = int(os.getenv("INGEST_FETCH_RETRIES", "3"))
+BACKOFF_SECONDS = float(os.getenv("INGEST_BACKOFF_SECONDS", "0.5"))
+
+USER_AGENT = "tips-app-ingest/1.0"
+
+# Respuestas que merece la pena reintentar.
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: Optional[int] = None
+    content: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    attempts: int = 0
+    # Tiempo de red: suma de las peticiones, sin colas del límite por host ni backoff
+    elapsed: float = 0.0
+    # Espera por el límite por host más el backoff entre reintentos
+    waited: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status == 200
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class _HostLimiter:
+    """Un semáforo por host, creado bajo demanda."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.limit)
+                self._semaphores[host] = sem
+            return sem
+
+
+def fetch_feed(
+    url: str,
+    timeout: float = FETCH_TIMEOUT_SECONDS,
+    retries: int = FETCH_RETRIES,
+    backoff: float = BACKOFF_SECONDS,
+    limiter: Optional[_HostLimiter] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> FetchResult:
+    """
+    Descarga un feed con reintentos. Nunca lanza: los errores quedan en
+    FetchResult.error para que un feed roto no pare el resto de la ingesta.
+    `headers` añade cabeceras a la petición (p. ej. las del GET condicional).
+    """
+    limiter = limiter or _HostLimiter(PER_HOST_LIMIT)
+    result = FetchResult(url=url)
+    request = urllib.request.Request(
+        url, headers={"User-Agent": USER_AGENT, **(headers or {})}
+    )
+
+    for attempt in range(1, retries + 2):
+        result.attempts = attempt
+        retry = False
+        # El límite por host solo cubre la petición, no la espera del backoff.
+        queued = time.perf_counter()
+        with limiter.for_url(url):
+            started = time.perf_counter()
+            result.waited += started - queued
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as resp:
+                    result.status = resp.status
+                    result.headers = {k.lower(): v for k, v in resp.headers.items()}
+                    result.content = resp.read()
+                    result.error = None
+            except urllib.error.HTTPError as exc:
+                result.status = exc.code
+                result.headers = {k.lower(): v for k, v in (exc.headers or {}).items()}
+                if exc.code == 304:
+                    # No es un error: el feed no ha cambiado desde la última vez.
+                    result.content = b""
+                    result.error = None
+                else:
+                    result.error = f"HTTP {exc.code}"
+                    retry = exc.code in RETRYABLE_STATUS
+            except (urllib.error.URLError, TimeoutError, OSError) as exc:
+                result.status = None
+                result.error = repr(exc)
+                retry = True
+            finally:
+                result.elapsed += time.perf_counter() - started
+
+        if not retry or attempt > retries:
+            break
+        delay = backoff * 2 ** (attempt - 1)
+        time.sleep(delay)
+        result.waited += delay
+    return result
+
+
+def fetch_feeds(
+    urls: Sequence[str],
+    max_concurrency: Optional[int] = None,
+    per_host_limit: Optional[int] = None,
+    timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+    backoff: Optional[float] = None,
+    headers_by_url: Optional[Dict[str, Dict[str, str]]] = None,
+) -> List[FetchResult]:
+    """
+    Descarga todas las URLs en paralelo; devuelve los resultados en el mismo orden.
+    Los parámetros omitidos toman los valores configurados por entorno.
+    `headers_by_url` permite cabeceras propias por URL (GET condicional).
+    """
+    headers_by_url = headers_by_url or {}
+    if not urls:
+        return []
+    max_concurrency = max_concurrency or MAX_CONCURRENCY
+    timeout = FETCH_TIMEOUT_SECONDS if timeout is None else timeout
+    retries = FETCH_RETRIES if retries is None else retries
+    backoff = BACKOFF_SECONDS if backoff is None else backoff
+    limiter = _HostLimiter(per_host_limit or PER_HOST_LIMIT)
+    workers = max(1, min(max_concurrency, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-fetch") as pool:
+        return list(
+            pool.map(
+                lambda u: fetch_feed(u, timeout=timeout, retries=retries,
+                                     backoff=backoff, limiter=limiter,
+                                     headers=headers_by_url.get(u)),
+                urls,
+            )
+        )
@@ -0,0 +1,94 @@
+"""
+Planificación adaptativa de la ingesta por feed.
+
+Cada feed tiene su intervalo de sondeo (`poll_interval_minutes`) y su
+`next_fetch_at`. Una ejecución solo descarga los feeds vencidos (consulta por
+el índice ix_feeds_due), así que con miles de feeds registrados se toca solo
+una fracción. Tras cada sondeo:
+
+- Media móvil de entradas nuevas por descarga (`avg_new_entries`).
+- Feeds prolíficos (media >= FEED_BUSY_ENTRIES) acortan el intervalo a la mitad;
+  feeds tranquilos (media < FEED_QUIET_ENTRIES, o 304) lo alargan x1.5.
+  Siempre entre FEED_MIN_POLL_MINUTES y FEED_MAX_POLL_MINUTES.
+- Los fallos no tocan el intervalo aprendido: se reintenta tras
+  intervalo * 2^racha, con tope FEED_MAX_BACKOFF_MINUTES.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import Feed, Topic
+
+MIN_POLL_MINUTES = int(os.getenv("FEED_MIN_POLL_MINUTES", "30"))
+MAX_POLL_MINUTES = int(os.getenv("FEED_MAX_POLL_MINUTES", "1440"))
+MAX_BACKOFF_MINUTES = int(os.getenv("FEED_MAX_BACKOFF_MINUTES", "10080"))
+BUSY_ENTRIES = float(os.getenv("FEED_BUSY_ENTRIES", "3"))
+QUIET_ENTRIES = float(os.getenv("FEED_QUIET_ENTRIES", "0.5"))
+# Peso de la última descarga en la media móvil
+EWMA_ALPHA = 0.3
+
+STATUS_OK = "ok"
+STATUS_NOT_MODIFIED = "not_modified"
+STATUS_ERROR = "error"
+
+
+def due_feeds(db: Session, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[Feed]:
+    """
+    Feeds activos de topics activos cuyo next_fetch_at ya ha pasado, los más
+    atrasados primero. Los de un topic desactivado no se sondean ni se
+    reprograman: vuelven a estar vencidos en cuanto se reactive el topic.
+    """
+    now = now or datetime.utcnow()
+    stmt = (
+        select(Feed)
+        .join(Topic, Topic.id == Feed.topic_id)
+        .where(Feed.is_active.is_(True), Topic.is_active.is_(True), Feed.next_fetch_at <= now)
+        .order_by(Feed.next_fetch_at, Feed.id)
+    )
+    if limit:
+        stmt = stmt.limit(limit)
+    return list(db.execute(stmt).scalars())
+
+
+def _clamp(minutes: float) -> int:
+    return int(min(MAX_POLL_MINUTES, max(MIN_POLL_MINUTES, round(minutes))))
+
+
+def record_poll(
+    feed: Feed,
+    status: str,
+    new_entries: int = 0,
+    error: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> None:
+    """Actualiza estadísticas e intervalo del feed y fija su próximo sondeo."""
+    now = now or datetime.utcnow()
+    feed.last_fetch_at = now
+    feed.last_status = status
+
+    if status == STATUS_ERROR:
+        feed.failure_streak += 1
+        feed.last_error = (error or "")[:255] or None
+        delay = min(MAX_BACKOFF_MINUTES,
+                    feed.poll_interval_minutes * 2 ** feed.failure_streak)
+        feed.next_fetch_at = now + timedelta(minutes=delay)
+        return
+
+    feed.failure_streak = 0
+    feed.last_error = None
+    feed.avg_new_entries = (
+        EWMA_ALPHA * new_entries + (1 - EWMA_ALPHA) * (feed.avg_new_entries or 0.0)
+    )
+    interval = feed.poll_interval_minutes
+    if status == STATUS_OK and feed.avg_new_entries >= BUSY_ENTRIES:
+        interval = interval / 2
+    elif status == STATUS_NOT_MODIFIED or feed.avg_new_entries < QUIET_ENTRIES:
+        interval = interval * 1.5
+    feed.poll_interval_minutes = _clamp(interval)
+    feed.next_fetch_at = now + timedelta(minutes=feed.poll_interval_minutes)
@@ -0,0 +1,119 @@
+"""
+Lector incremental de RSS/Atom con memoria acotada.
+
+`feedparser.parse` construye el documento y todas las entradas en memoria.
+Para feeds de archivo de varios MB (o GB) este lector usa `iterparse`: emite
+cada entrada normalizada (`FeedEntry`) en cuanto se cierra su elemento, y
+después lo borra del árbol, así que la memoria no crece con el tamaño del feed.
+
+Soporta RSS 2.0 (`<item>`) y Atom (`<entry>`); el texto de title/summary se
+devuelve tal cual (igual que feedparser, puede traer HTML).
+"""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import IO, Iterator, List, Optional, Union
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}encoded"
+_ENTRY_TAGS = {"item", f"{_ATOM}entry", "{http://purl.org/rss/1.0/}item"}
+
+
+@dataclass
+class FeedEntry:
+    id: Optional[str]
+    title: str
+    summary: str
+    link: Optional[str]
+    published: Optional[datetime]
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    return (elem.text or "").strip() if elem is not None else ""
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    """RFC 822 (RSS) o ISO 8601 (Atom) -> datetime UTC naive, como el resto de la BD."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _atom_link(elem: ET.Element) -> Optional[str]:
+    fallback = None
+    for link in elem.findall(f"{_ATOM}link"):
+        rel = link.get("rel", "alternate")
+        if rel == "alternate":
+            return link.get("href")
+        fallback = fallback or link.get("href")
+    return fallback
+
+
+def _entry(elem: ET.Element) -> FeedEntry:
+    if elem.tag == f"{_ATOM}entry":
+        summary = _text(elem.find(f"{_ATOM}summary")) or _text(elem.find(f"{_ATOM}content"))
+        return FeedEntry(
+            id=_text(elem.find(f"{_ATOM}id")) or None,
+            title=_text(elem.find(f"{_ATOM}title")),
+            summary=summary,
+            link=_atom_link(elem),
+            published=_parse_date(
+                _text(elem.find(f"{_ATOM}published")) or _text(elem.find(f"{_ATOM}updated"))
+            ),
+        )
+    children = {_local(child.tag): child for child in elem}
+    summary = _text(children.get("description")) or _text(elem.find(_CONTENT))
+    link = _text(children.get("link")) or None
+    return FeedEntry(
+        id=_text(children.get("guid")) or link,
+        title=_text(children.get("title")),
+        summary=summary,
+        link=link,
+        published=_parse_date(_text(children.get("pubDate")) or _text(children.get("date"))),
+    )
+
+
+def iter_feed_entries(source: Union[str, IO[bytes]]) -> Iterator[FeedEntry]:
+    """
+    Recorre un feed (ruta o fichero binario) entrada a entrada.
+    Cada elemento terminado se elimina de su padre: el árbol nunca guarda más
+    que la entrada en curso.
+    """
+    stack: List[ET.Element] = []
+    depth_in_entry = 0
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag in _ENTRY_TAGS or depth_in_entry:
+                depth_in_entry += 1
+            continue
+
+        stack.pop()
+        if depth_in_entry:
+            depth_in_entry -= 1
+            if depth_in_entry == 0:
+                yield _entry(elem)
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+        elif stack:
+            # Metadatos del canal (title, link...): no se usan, fuera también
+            elem.clear()
+            stack[-1].remove(elem)
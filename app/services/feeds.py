@@ -0,0 +1,198 @@
+"""
+Registro de feeds (tabla `feeds`) y su estado persistido.
+
+Además del CRUD que usa el panel de admin, guarda por URL los validadores HTTP
+de la última descarga (ETag, Last-Modified) para hacer GET condicional, y la
+marca de agua: la entrada más reciente ya procesada. Así una ingesta sobre un
+feed sin cambios no descarga nada (304) y, si cambió, solo se procesan las
+entradas nuevas. La planificación de sondeos está en feed_schedule.py.
+
+Borrar un feed desde el admin lo deja como lápida (`deleted_at`, inactivo):
+deja de verse en el panel, pero `get_or_create_feed` lo encuentra y la
+ingesta no vuelve a registrar la URL aunque siga en FEEDS_BY_TOPIC_SLUG. Dar
+de alta de nuevo esa URL desde el admin sustituye la lápida.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Feed
+from app.services.topic_catalog import get_topic
+
+if TYPE_CHECKING:
+    from app.schemas.feed import FeedCreate, FeedUpdate
+
+
+# ------------------------------
+# Admin CRUD
+# ------------------------------
+def _ensure_topic(db: Session, topic_id: int) -> None:
+    if get_topic(db, topic_id) is None:
+        raise ValueError("Topic not found")
+
+
+def _ensure_url_free(db: Session, url: str, feed_id: Optional[int] = None) -> None:
+    stmt = select(Feed.id).where(Feed.url == url, Feed.deleted_at.is_(None))
+    if feed_id is not None:
+        stmt = stmt.where(Feed.id != feed_id)
+    if db.execute(stmt).scalar_one_or_none() is not None:
+        raise ValueError("Duplicated feed (url)")
+
+
+def _drop_tombstone(db: Session, url: str) -> None:
+    """Remove a deleted feed holding `url` so the URL can be registered again."""
+    tombstone = db.execute(
+        select(Feed).where(Feed.url == url, Feed.deleted_at.is_not(None))
+    ).scalar_one_or_none()
+    if tombstone is not None:
+        db.delete(tombstone)
+        db.flush()
+
+
+def create_feed(db: Session, data: FeedCreate) -> Feed:
+    """Register a feed; raises ValueError on unknown topic or duplicated URL."""
+    _ensure_topic(db, data.topic_id)
+    url = str(data.url)
+    _ensure_url_free(db, url)
+    _drop_tombstone(db, url)
+    feed = Feed(
+        topic_id=data.topic_id,
+        url=url,
+        is_active=data.is_active,
+        poll_interval_minutes=data.poll_interval_minutes,
+        next_fetch_at=datetime.utcnow(),
+    )
+    db.add(feed)
+    db.commit()
+    db.refresh(feed)
+    return feed
+
+
+def get_feed(db: Session, feed_id: int) -> Optional[Feed]:
+    return db.execute(
+        select(Feed).where(Feed.id == feed_id, Feed.deleted_at.is_(None))
+    ).scalar_one_or_none()
+
+
+def list_feeds(
+    db: Session,
+    page: int = 1,
+    size: int = 50,
+    topic_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+) -> Tuple[List[Feed], int]:
+    """Paginated feed list, optionally filtered. Returns (items, total_count)."""
+    stmt = select(Feed).where(Feed.deleted_at.is_(None))
+    count_stmt = select(func.count(Feed.id)).where(Feed.deleted_at.is_(None))
+    if topic_id:
+        stmt = stmt.where(Feed.topic_id == topic_id)
+        count_stmt = count_stmt.where(Feed.topic_id == topic_id)
+    if is_active is not None:
+        stmt = stmt.where(Feed.is_active.is_(is_active))
+        count_stmt = count_stmt.where(Feed.is_active.is_(is_active))
+    total = db.execute(count_stmt).scalar_one()
+    items = db.execute(
+        stmt.order_by(Feed.id).offset((page - 1) * size).limit(size)
+    ).scalars().all()
+    return list(items), total
+
+
+def update_feed(db: Session, feed: Feed, data: FeedUpdate) -> Feed:
+    """Partial update. Changing the URL resets validators and high-water mark."""
+    values = data.model_dump(exclude_unset=True)
+    if values.get("topic_id") is not None:
+        _ensure_topic(db, values["topic_id"])
+        feed.topic_id = values["topic_id"]
+    if values.get("url") is not None and str(values["url"]) != feed.url:
+        url = str(values["url"])
+        _ensure_url_free(db, url, feed.id)
+        _drop_tombstone(db, url)
+        feed.url = url
+        feed.etag = feed.last_modified = feed.last_entry_id = None
+        feed.last_entry_published_at = None
+    if values.get("poll_interval_minutes") is not None:
+        feed.poll_interval_minutes = values["poll_interval_minutes"]
+    if values.get("is_active") is not None:
+        feed.is_active = values["is_active"]
+    if values.get("fetch_now"):
+        feed.next_fetch_at = datetime.utcnow()
+    db.add(feed)
+    db.commit()
+    db.refresh(feed)
+    return feed
+
+
+def delete_feed(db: Session, feed: Feed) -> None:
+    """Soft delete: hide and stop polling the feed, keeping its URL as a tombstone."""
+    feed.is_active = False
+    feed.deleted_at = datetime.utcnow()
+    db.add(feed)
+    db.commit()
+
+
+# ------------------------------
+# Ingestion state
+# ------------------------------
+def get_or_create_feed(db: Session, topic_id: int, url: str) -> Feed:
+    """Estado del feed por URL; lo crea si no existe (una lápida cuenta como existente)."""
+    feed = db.execute(select(Feed).where(Feed.url == url)).scalar_one_or_none()
+    if feed is None:
+        feed = Feed(topic_id=topic_id, url=url, next_fetch_at=datetime.utcnow())
+        db.add(feed)
+        db.flush()
+    return feed
+
+
+def conditional_headers(feed: Optional[Feed]) -> Dict[str, str]:
+    """Cabeceras If-None-Match / If-Modified-Since según la última descarga."""
+    headers: Dict[str, str] = {}
+    if feed is None:
+        return headers
+    if feed.etag:
+        headers["If-None-Match"] = feed.etag
+    if feed.last_modified:
+        headers["If-Modified-Since"] = feed.last_modified
+    return headers
+
+
+def is_past_high_water_mark(
+    feed: Optional[Feed], entry_id: Optional[str], published: Optional[datetime]
+) -> bool:
+    """
+    True si la entrada ya se procesó en una ingesta anterior: es la de la
+    marca o es estrictamente anterior a ella. Con la misma fecha que la marca
+    (habitual en feeds que solo dan el día) no se descarta: si ya estaba, la
+    quita el deduplicado por fingerprint.
+    """
+    if feed is None:
+        return False
+    if entry_id and feed.last_entry_id and entry_id == feed.last_entry_id:
+        return True
+    if published and feed.last_entry_published_at:
+        return published < feed.last_entry_published_at
+    return False
+
+
+def record_fetch(
+    feed: Feed,
+    headers: Dict[str, str],
+    content_bytes: int,
+    newest_entry_id: Optional[str],
+    newest_published: Optional[datetime],
+) -> None:
+    """Actualiza validadores y marca de agua tras una descarga 200."""
+    feed.etag = headers.get("etag")
+    feed.last_modified = headers.get("last-modified")
+    feed.last_content_bytes = content_bytes
+    if newest_entry_id:
+        feed.last_entry_id = newest_entry_id[:1024]
+    if newest_published and (
+        feed.last_entry_published_at is None
+        or newest_published > feed.last_entry_published_at
+    ):
+        feed.last_entry_published_at = newest_published
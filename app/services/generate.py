@@ -2,45 +2,163 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, TYPE_CHECKING
 
-from openai import OpenAI  # pip install openai
+from app.services.circuit_breaker import OPEN, CircuitBreaker
+from app.services.generation_cache import GenerationCache, cache_key, get_cache
+from app.services.summarize import summarize_batch
+
+if TYPE_CHECKING:
+    from openai import OpenAI  # pip install openai
 
 
 # Usa variable de entorno para el modelo
 OPENAI_MODEL = os.getenv("OPENAI_TIPS_MODEL", "gpt-4.1-mini")
+# Peticiones simultáneas en generate_tip_bodies y timeout de cada una
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4"))
+AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", "20"))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "1"))
+# Tiempo total de IA por ejecución de ingesta; agotado, todo va al fallback
+AI_RUN_BUDGET_SECONDS = float(os.getenv("AI_RUN_BUDGET_SECONDS", "900"))
+
+# Circuit breaker del proveedor: llamadas fallidas o lentas abren el circuito
+_breaker = CircuitBreaker(
+    "openai",
+    window=int(os.getenv("AI_BREAKER_WINDOW", "20")),
+    min_calls=int(os.getenv("AI_BREAKER_MIN_CALLS", "5")),
+    failure_ratio=float(os.getenv("AI_BREAKER_FAILURE_RATIO", "0.5")),
+    slow_seconds=float(os.getenv("AI_BREAKER_SLOW_SECONDS", "10")),
+    open_seconds=float(os.getenv("AI_BREAKER_OPEN_SECONDS", "60")),
+)
+
+# Un único cliente para todo el proceso: reutiliza conexiones (keep-alive)
+_client: Optional[OpenAI] = None
+_client_key: Optional[str] = None
+_client_lock = threading.Lock()
+
+
+@dataclass
+class TipRequest:
+    """Entrada de generate_tip_bodies (mismos argumentos que generate_tip_body)."""
+    title: str
+    raw_text: str
+    topic_slug: str
+    max_chars: int = 280
+
+
+@dataclass
+class GenerationRun:
+    """Presupuesto y contadores de IA de una ejecución (ver generation_run)."""
+    budget_seconds: Optional[float] = None
+    started: float = field(default_factory=time.monotonic)
+    requests: int = 0
+    fallbacks: int = 0
+    skipped_open: int = 0
+    skipped_budget: int = 0
+    breaker_opens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def remaining(self) -> Optional[float]:
+        if self.budget_seconds is None:
+            return None
+        return self.budget_seconds - (time.monotonic() - self.started)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+
+_active_run: Optional[GenerationRun] = None
+
+
+def _on_breaker_change(old: str, new: str) -> None:
+    run = _active_run
+    if run is not None and new == OPEN:
+        run.count("breaker_opens")
+
+
+_breaker.listeners.append(_on_breaker_change)
+
+
+def get_breaker() -> CircuitBreaker:
+    return _breaker
+
+
+@contextmanager
+def generation_run(budget_seconds: Optional[float] = None) -> Iterator[GenerationRun]:
+    """
+    Activa un presupuesto de tiempo total para las generaciones hechas dentro
+    del bloque (p. ej. una ejecución de ingesta) y cuenta peticiones,
+    fallbacks y aperturas del circuito.
+    """
+    global _active_run
+    run = GenerationRun(budget_seconds)
+    previous, _active_run = _active_run, run
+    try:
+        yield run
+    finally:
+        _active_run = previous
 
 
 def _get_client() -> Optional[OpenAI]:
     """
-    Devuelve un cliente de OpenAI si hay API key,
+    Devuelve el cliente de OpenAI compartido si hay API key,
     o None si no está configurada (para hacer fallback).
+    Se crea una vez y se reutiliza; si cambia la key se crea otro.
     """
+    global _client, _client_key
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return None
-    return OpenAI(api_key=api_key)
+    with _client_lock:
+        if _client is None or _client_key != api_key:
+            # Import diferido: sin API key no se paga el coste de cargar el SDK.
+            from openai import OpenAI
 
+            _client = OpenAI(
+                api_key=api_key,
+                # Endpoint compatible (p. ej. un proxy o un servidor local)
+                base_url=os.getenv("OPENAI_BASE_URL") or None,
+                timeout=AI_TIMEOUT_SECONDS,
+                max_retries=AI_MAX_RETRIES,
+            )
+            _client_key = api_key
+        return _client
 
-def generate_tip_body(
-    title: str,
-    raw_text: str,
-    topic_slug: str,
-    max_chars: int = 280,
-) -> str:
-    """
-    Dado un título, un resumen/artículo y el topic, genera
-    un tip corto, claro y accionable.
 
-    Si no hay API key configurada, devuelve el raw_text recortado.
+def reset_client() -> None:
+    """Descarta el cliente compartido (tras cambiar la configuración)."""
+    global _client, _client_key
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = _client_key = None
+
+
+def _fallbacks(items: Sequence[TipRequest]) -> List[str]:
     """
-    client = _get_client()
-    if client is None:
-        # Fallback: sin IA, solo saneamos y recortamos
-        text = (raw_text or title or "").strip().replace("\n", " ")
-        return text[:max_chars]
+    Fallback sin IA: resumen extractivo local (summarize.py) en lote, que
+    elige frases completas en vez de cortar el texto a `max_chars`.
+    """
+    out: List[str] = [""] * len(items)
+    by_limit: Dict[int, List[int]] = {}
+    for idx, item in enumerate(items):
+        by_limit.setdefault(item.max_chars, []).append(idx)
+    for max_chars, idxs in by_limit.items():
+        summaries = summarize_batch(
+            [items[i].raw_text for i in idxs], max_chars, [items[i].title for i in idxs])
+        for i, summary in zip(idxs, summaries):
+            out[i] = summary
+    return out
+
 
-    prompt = f"""
+def _prompt(title: str, raw_text: str, topic_slug: str, max_chars: int) -> str:
+    return f"""
 You are an assistant that writes short, practical daily tips for a mobile app.
 
 Topic: {topic_slug}
@@ -55,16 +173,28 @@ Write ONE short actionable tip in Spanish, in 1-2 sentences, no more than {max_c
 - Do NOT mention that this comes from an article or RSS or AI.
 - Do NOT use emojis.
 """
+
+
+def _generate(
+    client: OpenAI,
+    title: str,
+    raw_text: str,
+    topic_slug: str,
+    max_chars: int,
+    timeout: Optional[float] = None,
+) -> Optional[str]:
+    """Una petición al modelo. None si falla (quien llama hace el fallback)."""
     try:
         response = client.chat.completions.create(
             model=OPENAI_MODEL,
             messages=[
                 {"role": "system",
                     "content": "You write concise, actionable daily tips in Spanish."},
-                {"role": "user", "content": prompt},
+                {"role": "user", "content": _prompt(title, raw_text or "", topic_slug, max_chars)},
             ],
             temperature=0.5,
             max_tokens=200,
+            timeout=AI_TIMEOUT_SECONDS if timeout is None else timeout,
         )
         text = response.choices[0].message.content.strip()
         # Por si acaso se pasa, recortamos
@@ -72,5 +202,96 @@ Write ONE short actionable tip in Spanish, in 1-2 sentences, no more than {max_c
     except Exception as e:
         # En caso de error, hacemos fallback silencioso
         print(f"[AI] Error generating tip: {e}")
-        text = (raw_text or title or "").strip().replace("\n", " ")
-        return text[:max_chars]
+        return None
+
+
+def _guarded_generate(client: OpenAI, item: TipRequest, timeout: Optional[float]) -> Optional[str]:
+    """
+    _generate detrás del presupuesto de la ejecución y del circuit breaker:
+    sin presupuesto o con el circuito abierto no se llama al modelo (None).
+    """
+    run = _active_run
+    remaining = run.remaining() if run is not None else None
+    if remaining is not None and remaining <= 0:
+        run.count("skipped_budget")
+        return None
+    if not _breaker.allow():
+        if run is not None:
+            run.count("skipped_open")
+        return None
+
+    timeout = AI_TIMEOUT_SECONDS if timeout is None else timeout
+    if remaining is not None:
+        timeout = min(timeout, remaining)
+    started = time.monotonic()
+    text = _generate(client, item.title, item.raw_text, item.topic_slug, item.max_chars, timeout)
+    _breaker.record(text is not None, time.monotonic() - started)
+    if run is not None:
+        run.count("requests")
+    return text
+
+
+def _key(item: TipRequest) -> str:
+    return cache_key(item.title, item.raw_text, item.topic_slug, item.max_chars, OPENAI_MODEL)
+
+
+def generate_tip_body(
+    title: str,
+    raw_text: str,
+    topic_slug: str,
+    max_chars: int = 280,
+    cache: Optional[GenerationCache] = None,
+) -> str:
+    """
+    Dado un título, un resumen/artículo y el topic, genera
+    un tip corto, claro y accionable.
+
+    Si no hay API key configurada, devuelve un resumen extractivo local.
+    Las respuestas del modelo se guardan en la caché persistente
+    (generation_cache): las mismas entradas no vuelven a llamar al modelo.
+    """
+    return generate_tip_bodies(
+        [TipRequest(title, raw_text, topic_slug, max_chars)], cache=cache)[0]
+
+
+def generate_tip_bodies(
+    items: Sequence[TipRequest],
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    cache: Optional[GenerationCache] = None,
+) -> List[str]:
+    """
+    Versión por lotes de generate_tip_body: mismo cliente para todas las
+    peticiones, como mucho `max_concurrency` (AI_MAX_CONCURRENCY) a la vez y
+    `timeout` por petición. Devuelve los cuerpos en el orden de `items`; si
+    una petición falla, ese elemento usa el fallback y el resto sigue.
+    Los aciertos de caché (una consulta para todo el lote) y los elementos
+    repetidos dentro del lote no generan peticiones. Con el circuito abierto
+    o el presupuesto de la ejecución agotado se usa el fallback sin esperar.
+    """
+    if not items:
+        return []
+    client = _get_client()
+    if client is None:
+        return _fallbacks(items)
+
+    cache = cache if cache is not None else get_cache()
+    keys = [_key(i) for i in items]
+    bodies: Dict[str, Optional[str]] = dict(cache.get_many(keys)) if cache is not None else {}
+    pending = {k: i for k, i in zip(keys, items) if k not in bodies}
+
+    if pending:
+        workers = max(1, min(max_concurrency or AI_MAX_CONCURRENCY, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            generated = dict(zip(pending, pool.map(
+                lambda i: _guarded_generate(client, i, timeout), pending.values())))
+        if cache is not None:
+            cache.put_many({k: text for k, text in generated.items() if text is not None})
+        bodies.update(generated)
+        if _active_run is not None:
+            _active_run.count("fallbacks", sum(
+                bodies.get(k) is None for k in keys))
+
+    missing = [idx for idx, k in enumerate(keys) if bodies.get(k) is None]
+    fallbacks = dict(zip(missing, _fallbacks([items[idx] for idx in missing])))
+    return [bodies[k] if idx not in fallbacks else fallbacks[idx] for idx, k in enumerate(keys)]
@@ -0,0 +1,179 @@
+"""
+Caché persistente de cuerpos generados con IA.
+
+Reingestar un feed, o la misma noticia sindicada en dos feeds, volvía a
+llamar al modelo con las mismas entradas. Aquí se guarda cada respuesta con
+la clave sha256 de las entradas normalizadas (título, raw_text[:1500], topic,
+max_chars y modelo) en un fichero SQLite local (AI_CACHE_PATH):
+
+- Un acierto es una consulta por clave primaria (microsegundos); un lote
+  entero se resuelve con una sola consulta IN.
+- Tamaño acotado (AI_CACHE_MAX_BYTES, suma de los cuerpos): al pasarse se
+  desalojan las entradas usadas hace más tiempo. El "último uso" de los
+  aciertos se anota en memoria y se escribe junto con la siguiente inserción,
+  para que leer no cueste un commit.
+- Solo se guardan respuestas del modelo, nunca el fallback.
+- `stats()` da aciertos/fallos de este proceso y entradas/bytes del fichero.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+ENABLED = os.getenv("AI_CACHE", "1") == "1"
+CACHE_PATH = os.getenv("AI_CACHE_PATH", ".cache/ai_bodies.sqlite3")
+MAX_BYTES = int(os.getenv("AI_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Mismo recorte que el prompt de generate.py
+RAW_TEXT_CHARS = 1500
+# Al desalojar se baja hasta este porcentaje del máximo (histéresis)
+EVICT_TO = 0.9
+_QUERY_CHUNK = 500
+
+
+def _normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(title: str, raw_text: str, topic_slug: str, max_chars: int, model: str) -> str:
+    """sha256 de las entradas normalizadas que determinan la respuesta del modelo."""
+    payload = json.dumps(
+        [_normalize(title), _normalize((raw_text or "")[:RAW_TEXT_CHARS]),
+         topic_slug, max_chars, model],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """Caché clave -> cuerpo sobre SQLite. Una conexión compartida entre hilos."""
+
+    def __init__(self, path: Union[str, Path], max_bytes: Optional[int] = None) -> None:
+        self.path = Path(path)
+        self.max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._touched: Set[str] = set()
+        self._lock = threading.Lock()
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bodies ("
+            " key TEXT PRIMARY KEY, body TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_bodies_last_used ON bodies (last_used)")
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        wanted = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(wanted), _QUERY_CHUNK):
+                chunk = wanted[start:start + _QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                found.update(self._conn.execute(
+                    f"SELECT key, body FROM bodies WHERE key IN ({marks})", chunk))
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+            self._touched.update(found)
+        return found
+
+    def put(self, key: str, body: str) -> None:
+        self.put_many({key: body})
+
+    def put_many(self, bodies: Dict[str, str]) -> None:
+        if not bodies:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                self._flush_touched(now)
+                for key, body in bodies.items():
+                    size = len(body.encode("utf-8"))
+                    old = conn.execute("SELECT size FROM bodies WHERE key = ?", (key,)).fetchone()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO bodies (key, body, size, last_used) VALUES (?, ?, ?, ?)",
+                        (key, body, size, now),
+                    )
+                    self._bytes += size - (old[0] if old else 0)
+                if self._bytes > self.max_bytes:
+                    self._evict()
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+                raise
+
+    def _flush_touched(self, now: float) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE bodies SET last_used = ? WHERE key = ?",
+                [(now, key) for key in self._touched])
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Borra las entradas menos usadas hasta bajar de EVICT_TO * max_bytes."""
+        target = self.max_bytes * EVICT_TO
+        victims = []
+        freed = 0
+        for key, size in self._conn.execute("SELECT key, size FROM bodies ORDER BY last_used, key"):
+            if self._bytes - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM bodies WHERE key = ?", victims)
+        self._bytes -= freed
+        self.evictions += len(victims)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._touched:
+                self._conn.execute("BEGIN")
+                self._flush_touched(time.time())
+                self._conn.execute("COMMIT")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM bodies").fetchone()[0]
+            return {
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": entries, "bytes": self._bytes,
+            }
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+_default: Optional[GenerationCache] = None
+_default_lock = threading.Lock()
+
+
+def get_cache() -> Optional[GenerationCache]:
+    """Caché del proceso en AI_CACHE_PATH (None si AI_CACHE=0)."""
+    global _default
+    if not ENABLED:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = GenerationCache(CACHE_PATH)
+        return _default
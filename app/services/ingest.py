@@ -1,16 +1,57 @@
 # app/services/ingest.py
 from __future__ import annotations
 
-from typing import Dict, List
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-import feedparser
 
-from app.db.models import Topic, Tip
-from app.services.tips import make_fingerprint
+from app.db.models import Feed, IngestRun, Topic
+from app.services import article_text
+from app.services.feed_fetch import FetchResult, fetch_feeds
+from app.services.feed_schedule import (
+    STATUS_ERROR,
+    STATUS_NOT_MODIFIED,
+    STATUS_OK,
+    due_feeds,
+    record_poll,
+)
+from app.services.feed_stream import iter_feed_entries
+from app.services.feeds import (
+    conditional_headers,
+    get_or_create_feed,
+    is_past_high_water_mark,
+    record_fetch,
+)
+from app.services.generate import (
+    AI_RUN_BUDGET_SECONDS,
+    GenerationRun,
+    TipRequest,
+    generate_tip_bodies,
+    generation_run,
+)
+from app.services.generation_cache import get_cache
+from app.services.ingest_telemetry import (
+    RUN_ERROR,
+    FetchTelemetry,
+    add_fetch,
+    finish_run,
+    start_run,
+)
+from app.services.quality import score_tips, status_for_score
+from app.services.tips import (
+    BULK_CHUNK_SIZE,
+    bulk_insert_tips,
+    existing_fingerprints,
+    make_fingerprint,
+)
+from app.services.topic_catalog import TopicEntry, get_topic, get_topic_by_slug
 
 
-# Mapea el slug del topic a una lista de feeds RSS
+# Feeds iniciales por slug de topic. Se registran en la tabla `feeds` en cada
+# ejecución (si no existen); el resto se gestiona desde /admin/feeds.
 #  Cambia estas URLs por las que te interesen de verdad
 FEEDS_BY_TOPIC_SLUG: Dict[str, List[str]] = {
     "nutricion": [
@@ -26,88 +67,407 @@ FEEDS_BY_TOPIC_SLUG: Dict[str, List[str]] = {
     # añade más mapeos según tus topics de demo
 }
 
+# Reescritura de los cuerpos con IA (paso 3 de docs/07): opcional, cuesta
+# una llamada al modelo por tip nuevo.
+AI_REWRITE = os.getenv("INGEST_AI_REWRITE", "0") == "1"
 
-def _find_topic_by_slug(db: Session, slug: str) -> Topic | None:
-    return db.execute(
-        select(Topic).where(Topic.slug == slug)
-    ).scalar_one_or_none()
 
+@dataclass
+class IngestStats:
+    """Contadores de una ejecución, para la línea de resumen."""
+    feeds: int = 0
+    not_modified: int = 0
+    bytes_downloaded: int = 0
+    bytes_skipped: int = 0
+    entries_seen: int = 0
+    entries_skipped: int = 0
+    near_duplicates: int = 0
+    drafts: int = 0
+    html_paragraphs: int = 0
+    ai_rewrites: int = 0
+    ai_fallbacks: int = 0
+    new_tips: int = 0
 
-def ingest_feed_for_topic(db: Session, topic: Topic, feed_url: str) -> int:
+    def summary(self) -> str:
+        return (
+            f"[INGEST] Stats: feeds={self.feeds} sin_cambios(304)={self.not_modified} "
+            f"bytes_descargados={self.bytes_downloaded} bytes_evitados={self.bytes_skipped} "
+            f"entradas={self.entries_seen} entradas_saltadas={self.entries_skipped} "
+            f"casi_duplicados={self.near_duplicates} candidatos_draft={self.drafts} "
+            f"parrafos_html={self.html_paragraphs} reescritos_ia={self.ai_rewrites} "
+            f"fallback_ia={self.ai_fallbacks} "
+            f"tips_nuevos={self.new_tips}"
+        )
+
+
+def _find_topic_by_slug(db: Session, slug: str) -> TopicEntry | None:
+    return get_topic_by_slug(db, slug)
+
+
+def _entry_id(entry) -> Optional[str]:
+    return entry.get("id") or entry.get("link") or entry.get("title") or None
+
+
+def _entry_published(entry) -> Optional[datetime]:
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if not parsed:
+        return None
+    return datetime(*parsed[:6])
+
+
+def _tip_body(title: str, summary: Optional[str]) -> str:
+    # Cuerpo: cogemos summary/description; si no hay, usamos el título
+    summary = (summary or "").strip()
+    if not summary:
+        body = title
+    else:
+        # recortamos un poco para no romper el esquema (tú tienes 500 chars, si no recuerdo mal)
+        body = summary.replace("\n", " ").strip()
+    return body[:500]
+
+
+def tip_row(
+    topic_id: int, title: Optional[str], summary: Optional[str], link: Optional[str]
+) -> Optional[dict]:
+    """Normaliza una entrada de feed a la fila de `tips` (None si no tiene título)."""
+    # Título del tip (limitamos longitud por si acaso)
+    title = (title or "").strip()
+    if not title:
+        return None
+    title = title[:255]
+    body = _tip_body(title, summary)
+
+    return {
+        "topic_id": topic_id,
+        "title": title,
+        "body": body,
+        # URL original del artículo
+        "source_url": link,
+        # Fingerprint para deduplicar
+        "fingerprint": make_fingerprint(topic_id, title, body),
+    }
+
+
+def score_rows(rows: List[dict]) -> int:
+    """Puntúa el lote y fija status (draft bajo el umbral). Devuelve cuántos quedan en draft."""
+    scores = score_tips([r["title"] for r in rows], [r["body"] for r in rows])
+    drafts = 0
+    for row, score in zip(rows, scores):
+        row["quality_score"] = score
+        row["status"] = status_for_score(score)
+        drafts += row["status"] == "draft"
+    return drafts
+
+
+def fill_missing_summaries(db: Session, rows: List[dict], pending: Dict[int, str]) -> int:
+    """
+    Fallback de resumen: para las filas sin summary (índice -> link) se
+    descarga el artículo y el primer párrafo pasa a ser el cuerpo. El
+    fingerprint se queda el de la entrada del feed, como en rewrite_rows: el
+    deduplicado no depende de lo que devuelva la web del artículo, y por eso
+    las filas ya en BD se descartan antes de descargar nada (una entrada sin
+    summary que el feed repite no vuelve a pedir su artículo en cada sondeo).
+    Devuelve cuántas filas se han completado.
+    """
+    if not pending:
+        return 0
+    known = existing_fingerprints(db, (rows[index]["fingerprint"] for index in pending))
+    pending = {index: link for index, link in pending.items()
+               if rows[index]["fingerprint"] not in known}
+    if not pending:
+        return 0
+    paragraphs = article_text.fetch_first_paragraphs(
+        list(pending.values()), cache=article_text.default_cache())
+    filled = 0
+    for index, link in pending.items():
+        paragraph = paragraphs.get(link)
+        if paragraph:
+            rows[index]["body"] = _tip_body(rows[index]["title"], paragraph)
+            filled += 1
+    return filled
+
+
+def rewrite_rows(db: Session, topic_slug: str, rows: List[dict]) -> int:
+    """
+    Reescribe con IA el cuerpo de las filas que aún no están en BD (las
+    peticiones van en paralelo, ver generate_tip_bodies). El fingerprint se
+    queda el del texto original: así el deduplicado no depende del modelo.
+    Devuelve cuántas filas se han reescrito.
+    """
+    known = existing_fingerprints(db, (r["fingerprint"] for r in rows))
+    pending = [r for r in rows if r["fingerprint"] not in known]
+    bodies = generate_tip_bodies(
+        [TipRequest(r["title"], r["body"], topic_slug) for r in pending])
+    for row, body in zip(pending, bodies):
+        row["body"] = body or row["body"]
+    return len(pending)
+
+
+def ingest_feed_for_topic(db: Session, topic: Topic | TopicEntry, feed_url: str) -> int:
     """
     Lee un feed RSS y crea Tips nuevos para un Topic.
     Devuelve cuántos tips se han creado.
     """
-    print(f"[INGEST] Topic={topic.slug} URL={feed_url}")
-    feed = feedparser.parse(feed_url)
+    feed_state = get_or_create_feed(db, topic.id, feed_url)
+    result = fetch_feeds(
+        [feed_url], headers_by_url={feed_url: conditional_headers(feed_state)}
+    )[0]
+    stats = IngestStats()
+    new_count = ingest_fetch_result(db, topic, result, feed_state, stats)
+    record_poll(feed_state, _poll_status(result), new_count, result.error)
+    db.commit()
+    print(stats.summary())
+    return new_count
+
+
+def _newest_entry(
+    entries: List[Tuple[Optional[str], Optional[datetime]]]
+) -> Tuple[Optional[str], Optional[datetime]]:
+    """
+    Marca de agua del feed: la entrada con la fecha más reciente (sea cual sea
+    el orden del feed). Sin fechas, la primera (convención más nuevo primero).
+    """
+    newest_id: Optional[str] = entries[0][0] if entries else None
+    newest_published: Optional[datetime] = None
+    for entry_id, published in entries:
+        if published and (newest_published is None or published > newest_published):
+            newest_id, newest_published = entry_id, published
+    return newest_id, newest_published
+
 
-    new_count = 0
+def _is_newest_first(entries: List[Tuple[Optional[str], Optional[datetime]]]) -> bool:
+    """True si todas las entradas tienen fecha y van de más nueva a más antigua."""
+    dates = [published for _, published in entries]
+    if not dates or any(d is None for d in dates):
+        return False
+    return all(a >= b for a, b in zip(dates, dates[1:]))
 
-    for entry in feed.entries:
-        # Título del tip (limitamos longitud por si acaso)
-        title = (entry.get("title") or "").strip()
-        if not title:
+
+def ingest_fetch_result(
+    db: Session,
+    topic: Topic | TopicEntry,
+    result: FetchResult,
+    feed_state: Optional[Feed] = None,
+    stats: Optional[IngestStats] = None,
+    telemetry: Optional[FetchTelemetry] = None,
+) -> int:
+    """
+    Etapa de parseo + escritura: procesa un feed ya descargado.
+    Con `feed_state` se respeta la marca de agua (solo entradas nuevas) y se
+    guardan ETag/Last-Modified para el siguiente GET condicional.
+    Si se pasa `telemetry`, se rellenan sus contadores y tiempos.
+    Devuelve cuántos tips se han creado.
+    """
+    stats = stats or IngestStats()
+    telemetry = telemetry or FetchTelemetry()
+    stats.feeds += 1
+
+    print(f"[INGEST] Topic={topic.slug} URL={result.url}")
+    if result.not_modified:
+        stats.not_modified += 1
+        if feed_state is not None:
+            stats.bytes_skipped += feed_state.last_content_bytes
+        print("[INGEST]   Sin cambios (304)")
+        return 0
+    if not result.ok:
+        print(
+            f"[INGEST]   Error descargando feed ({result.attempts} intento(s)): {result.error}")
+        return 0
+
+    # Import diferido: feedparser solo se carga cuando de verdad se ingesta.
+    import feedparser
+
+    stats.bytes_downloaded += len(result.content)
+    parse_started = time.perf_counter()
+    feed = feedparser.parse(result.content, response_headers=result.headers)
+
+    rows: List[dict] = []
+    missing_summary: Dict[int, str] = {}
+    entries = [(_entry_id(entry), _entry_published(entry)) for entry in feed.entries]
+    newest_id, newest_published = _newest_entry(entries)
+    newest_first = _is_newest_first(entries)
+
+    for index, entry in enumerate(feed.entries):
+        stats.entries_seen += 1
+        entry_id, published = entries[index]
+
+        if feed_state is not None and entry_id and entry_id == feed_state.last_entry_id:
+            if newest_first:
+                # Orden de más nuevo a más antiguo confirmado: lo que queda ya se vio.
+                stats.entries_skipped += len(feed.entries) - index
+                break
+            stats.entries_skipped += 1
+            continue
+        if is_past_high_water_mark(feed_state, entry_id, published):
+            stats.entries_skipped += 1
             continue
-        title = title[:255]
-
-        # Cuerpo: cogemos summary/description; si no hay, usamos el título
-        summary = (
-            entry.get("summary")
-            or entry.get("description")
-            or ""
-        ).strip()
-
-        if not summary:
-            body = title
-        else:
-            # recortamos un poco para no romper el esquema (tú tienes 500 chars, si no recuerdo mal)
-            body = summary.replace("\n", " ").strip()
-        body = body[:500]
 
-        # URL original del artículo
-        source_url = entry.get("link")
+        summary = entry.get("summary") or entry.get("description")
+        row = tip_row(topic.id, entry.get("title"), summary, entry.get("link"))
+        if row is not None:
+            if article_text.ENABLED and not (summary or "").strip() and entry.get("link"):
+                missing_summary[len(rows)] = entry.get("link")
+            rows.append(row)
+    telemetry.parse_seconds = time.perf_counter() - parse_started
 
-        # Fingerprint para deduplicar
-        fp = make_fingerprint(topic.id, title, body)
-
-        existing = db.execute(
-            select(Tip.id).where(Tip.fingerprint == fp)
-        ).scalar_one_or_none()
-        if existing:
-            continue  # ya tenemos este tip
-
-        tip = Tip(
-            topic_id=topic.id,
-            title=title,
-            body=body,
-            source_url=source_url,
-            fingerprint=fp,
-        )
-        db.add(tip)
+    # Sin summary: primer párrafo del artículo (descarga acotada y cacheada)
+    article_started = time.perf_counter()
+    stats.html_paragraphs += fill_missing_summaries(db, rows, missing_summary)
+    telemetry.article_seconds = time.perf_counter() - article_started
+    if AI_REWRITE and rows:
+        ai_started = time.perf_counter()
+        stats.ai_rewrites += rewrite_rows(db, topic.slug, rows)
+        telemetry.ai_seconds = time.perf_counter() - ai_started
+
+    # Puntuación de calidad del lote: por debajo del umbral queda en draft.
+    # Es CPU local, como el parseo: cuenta en esa etapa.
+    score_started = time.perf_counter()
+    stats.drafts += score_rows(rows)
+    db_started = time.perf_counter()
+    telemetry.parse_seconds += db_started - score_started
+
+    # Deduplicado (exacto y casi duplicados) e inserción por lotes
+    inserted = bulk_insert_tips(db, rows)
+    new_count = inserted.inserted
+
+    if feed_state is not None:
+        record_fetch(feed_state, result.headers, len(result.content),
+                     newest_id, newest_published)
         db.commit()
-        db.refresh(tip)
-        new_count += 1
-        print(f"[INGEST]   + Tip creado: {tip.title}")
+    telemetry.db_seconds = time.perf_counter() - db_started
 
-    print(f"[INGEST]   Nuevos tips para {topic.slug}: {new_count}")
+    telemetry.entries_seen = len(feed.entries)
+    telemetry.duplicates = inserted.duplicates + inserted.near_duplicates
+    telemetry.new_tips = new_count
+    stats.new_tips += new_count
+    stats.near_duplicates += inserted.near_duplicates
+    print(f"[INGEST]   Nuevos tips para {topic.slug}: {new_count} "
+          f"(candidatos={len(rows)}, duplicados={inserted.duplicates}, "
+          f"casi_duplicados={inserted.near_duplicates}, marcados={inserted.flagged})")
     return new_count
 
 
-def ingest_all_configured_feeds(db: Session) -> int:
+def ingest_feed_file(
+    db: Session,
+    topic: Topic | TopicEntry,
+    source: Union[str, IO[bytes]],
+    stats: Optional[IngestStats] = None,
+    batch_size: Optional[int] = None,
+) -> int:
     """
-    Recorre FEEDS_BY_TOPIC_SLUG y ejecuta ingest_feed_for_topic para cada feed.
-    Devuelve el total de tips nuevos creados.
+    Ingesta un feed local (ruta o fichero binario) con el lector incremental:
+    las entradas pasan en lotes a puntuación + deduplicado + inserción sin
+    cargar el documento entero. Para volcados de archivo muy grandes.
+    Devuelve cuántos tips se han creado.
     """
-    total_new = 0
+    stats = stats or IngestStats()
+    stats.feeds += 1
+    batch_size = batch_size or BULK_CHUNK_SIZE
+    print(f"[INGEST] Topic={topic.slug} fichero={getattr(source, 'name', source)}")
+
+    def scored_rows() -> Iterator[dict]:
+        batch: List[dict] = []
+        for entry in iter_feed_entries(source):
+            stats.entries_seen += 1
+            row = tip_row(topic.id, entry.title, entry.summary, entry.link)
+            if row is None:
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                stats.drafts += score_rows(batch)
+                yield from batch
+                batch = []
+        stats.drafts += score_rows(batch)
+        yield from batch
+
+    inserted = bulk_insert_tips(db, scored_rows(), chunk_size=batch_size)
+    stats.new_tips += inserted.inserted
+    stats.near_duplicates += inserted.near_duplicates
+    print(f"[INGEST]   Nuevos tips para {topic.slug}: {inserted.inserted} "
+          f"(duplicados={inserted.duplicates}, casi_duplicados={inserted.near_duplicates})")
+    return inserted.inserted
+
 
+def sync_configured_feeds(db: Session) -> None:
+    """
+    Registra en `feeds` las URLs de FEEDS_BY_TOPIC_SLUG que aún no estén. Las
+    borradas desde el admin siguen como lápida y no se recrean.
+    """
     for slug, urls in FEEDS_BY_TOPIC_SLUG.items():
         topic = _find_topic_by_slug(db, slug)
         if not topic:
             print(f"[INGEST] Topic con slug='{slug}' no encontrado. Saltando.")
             continue
-
         for url in urls:
-            total_new += ingest_feed_for_topic(db, topic, url)
+            get_or_create_feed(db, topic.id, url)
+    db.commit()
+
+
+def _poll_status(result: FetchResult) -> str:
+    if result.not_modified:
+        return STATUS_NOT_MODIFIED
+    return STATUS_OK if result.ok else STATUS_ERROR
 
+
+def ingest_all_configured_feeds(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Registra los feeds configurados y procesa los que estén vencidos según su
+    planificación (feed_schedule): descarga concurrente con GET condicional y
+    después parseo + BD uno a uno. Cada feed sondeado reprograma su siguiente
+    descarga. Cada ejecución y cada feed quedan registrados en la telemetría
+    (ingest_telemetry). Devuelve el total de tips nuevos creados.
+    """
+    sync_configured_feeds(db)
+    run = start_run(db)
+    # Presupuesto total de IA para la ejecución (más el circuit breaker)
+    with generation_run(AI_RUN_BUDGET_SECONDS) as ai_run:
+        try:
+            total_new, feeds = _ingest_due_feeds(db, run, now, ai_run)
+        except Exception:
+            db.rollback()
+            finish_run(db, run, feeds=0, new_tips=0, status=RUN_ERROR, ai_run=ai_run)
+            raise
+    finish_run(db, run, feeds=feeds, new_tips=total_new, ai_run=ai_run)
     print(f"[INGEST] TOTAL tips nuevos: {total_new}")
     return total_new
+
+
+def _ingest_due_feeds(
+    db: Session, run: IngestRun, now: Optional[datetime], ai_run: GenerationRun
+) -> Tuple[int, int]:
+    """Descarga y procesa los feeds vencidos. Devuelve (tips nuevos, feeds)."""
+    jobs: List[Tuple[TopicEntry, Feed]] = []
+    for feed_state in due_feeds(db, now):
+        topic = get_topic(db, feed_state.topic_id)
+        if not topic:
+            continue
+        jobs.append((topic, feed_state))
+    print(f"[INGEST] Feeds vencidos: {len(jobs)}")
+
+    # 1) Red: todas las descargas en paralelo (límite global y por host)
+    results = fetch_feeds(
+        [feed.url for _, feed in jobs],
+        headers_by_url={feed.url: conditional_headers(feed) for _, feed in jobs},
+    )
+
+    # 2) Parseo y escritura en BD, en serie sobre la misma sesión
+    stats = IngestStats()
+    total_new = 0
+    for (topic, feed_state), result in zip(jobs, results):
+        telemetry = FetchTelemetry()
+        new_count = ingest_fetch_result(db, topic, result, feed_state, stats, telemetry)
+        record_poll(feed_state, _poll_status(result), new_count, result.error, now)
+        add_fetch(db, run, feed_state, result, telemetry)
+        db.commit()
+        total_new += new_count
+
+    stats.ai_fallbacks = ai_run.fallbacks
+    print(stats.summary())
+    if AI_REWRITE:
+        print(f"[AI] Peticiones={ai_run.requests} fallback={ai_run.fallbacks} "
+              f"circuito_abierto={ai_run.skipped_open} sin_presupuesto={ai_run.skipped_budget} "
+              f"aperturas_circuito={ai_run.breaker_opens}")
+        cache = get_cache()
+        if cache is not None:
+            print(f"[AI] Caché de cuerpos: {cache.stats()}")
+    return total_new, len(jobs)
@@ -0,0 +1,169 @@
+"""
+Telemetría persistida de la ingesta (tablas `ingest_runs` e `ingest_fetches`).
+
+Cada ejecución de `ingest_all_configured_feeds` abre una fila en `ingest_runs`
+y añade una fila por feed procesado con el estado HTTP, bytes, entradas,
+duplicados, tips nuevos y el tiempo de cada etapa en milisegundos: descarga
+del feed, parseo (feedparser, normalización y puntuación), descarga de
+artículos para las entradas sin resumen, reescritura con IA y BD. Las filas de feed se escriben en el mismo commit que el
+reprogramado del feed, así que no añaden viajes a la BD.
+
+Los agregados del panel (/admin/ingest/runs) se calculan en Python sobre las
+últimas ejecuciones: SQLite no tiene percentiles y el volumen es pequeño
+(una fila por feed vencido y ejecución).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import Feed, IngestFetch, IngestRun
+from app.services.feed_fetch import FetchResult
+from app.services.generate import GenerationRun
+
+RUN_RUNNING = "running"
+RUN_OK = "ok"
+RUN_ERROR = "error"
+
+
+@dataclass
+class FetchTelemetry:
+    """Lo que `ingest_fetch_result` mide de un feed (además de FetchResult)."""
+    entries_seen: int = 0
+    duplicates: int = 0
+    new_tips: int = 0
+    parse_seconds: float = 0.0
+    article_seconds: float = 0.0
+    ai_seconds: float = 0.0
+    db_seconds: float = 0.0
+
+
+def _ms(seconds: float) -> int:
+    return int(round(seconds * 1000))
+
+
+def start_run(db: Session) -> IngestRun:
+    run = IngestRun(started_at=datetime.utcnow(), status=RUN_RUNNING)
+    db.add(run)
+    db.commit()
+    return run
+
+
+def add_fetch(
+    db: Session,
+    run: IngestRun,
+    feed: Optional[Feed],
+    result: FetchResult,
+    telemetry: FetchTelemetry,
+) -> None:
+    """Añade la fila del feed a la sesión; el commit lo hace quien llama."""
+    db.add(IngestFetch(
+        run_id=run.id,
+        feed_id=feed.id if feed is not None else None,
+        http_status=result.status,
+        error=(result.error or "")[:255] or None,
+        bytes=len(result.content or b""),
+        entries_seen=telemetry.entries_seen,
+        duplicates=telemetry.duplicates,
+        new_tips=telemetry.new_tips,
+        fetch_ms=_ms(result.elapsed),
+        parse_ms=_ms(telemetry.parse_seconds),
+        article_ms=_ms(telemetry.article_seconds),
+        ai_ms=_ms(telemetry.ai_seconds),
+        db_ms=_ms(telemetry.db_seconds),
+    ))
+
+
+def finish_run(
+    db: Session,
+    run: IngestRun,
+    feeds: int,
+    new_tips: int,
+    status: str = RUN_OK,
+    ai_run: Optional[GenerationRun] = None,
+) -> None:
+    run.finished_at = datetime.utcnow()
+    run.status = status
+    run.feeds = feeds
+    run.new_tips = new_tips
+    if ai_run is not None:
+        run.ai_requests = ai_run.requests
+        run.ai_fallbacks = ai_run.fallbacks
+        run.breaker_opens = ai_run.breaker_opens
+    db.commit()
+
+
+# ------------------------------
+# Aggregates for the admin panel
+# ------------------------------
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Percentil por rango más cercano (0 si no hay valores)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return float(ordered[rank - 1])
+
+
+def recent_runs(db: Session, limit: int = 20) -> List[IngestRun]:
+    return list(db.execute(
+        select(IngestRun).order_by(IngestRun.started_at.desc(), IngestRun.id.desc()).limit(limit)
+    ).scalars())
+
+
+def feed_timings(db: Session, run_ids: Sequence[int]) -> List[dict]:
+    """
+    Por feed, sobre las ejecuciones indicadas: número de descargas, p50/p95 del
+    tiempo de descarga y p95 del tiempo total (todas las etapas).
+    Ordenado del más lento al más rápido (p95 total).
+    """
+    if not run_ids:
+        return []
+    rows = db.execute(
+        select(IngestFetch.feed_id, Feed.url, IngestFetch.fetch_ms,
+               IngestFetch.parse_ms, IngestFetch.article_ms, IngestFetch.ai_ms,
+               IngestFetch.db_ms, IngestFetch.http_status)
+        .join(Feed, Feed.id == IngestFetch.feed_id)
+        .where(IngestFetch.run_id.in_(list(run_ids)))
+    ).all()
+
+    by_feed: Dict[int, dict] = {}
+    for feed_id, url, fetch_ms, parse_ms, article_ms, ai_ms, db_ms, http_status in rows:
+        item = by_feed.setdefault(feed_id, {
+            "feed_id": feed_id, "url": url, "fetch": [], "total": [], "errors": 0,
+        })
+        item["fetch"].append(fetch_ms)
+        item["total"].append(fetch_ms + parse_ms + article_ms + ai_ms + db_ms)
+        item["errors"] += http_status is None or http_status >= 400
+
+    timings = [
+        {
+            "feed_id": item["feed_id"],
+            "url": item["url"],
+            "fetches": len(item["fetch"]),
+            "errors": item["errors"],
+            "p50_fetch_ms": percentile(item["fetch"], 50),
+            "p95_fetch_ms": percentile(item["fetch"], 95),
+            "p95_total_ms": percentile(item["total"], 95),
+        }
+        for item in by_feed.values()
+    ]
+    timings.sort(key=lambda t: (-t["p95_total_ms"], t["feed_id"]))
+    return timings
+
+
+def ingest_report(db: Session, runs: int = 20, slowest: int = 10) -> dict:
+    """Últimas ejecuciones, tiempos por feed y los feeds más lentos."""
+    last_runs = recent_runs(db, runs)
+    timings = feed_timings(db, [r.id for r in last_runs])
+    return {
+        "runs": last_runs,
+        "feeds": timings,
+        "slowest_feeds": timings[:slowest],
+    }
@@ -1,41 +1,74 @@
-"""Envío de correo vía SMTP (sin dependencias extra)."""
+"""
+Envío de correo vía SMTP (sin dependencias extra).
+
+La configuración SMTP_* se lee una vez (`SmtpSettings.from_env`) y el envío va
+por un `SmtpTransport`: un pool de hasta SMTP_POOL_SIZE sesiones SMTP ya
+autenticadas que se reutilizan entre mensajes (RSET entre uno y otro), en
+lugar de abrir conexión + STARTTLS + login por cada correo. Si una sesión se
+cae, se reconecta y se reintenta el mensaje una vez. Cada sesión se renueva
+tras SMTP_MAX_MESSAGES_PER_SESSION mensajes (los servidores suelen limitarlo).
+"""
 
 from __future__ import annotations
 
 import html
 import os
+import queue
 import smtplib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.message import Message
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import Optional
 
 
 def smtp_configured() -> bool:
     return bool(os.getenv("SMTP_HOST", "").strip())
 
 
-def send_email(
+@dataclass(frozen=True)
+class SmtpSettings:
+    host: str
+    port: int = 587
+    user: str = ""
+    password: str = ""
+    from_addr: str = ""
+    use_tls: bool = True
+    timeout: float = 30
+    pool_size: int = 4
+    max_messages_per_session: int = 1000
+
+    @classmethod
+    def from_env(cls) -> "SmtpSettings":
+        host = os.getenv("SMTP_HOST", "").strip()
+        if not host:
+            raise RuntimeError("SMTP_HOST no está configurado")
+        user = os.getenv("SMTP_USER", "").strip()
+        from_addr = os.getenv("SMTP_FROM", user or "").strip()
+        if not from_addr:
+            raise RuntimeError("SMTP_FROM o SMTP_USER debe estar definido")
+        return cls(
+            host=host,
+            port=int(os.getenv("SMTP_PORT", "587")),
+            user=user,
+            password=os.getenv("SMTP_PASSWORD", ""),
+            from_addr=from_addr,
+            use_tls=os.getenv("SMTP_USE_TLS", "1").strip().lower() in ("1", "true", "yes"),
+            timeout=int(os.getenv("SMTP_TIMEOUT_SECONDS", "30")),
+            pool_size=int(os.getenv("SMTP_POOL_SIZE", "4")),
+            max_messages_per_session=int(os.getenv("SMTP_MAX_MESSAGES_PER_SESSION", "1000")),
+        )
+
+
+def build_message(
+    from_addr: str,
     to: str,
     subject: str,
     text_body: str,
     html_body: str | None = None,
-) -> None:
-    host = os.getenv("SMTP_HOST", "").strip()
-    if not host:
-        raise RuntimeError("SMTP_HOST no está configurado")
-
-    port = int(os.getenv("SMTP_PORT", "587"))
-    user = os.getenv("SMTP_USER", "").strip()
-    password = os.getenv("SMTP_PASSWORD", "")
-    from_addr = os.getenv("SMTP_FROM", user or "").strip()
-    if not from_addr:
-        raise RuntimeError("SMTP_FROM o SMTP_USER debe estar definido")
-
-    use_tls = os.getenv("SMTP_USE_TLS", "1").strip().lower() in (
-        "1",
-        "true",
-        "yes",
-    )
-
+) -> str:
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
     msg["From"] = from_addr
@@ -43,14 +76,193 @@ def send_email(
     msg.attach(MIMEText(text_body, "plain", "utf-8"))
     if html_body:
         msg.attach(MIMEText(html_body, "html", "utf-8"))
+    return msg.as_string()
+
+
+class _Session:
+    def __init__(self, smtp: smtplib.SMTP) -> None:
+        self.smtp = smtp
+        self.sent = 0
+        self.dirty = False  # ya tuvo una transacción: RSET antes de la siguiente
+
+
+class SmtpTransport:
+    """
+    Pool de sesiones SMTP autenticadas, seguro entre hilos: como mucho
+    `pool_size` envíos simultáneos, uno por sesión.
+    """
+
+    def __init__(self, settings: SmtpSettings) -> None:
+        self.settings = settings
+        self.connects = 0
+        self._slots = threading.BoundedSemaphore(max(1, settings.pool_size))
+        self._idle: "queue.LifoQueue[_Session]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> _Session:
+        s = self.settings
+        smtp = smtplib.SMTP(s.host, s.port, timeout=s.timeout)
+        try:
+            if s.use_tls:
+                smtp.starttls()
+            if s.user:
+                smtp.login(s.user, s.password)
+        except BaseException:
+            smtp.close()
+            raise
+        with self._lock:
+            self.connects += 1
+        return _Session(smtp)
 
-    timeout = int(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
-    with smtplib.SMTP(host, port, timeout=timeout) as smtp:
-        if use_tls:
-            smtp.starttls()
-        if user:
-            smtp.login(user, password)
-        smtp.sendmail(from_addr, [to], msg.as_string())
+    @staticmethod
+    def _discard(session: Optional[_Session]) -> None:
+        if session is None:
+            return
+        try:
+            session.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            session.smtp.close()
+
+    def send_message(self, to: str, message: str) -> None:
+        """Envía un mensaje ya construido; reconecta una vez si la sesión se cayó."""
+        self._slots.acquire()
+        session: Optional[_Session] = None
+        try:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = None
+            for attempt in (1, 2):
+                try:
+                    if session is None:
+                        session = self._connect()
+                    elif session.dirty:
+                        session.smtp.rset()
+                    session.dirty = True
+                    session.smtp.sendmail(self.settings.from_addr, [to], message)
+                    session.sent += 1
+                    break
+                except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException) as exc:
+                    # 421: el servidor cierra la sesión; otros códigos son del mensaje
+                    if isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code != 421:
+                        raise
+                    self._discard(session)
+                    session = None
+                    if attempt == 2:
+                        raise
+                except smtplib.SMTPException:
+                    raise  # destinatario rechazado, etc.: la sesión sigue valiendo
+                except OSError:
+                    self._discard(session)
+                    session = None
+                    if attempt == 2:
+                        raise
+            if session is not None and session.sent >= self.settings.max_messages_per_session:
+                self._discard(session)
+                session = None
+        finally:
+            if session is not None:
+                # Tras close() no se devuelve al pool: nadie la cerraría
+                with self._lock:
+                    closed = self._closed
+                    if not closed:
+                        self._idle.put(session)
+                if closed:
+                    self._discard(session)
+            self._slots.release()
+
+    def send(self, to: str, subject: str, text_body: str, html_body: str | None = None) -> None:
+        self.send_message(
+            to, build_message(self.settings.from_addr, to, subject, text_body, html_body))
+
+    def close(self) -> None:
+        """QUIT de las sesiones abiertas (las que estén en uso se cierran al devolverse)."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+_transport: Optional[SmtpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def configure_transport(settings: Optional[SmtpSettings] = None) -> SmtpTransport:
+    """(Re)crea el transporte del proceso; sin `settings` se leen las SMTP_*."""
+    global _transport
+    new = SmtpTransport(settings or SmtpSettings.from_env())
+    with _transport_lock:
+        old, _transport = _transport, new
+    if old is not None:
+        old.close()
+    return new
+
+
+def get_transport() -> SmtpTransport:
+    """Transporte del proceso; se configura desde el entorno la primera vez."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = SmtpTransport(SmtpSettings.from_env())
+        return _transport
+
+
+def close_transport() -> None:
+    global _transport
+    with _transport_lock:
+        old, _transport = _transport, None
+    if old is not None:
+        old.close()
+
+
+def send_email(
+    to: str,
+    subject: str,
+    text_body: str,
+    html_body: str | None = None,
+) -> None:
+    get_transport().send(to, subject, text_body, html_body)
+
+
+_DIGEST_HTML_HEAD = "<!DOCTYPE html><html><body style=\"font-family:system-ui,sans-serif;\">"
+_DIGEST_HTML_TAIL = (
+    "<p style=\"color:#666;font-size:0.85rem;\">Enviado automáticamente.</p>"
+    "</body></html>"
+)
+
+
+def _tip_fragments(tip) -> tuple[str, str]:
+    """Fragmento de texto plano (con su línea en blanco) y bloque HTML de un tip."""
+    title = html.escape(tip.title or "")
+    body = html.escape((tip.body or "")[:800])
+    topic_name = ""
+    if getattr(tip, "topic", None) is not None and tip.topic.name:
+        topic_name = html.escape(tip.topic.name)
+    plain = (
+        f"• {tip.title}\n"
+        f"  {tip.body[:400]}{'…' if len(tip.body or '') > 400 else ''}\n"
+    )
+    sub = f" <small>({topic_name})</small>" if topic_name else ""
+    block = (
+        f"<h2 style=\"font-size:1rem;margin:1rem 0 0.25rem;\">{title}{sub}</h2>"
+        f"<p style=\"margin:0 0 0.75rem;\">{body.replace(chr(10), '<br/>')}</p>"
+    )
+    return plain, block
+
+
+def _assemble_digest(date_label: str, fragments: list) -> tuple[str, str]:
+    text = (f"Tips — {date_label}\n\n" + "\n".join(p for p, _ in fragments)).strip()
+    html_doc = (
+        _DIGEST_HTML_HEAD
+        + f"<p><strong>Tips — {html.escape(date_label)}</strong></p>"
+        + "".join(b for _, b in fragments)
+        + _DIGEST_HTML_TAIL
+    )
+    return text, html_doc
 
 
 def build_tip_digest_bodies(
@@ -58,29 +270,74 @@ def build_tip_digest_bodies(
     date_label: str,
 ) -> tuple[str, str]:
     """Genera texto plano y HTML seguro para un lote de tips ORM."""
-    lines_plain: list[str] = [f"Tips — {date_label}", ""]
-    blocks_html: list[str] = [f"<p><strong>Tips — {html.escape(date_label)}</strong></p>"]
-
-    for tip in tips:
-        title = html.escape(tip.title or "")
-        body = html.escape((tip.body or "")[:800])
-        topic_name = ""
-        if getattr(tip, "topic", None) is not None and tip.topic.name:
-            topic_name = html.escape(tip.topic.name)
-        lines_plain.append(f"• {tip.title}")
-        lines_plain.append(f"  {tip.body[:400]}{'…' if len(tip.body or '') > 400 else ''}")
-        lines_plain.append("")
-        sub = f" <small>({topic_name})</small>" if topic_name else ""
-        blocks_html.append(
-            f"<h2 style=\"font-size:1rem;margin:1rem 0 0.25rem;\">{title}{sub}</h2>"
-            f"<p style=\"margin:0 0 0.75rem;\">{body.replace(chr(10), '<br/>')}</p>"
-        )
+    return _assemble_digest(date_label, [_tip_fragments(tip) for tip in tips])
 
-    text = "\n".join(lines_plain).strip()
-    html_doc = (
-        "<!DOCTYPE html><html><body style=\"font-family:system-ui,sans-serif;\">"
-        + "".join(blocks_html)
-        + "<p style=\"color:#666;font-size:0.85rem;\">Enviado automáticamente.</p>"
-        "</body></html>"
-    )
-    return text, html_doc
+
+def _header_lines(**headers: str) -> str:
+    """Cabeceras codificadas igual que en build_message (RFC 2047, plegado)."""
+    if all(value.isascii() and len(name) + len(value) < 74 and "\n" not in value
+           for name, value in headers.items()):
+        return "\n".join(f"{name}: {value}" for name, value in headers.items())
+    msg = Message()
+    for name, value in headers.items():
+        msg[name] = value
+    return msg.as_string().rstrip("\n")
+
+
+class DigestRenderer:
+    """
+    Render de digests para una ejecución: los mismos pocos tips populares se
+    repiten en miles de correos, así que cada tip se escapa y formatea una
+    vez (fragmentos de texto y HTML por tip.id) y cada combinación de tips se
+    codifica en MIME una vez; por usuario solo cambian Subject/From/To.
+    El resultado es el mismo mensaje que build_tip_digest_bodies + build_message
+    (salvo el boundary MIME, que es aleatorio).
+
+    No es seguro entre hilos: lo usa el productor del digest.
+    """
+
+    def __init__(self, max_bodies: int = 4096) -> None:
+        self.max_bodies = max_bodies
+        self._fragments: dict = {}
+        # (date_label, tip ids) -> (cabecera MIME, cuerpo MIME), LRU
+        self._bodies: "OrderedDict[tuple, tuple[str, str]]" = OrderedDict()
+        self._headers: dict = {}
+        self.fragment_hits = 0
+        self.body_hits = 0
+
+    def fragments(self, tip) -> tuple[str, str]:
+        frag = self._fragments.get(tip.id)
+        if frag is None:
+            frag = self._fragments[tip.id] = _tip_fragments(tip)
+        else:
+            self.fragment_hits += 1
+        return frag
+
+    def bodies(self, tips: list, date_label: str) -> tuple[str, str]:
+        return _assemble_digest(date_label, [self.fragments(tip) for tip in tips])
+
+    def _mime_body(self, tips: list, date_label: str) -> tuple[str, str]:
+        key = (date_label, tuple(tip.id for tip in tips))
+        cached = self._bodies.get(key)
+        if cached is not None:
+            self._bodies.move_to_end(key)
+            self.body_hits += 1
+            return cached
+        text_body, html_body = self.bodies(tips, date_label)
+        msg = MIMEMultipart("alternative")
+        msg.attach(MIMEText(text_body, "plain", "utf-8"))
+        msg.attach(MIMEText(html_body, "html", "utf-8"))
+        head, _, body = msg.as_string().partition("\n\n")
+        cached = self._bodies[key] = (head, body)
+        if len(self._bodies) > self.max_bodies:
+            self._bodies.popitem(last=False)
+        return cached
+
+    def message(self, from_addr: str, to: str, subject: str, tips: list, date_label: str) -> str:
+        """Mensaje completo, como build_message(from_addr, to, subject, *bodies(...))."""
+        head, body = self._mime_body(tips, date_label)
+        key = (subject, from_addr)
+        common = self._headers.get(key)
+        if common is None:
+            common = self._headers[key] = _header_lines(Subject=subject, From=from_addr)
+        return f"{head}\n{common}\n{_header_lines(To=to)}\n\n{body}"
@@ -0,0 +1,221 @@
+"""
+Detección de tips casi duplicados dentro de un topic (MinHash + LSH).
+
+`make_fingerprint` solo detecta copias exactas; los feeds sindicados repiten
+la misma noticia con el título retocado. Aquí:
+
+- El texto (título + cuerpo) se normaliza y se parte en shingles de 2 palabras
+  (con 3, retocar el título de un texto corto ya baja de 0.9).
+- La firma MinHash (NUM_PERM valores) se guarda en `tips.minhash`.
+- La firma se divide en BANDS bandas; cada banda se resume en un bucket de
+  64 bits (que incluye el topic) y se guarda en `tip_lsh_buckets`.
+- Candidatos = tips que comparten algún bucket (consulta por índice, sin
+  recorrer el topic). Solo con ellos se estima la similitud de Jaccard a partir
+  de las firmas; >= NEAR_DUP_THRESHOLD (0.9, docs/08-Quality-Scoring.md) es
+  casi duplicado.
+
+Con 16 bandas de 8 filas, dos textos con similitud 0.9 comparten bucket con
+probabilidad ~0.9999 y dos con 0.5 solo ~0.06.
+
+NEAR_DUP_ACTION decide qué hacer con ellos: `reject` (por defecto, no se
+guardan) o `flag` (se guardan como `draft` para revisión).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import re
+import struct
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import Tip, TipLshBucket
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 2
+
+THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.9"))
+ACTION = os.getenv("NEAR_DUP_ACTION", "reject")  # reject | flag
+
+# Consultas IN por debajo del límite de parámetros de SQLite
+_QUERY_CHUNK = 500
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20261019)  # fija: las firmas guardadas deben ser estables
+_PERMS: Tuple[Tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+)
+_SIG_FORMAT = f"<{NUM_PERM}Q"
+_WORD = re.compile(r"\w+")
+
+Signature = Tuple[int, ...]
+
+
+def _normalize(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _WORD.findall(text)
+
+
+def shingles(title: str, body: str) -> Set[str]:
+    words = _normalize(f"{title} {body}")
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)}
+    return {
+        " ".join(words[i:i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def signature(title: str, body: str) -> Signature:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingles(title, body)
+    ]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def pack_signature(sig: Signature) -> bytes:
+    return struct.pack(_SIG_FORMAT, *sig)
+
+
+def unpack_signature(data: bytes) -> Signature:
+    return struct.unpack(_SIG_FORMAT, data)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Jaccard estimada: fracción de posiciones iguales de la firma."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def band_buckets(topic_id: int, sig: Signature) -> List[int]:
+    buckets = []
+    for band in range(BANDS):
+        chunk = sig[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(
+            struct.pack(f"<qB{ROWS}Q", topic_id, band, *chunk), digest_size=8
+        ).digest()
+        # 63 bits: cabe en un BIGINT con signo
+        buckets.append(int.from_bytes(digest, "little") >> 1)
+    return buckets
+
+
+# ------------------------------
+# Index lookups and updates
+# ------------------------------
+def _stored_candidates(
+    db: Session, buckets: Iterable[int]
+) -> Tuple[Dict[int, Set[int]], Dict[int, Signature]]:
+    """(bucket -> ids de tips, id -> firma). El JOIN con tips descarta filas huérfanas."""
+    wanted = list(dict.fromkeys(buckets))
+    tips_by_bucket: Dict[int, Set[int]] = {}
+    signatures: Dict[int, Signature] = {}
+    for start in range(0, len(wanted), _QUERY_CHUNK):
+        rows = db.execute(
+            select(TipLshBucket.bucket, Tip.id, Tip.minhash)
+            .join(Tip, Tip.id == TipLshBucket.tip_id)
+            .where(TipLshBucket.bucket.in_(wanted[start:start + _QUERY_CHUNK]))
+        ).all()
+        for bucket, tip_id, minhash in rows:
+            if minhash is None:
+                continue
+            tips_by_bucket.setdefault(bucket, set()).add(tip_id)
+            if tip_id not in signatures:
+                signatures[tip_id] = unpack_signature(minhash)
+    return tips_by_bucket, signatures
+
+
+def find_near_duplicate(
+    db: Session, topic_id: int, sig: Signature, exclude_tip_id: Optional[int] = None
+) -> Optional[int]:
+    """Id de un tip del topic con similitud >= THRESHOLD, o None."""
+    matches = find_near_duplicates(db, [(topic_id, sig)], exclude_tip_id=exclude_tip_id)
+    return matches[0]
+
+
+def find_near_duplicates(
+    db: Session,
+    items: Sequence[Tuple[int, Signature]],
+    exclude_tip_id: Optional[int] = None,
+) -> List[Optional[int]]:
+    """
+    Para cada (topic_id, firma) devuelve el id del tip casi duplicado o None.
+    Una consulta por bloque de buckets para todo el lote. Los elementos del
+    propio lote también se comparan entre sí: un duplicado de un elemento
+    anterior devuelve -1 (todavía no tiene id).
+    """
+    all_buckets = [band_buckets(topic_id, sig) for topic_id, sig in items]
+    stored, signatures = _stored_candidates(db, (b for bs in all_buckets for b in bs))
+
+    results: List[Optional[int]] = []
+    batch_buckets: Dict[int, List[Signature]] = {}
+    for (topic_id, sig), buckets in zip(items, all_buckets):
+        match: Optional[int] = None
+        seen: Set[int] = set()
+        for bucket in buckets:
+            for tip_id in stored.get(bucket, ()):
+                if tip_id in seen or tip_id == exclude_tip_id:
+                    continue
+                seen.add(tip_id)
+                if similarity(sig, signatures[tip_id]) >= THRESHOLD:
+                    match = tip_id
+                    break
+            if match is None and any(
+                similarity(sig, other) >= THRESHOLD for other in batch_buckets.get(bucket, ())
+            ):
+                match = -1
+            if match is not None:
+                break
+        if match is None:
+            for bucket in buckets:
+                batch_buckets.setdefault(bucket, []).append(sig)
+        results.append(match)
+    return results
+
+
+def index_tips(db: Session, tips: Iterable[Tuple[int, int, bytes]]) -> None:
+    """Añade al índice LSH (tip_id, topic_id, minhash). No hace commit."""
+    rows = [
+        {"tip_id": tip_id, "topic_id": topic_id, "bucket": bucket}
+        for tip_id, topic_id, minhash in tips
+        for bucket in set(band_buckets(topic_id, unpack_signature(minhash)))
+    ]
+    if rows:
+        db.execute(TipLshBucket.__table__.insert(), rows)
+
+
+def unindex_tip(db: Session, tip_id: int) -> None:
+    db.execute(delete(TipLshBucket).where(TipLshBucket.tip_id == tip_id))
+
+
+def rebuild_index(db: Session, topic_id: Optional[int] = None, batch_size: int = 1000) -> int:
+    """
+    Recalcula firmas e índice (p. ej. tips anteriores a esta funcionalidad).
+    Devuelve cuántos tips se han indexado.
+    """
+    bucket_delete = delete(TipLshBucket)
+    tips_stmt = select(Tip.id, Tip.topic_id, Tip.title, Tip.body).order_by(Tip.id)
+    if topic_id is not None:
+        bucket_delete = bucket_delete.where(TipLshBucket.topic_id == topic_id)
+        tips_stmt = tips_stmt.where(Tip.topic_id == topic_id)
+    db.execute(bucket_delete)
+
+    count = 0
+    rows = db.execute(tips_stmt).all()
+    for start in range(0, len(rows), batch_size):
+        batch = [
+            (tip_id, tip_topic_id, pack_signature(signature(title, body)))
+            for tip_id, tip_topic_id, title, body in rows[start:start + batch_size]
+        ]
+        db.execute(update(Tip), [{"id": t[0], "minhash": t[2]} for t in batch])
+        index_tips(db, batch)
+        db.commit()
+        count += len(batch)
+    return count
@@ -17,9 +17,12 @@ def apply_plan_policy(
     Premium provisional: user.is_admin == True.
     Devuelve (topics_permitidos, per_topic_efectivo).
     """
-    is_premium = bool(getattr(user, "is_admin", False))
-    all_topics = get_user_subscribed_topics(db, user.id)
+    return plan_topics(user, get_user_subscribed_topics(db, user.id), requested_per_topic)
+
 
+def plan_topics(user, all_topics: list, requested_per_topic: int) -> tuple[list, int]:
+    """Igual que apply_plan_policy, con los temas suscritos ya cargados."""
+    is_premium = bool(getattr(user, "is_admin", False))
     if is_premium:
         per_topic_effective = requested_per_topic
         topics_allowed = all_topics
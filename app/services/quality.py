@@ -0,0 +1,158 @@
+"""
+Puntuación de calidad por lotes (docs/08-Quality-Scoring.md).
+
+Se puntúa un lote entero de candidatos de una vez:
+
+- Todos los textos se concatenan en un único array de code points (NumPy) y
+  las cuentas por tip (letras, mayúsculas, exclamaciones) salen de
+  `np.add.reduceat` sobre los offsets de cada texto.
+- Las afirmaciones milagro se buscan con una sola expresión compilada a partir
+  de un trie de las palabras clave (sin distinguir mayúsculas ni tildes), en
+  una sola pasada sobre el texto concatenado; cada coincidencia se asigna a su
+  tip con `np.searchsorted`.
+
+Reglas (sobre una base de BASE_SCORE):
+- cuerpo > 400 caracteres: -15; cuerpo < 40 caracteres: -20
+- cada afirmación milagro: -20 (máximo dos)
+- cuerpo igual al título (el feed no traía resumen): -15
+- más de un 30 % de mayúsculas: -10; tres o más exclamaciones: -10
+
+Los tips por debajo de PUBLISH_THRESHOLD (60) se guardan como `draft`.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+if TYPE_CHECKING:
+    # NumPy se importa al puntuar: la API y los jobs importan este módulo
+    # (vía tips.py) y no deben pagar su arranque.
+    import numpy as np
+
+BASE_SCORE = 80
+PUBLISH_THRESHOLD = int(os.getenv("QUALITY_PUBLISH_THRESHOLD", "60"))
+
+LONG_BODY_CHARS = 400
+SHORT_BODY_CHARS = 40
+LONG_PENALTY = 15
+SHORT_PENALTY = 20
+CLAIM_PENALTY = 20
+MAX_CLAIMS_PENALIZED = 2
+NO_SUMMARY_PENALTY = 15
+SHOUTING_RATIO = 0.3
+SHOUTING_PENALTY = 10
+EXCLAMATIONS = 3
+EXCLAMATION_PENALTY = 10
+
+# En minúsculas y sin tildes: el patrón acepta cualquier variante
+MIRACLE_CLAIMS = (
+    # es
+    "cura", "curar", "curara", "cura definitiva", "milagro", "milagroso", "milagrosa",
+    "milagros", "garantizado", "garantizada", "garantizados", "garantizadas",
+    "resultados garantizados", "100% efectivo",
+    "sin esfuerzo", "quema grasa", "adelgaza sin", "pierde peso sin", "elimina toxinas",
+    "detox", "remedio secreto", "los medicos odian", "nunca mas",
+    # en
+    "cure", "cures", "miracle", "guaranteed", "instant results", "doctors hate",
+    "burn fat fast", "lose weight fast",
+)
+
+# Letra base -> clase con sus variantes acentuadas
+_ACCENTS = {"a": "aáà", "e": "eéè", "i": "iíì", "o": "oóò", "u": "uúùü", "n": "nñ"}
+# Separador entre textos: no es letra ni aparece en las palabras clave
+_SEP = "\x00"
+
+
+def _char_class(ch: str) -> str:
+    return f"[{_ACCENTS[ch]}]" if ch in _ACCENTS else re.escape(ch)
+
+
+def _trie_pattern(words: Sequence[str]) -> str:
+    """Regex con prefijos factorizados (trie) para las palabras clave."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        end = "" in node
+        branches = [_char_class(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if end else body
+
+    return build(trie)
+
+
+_CLAIMS_RE = re.compile(
+    r"(?<!\w)" + _trie_pattern(MIRACLE_CLAIMS) + r"(?!\w)", re.IGNORECASE)
+
+
+def _codepoints(text: str) -> np.ndarray:
+    import numpy as np
+
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _per_text_sums(mask: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Suma de `mask` dentro de cada texto; 0 para textos vacíos."""
+    import numpy as np
+
+    sums = np.add.reduceat(mask.astype(np.int64), starts) if mask.size else np.zeros(len(starts), np.int64)
+    return np.where(lengths > 0, sums, 0)
+
+
+def score_tips(titles: Sequence[str], bodies: Sequence[str]) -> List[int]:
+    """Puntuación 0-100 de cada (título, cuerpo) del lote."""
+    n = len(bodies)
+    if n == 0:
+        return []
+    import numpy as np
+
+    lengths = np.fromiter((len(b) for b in bodies), dtype=np.int64, count=n)
+    starts = np.zeros(n, dtype=np.int64)
+    starts[1:] = np.cumsum(lengths + 1)[:-1]  # +1 por el separador
+
+    joined = _SEP.join(bodies)
+    cp = _codepoints(joined)
+    # reduceat necesita índices válidos aunque el último texto esté vacío
+    safe_starts = np.minimum(starts, max(cp.size - 1, 0))
+
+    upper = ((cp >= 65) & (cp <= 90)) | ((cp >= 192) & (cp <= 222) & (cp != 215))
+    lower = ((cp >= 97) & (cp <= 122)) | ((cp >= 223) & (cp <= 255) & (cp != 247))
+    bang = (cp == 33) | (cp == 161)
+    n_upper = _per_text_sums(upper, safe_starts, lengths)
+    n_letters = _per_text_sums(upper | lower, safe_starts, lengths)
+    n_bangs = _per_text_sums(bang, safe_starts, lengths)
+
+    text = _SEP.join(f"{t}{_SEP}{b}" for t, b in zip(titles, bodies))
+    claim_starts = np.fromiter(
+        (m.start() for m in _CLAIMS_RE.finditer(text)), dtype=np.int64)
+    # Cada tip ocupa título + SEP + cuerpo + SEP en el texto concatenado
+    title_lengths = np.fromiter((len(t) for t in titles), dtype=np.int64, count=n)
+    pair_ends = np.cumsum(title_lengths + lengths + 2)
+    claims = np.bincount(
+        np.searchsorted(pair_ends, claim_starts, side="right"), minlength=n)[:n]
+
+    no_summary = np.fromiter(
+        (t.strip() == b.strip() for t, b in zip(titles, bodies)), dtype=bool, count=n)
+
+    score = np.full(n, BASE_SCORE, dtype=np.int64)
+    score -= LONG_PENALTY * (lengths > LONG_BODY_CHARS)
+    score -= SHORT_PENALTY * (lengths < SHORT_BODY_CHARS)
+    score -= CLAIM_PENALTY * np.minimum(claims, MAX_CLAIMS_PENALIZED)
+    score -= NO_SUMMARY_PENALTY * no_summary
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shouting = np.where(n_letters > 0, n_upper / np.maximum(n_letters, 1), 0.0)
+    score -= SHOUTING_PENALTY * (shouting > SHOUTING_RATIO)
+    score -= EXCLAMATION_PENALTY * (n_bangs >= EXCLAMATIONS)
+    return np.clip(score, 0, 100).tolist()
+
+
+def status_for_score(score: int) -> str:
+    return "published" if score >= PUBLISH_THRESHOLD else "draft"
@@ -0,0 +1,29 @@
+"""Limitador de ritmo (mensajes por segundo) compartido entre hilos."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Reparte turnos separados 1/rate segundos; `wait()` duerme hasta el turno
+    que le toca (fuera del lock). rate <= 0 significa sin límite.
+    """
+
+    def __init__(self, per_second: float) -> None:
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
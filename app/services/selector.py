@@ -1,12 +1,14 @@
 # app/services/selector.py
 
 from __future__ import annotations
+from dataclasses import dataclass
 from datetime import datetime, date, time
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 from sqlalchemy import select, func, exists, and_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from zoneinfo import ZoneInfo
-from app.db.models import Subscription, Tip, Topic, Delivery
+from app.db.models import Subscription, Tip, Delivery
+from app.services.topic_catalog import TopicEntry, get_topic
 
 PUBLISHED_STATUS = "published"
 
@@ -36,22 +38,24 @@ def _daily_index(seed_date: date, user_id: int, topic_id: int, modulo: int) -> i
 # ------------------------------
 # Basic selection helpers
 # ------------------------------
-def get_user_subscribed_topics(db: Session, user_id: int) -> List[Topic]:
+def get_user_subscribed_topics(db: Session, user_id: int) -> List[TopicEntry]:
     """
     Return all active topics that the user is subscribed to.
     Both the subscription and the topic must be active.
+    Topic data comes from the in-memory catalog snapshot; only the
+    subscription ids are read from the database.
     """
-    q = (
-        select(Topic)
-        .join(Subscription, Subscription.topic_id == Topic.id)
-        .where(
+    topic_ids = db.scalars(
+        select(Subscription.topic_id).where(
             Subscription.user_id == user_id,
             Subscription.is_active == True,  # noqa: E712
-            Topic.is_active == True,
         )
-        .order_by(Topic.name.asc())
+    ).all()
+    topics = [get_topic(db, topic_id) for topic_id in topic_ids]
+    return sorted(
+        (t for t in topics if t is not None and t.is_active),
+        key=lambda t: t.name,
     )
-    return list(db.scalars(q))
 
 
 def _tips_not_delivered_query(user_id: int, topic_id: int):
@@ -133,8 +137,8 @@ def pick_daily_bundle(
     per_topic: int = 1,
     strategy: str = "latest",
     tz_name: str = "Europe/Madrid",
-    topics_override: Optional[List[Topic]] = None,
-) -> List[Tuple[Topic, List[Tip]]]:
+    topics_override: Optional[List[TopicEntry]] = None,
+) -> List[Tuple[TopicEntry, List[Tip]]]:
     """
     Return a bundle of (topic, [tips]) for each subscribed topic.
     Prioritizes non-delivered tips, then falls back to daily rotation.
@@ -143,7 +147,7 @@ def pick_daily_bundle(
     topics = topics_override if topics_override is not None else get_user_subscribed_topics(
         db, user_id
     )
-    bundle: List[Tuple[Topic, List[Tip]]] = []
+    bundle: List[Tuple[TopicEntry, List[Tip]]] = []
 
     for topic in topics:
         picks: List[Tip] = []
@@ -184,12 +188,140 @@ def pick_daily_bundle(
     return bundle
 
 
-def count_remaining_by_topic(db: Session, user_id: int) -> List[Tuple[Topic, int]]:
+# ------------------------------
+# Bulk selection (email digest)
+# ------------------------------
+def get_subscribed_topics_for_users(
+    db: Session, user_ids: Sequence[int]
+) -> Dict[int, List[TopicEntry]]:
+    """
+    Same as get_user_subscribed_topics for many users with a single query.
+    Users without active subscriptions map to an empty list.
+    """
+    out: Dict[int, List[TopicEntry]] = {user_id: [] for user_id in user_ids}
+    if not out:
+        return out
+    rows = db.execute(
+        select(Subscription.user_id, Subscription.topic_id).where(
+            Subscription.user_id.in_(list(out)),
+            Subscription.is_active == True,  # noqa: E712
+        )
+    ).all()
+    for user_id, topic_id in rows:
+        topic = get_topic(db, topic_id)
+        if topic is not None and topic.is_active:
+            out[user_id].append(topic)
+    for topics in out.values():
+        topics.sort(key=lambda t: t.name)
+    return out
+
+
+@dataclass
+class BundleRequest:
+    """Arguments of one pick_daily_bundle call (strategy 'latest')."""
+    user_id: int
+    topics: List[TopicEntry]
+    per_topic: int = 1
+    tz_name: str = "Europe/Madrid"
+
+
+class DailyBundleSelector:
+    """
+    pick_daily_bundle for a chunk of users with a constant number of queries:
+    the published tip ids of each topic (cached across chunks), the
+    deliveries of the chunk's users and the picked tips with their topic.
+    Only the 'latest' strategy, which is the one the digest uses.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        # topic_id -> published tip ids ordered by (created_at, id)
+        self._topic_tips: Dict[int, List[int]] = {}
+
+    def _load_topic_tips(self, topic_ids: Sequence[int]) -> None:
+        missing = [tid for tid in topic_ids if tid not in self._topic_tips]
+        if not missing:
+            return
+        for tid in missing:
+            self._topic_tips[tid] = []
+        rows = self.db.execute(
+            select(Tip.topic_id, Tip.id)
+            .where(Tip.topic_id.in_(missing), Tip.status == PUBLISHED_STATUS)
+            .order_by(Tip.created_at.asc(), Tip.id.asc())
+        ).all()
+        for topic_id, tip_id in rows:
+            self._topic_tips[topic_id].append(tip_id)
+
+    def pick(
+        self, requests: Sequence[BundleRequest]
+    ) -> Dict[int, List[Tuple[TopicEntry, List[Tip]]]]:
+        """user_id -> bundle, same result as pick_daily_bundle per user."""
+        topic_ids = sorted({t.id for r in requests for t in r.topics})
+        self._load_topic_tips(topic_ids)
+
+        delivered: Dict[int, set] = {r.user_id: set() for r in requests}
+        if delivered and topic_ids:
+            rows = self.db.execute(
+                select(Delivery.user_id, Delivery.tip_id)
+                .join(Tip, Tip.id == Delivery.tip_id)
+                .where(Delivery.user_id.in_(list(delivered)), Tip.topic_id.in_(topic_ids))
+            ).all()
+            for user_id, tip_id in rows:
+                delivered[user_id].add(tip_id)
+
+        today_by_tz: Dict[str, date] = {}
+        picked_ids: Dict[int, List[Tuple[TopicEntry, List[int]]]] = {}
+        for req in requests:
+            if req.tz_name not in today_by_tz:
+                today_by_tz[req.tz_name] = datetime.now(ZoneInfo(req.tz_name)).date()
+            seen = delivered[req.user_id]
+            bundle: List[Tuple[TopicEntry, List[int]]] = []
+            for topic in req.topics:
+                all_ids = self._topic_tips.get(topic.id, [])
+                # Undelivered, newest first
+                picks = []
+                for tip_id in reversed(all_ids):
+                    if len(picks) >= req.per_topic:
+                        break
+                    if tip_id not in seen:
+                        picks.append(tip_id)
+                # Deterministic rotation fallback
+                if len(picks) < req.per_topic and all_ids:
+                    start = _daily_index(today_by_tz[req.tz_name], req.user_id,
+                                         topic.id, len(all_ids))
+                    already = set(picks)
+                    i = 0
+                    while len(picks) < req.per_topic and i < len(all_ids):
+                        tip_id = all_ids[(start + i) % len(all_ids)]
+                        if tip_id not in already:
+                            picks.append(tip_id)
+                            already.add(tip_id)
+                        i += 1
+                if picks:
+                    bundle.append((topic, picks))
+            picked_ids[req.user_id] = bundle
+
+        wanted = {tip_id for bundle in picked_ids.values() for _, ids in bundle for tip_id in ids}
+        tips: Dict[int, Tip] = {}
+        if wanted:
+            tips = {
+                tip.id: tip
+                for tip in self.db.scalars(
+                    select(Tip).where(Tip.id.in_(wanted)).options(selectinload(Tip.topic))
+                )
+            }
+        return {
+            user_id: [(topic, [tips[i] for i in ids]) for topic, ids in bundle]
+            for user_id, bundle in picked_ids.items()
+        }
+
+
+def count_remaining_by_topic(db: Session, user_id: int) -> List[Tuple[TopicEntry, int]]:
     """
     For each subscribed topic, return how many non-delivered tips remain.
     """
     topics = get_user_subscribed_topics(db, user_id)
-    out: List[Tuple[Topic, int]] = []
+    out: List[Tuple[TopicEntry, int]] = []
 
     for topic in topics:
         base_q = _tips_not_delivered_query(user_id, topic.id)
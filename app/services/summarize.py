@@ -0,0 +1,189 @@
+"""
+Resumen extractivo local (sin red ni GPU) para los cuerpos de los tips.
+
+Es el motor de generate.py cuando no hay API key y el fallback cuando el
+modelo falla, el circuito está abierto o se agota el presupuesto. Antes se
+recortaba `raw_text` a `max_chars`, lo que solía cortar una frase a la mitad.
+Ahora, para un lote de textos:
+
+- Cada texto se parte en frases (respetando abreviaturas habituales).
+- Las palabras (sin stopwords ni tildes) de todas las frases del lote forman
+  una única matriz dispersa (arrays de NumPy: frase, término). El IDF se
+  calcula sobre las frases del lote.
+- Puntuación de una frase = suma de IDF x frecuencia del término en su texto,
+  sobre sus términos distintos, dividida por sqrt(nº de términos). Los
+  términos del título pesan el doble y la primera frase tiene un plus (en
+  noticias suele ser la entradilla).
+- Se eligen las mejores frases que quepan en `max_chars` (y puntúen al menos
+  la mitad que la mejor) y se devuelven en su orden original. Si no cabe
+  ninguna, se corta la mejor en un límite de palabra y se termina con "…".
+
+Los textos que ya caben en `max_chars` se devuelven tal cual (normalizados).
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+TITLE_WEIGHT = 2.0
+LEAD_BONUS = 1.2
+# Frases por debajo de esta fracción de la mejor no entran en el resumen
+MIN_RELATIVE_SCORE = 0.5
+ELLIPSIS = "…"
+
+_SPACES = re.compile(r"\s+")
+_WORD = re.compile(r"\w\w+")
+# Fin de frase: puntuación, cierres opcionales, espacio y comienzo de frase
+_BOUNDARY = re.compile(r"[.!?…]+[\"'»”’)\]]*\s+(?=[\"'«“‘(\[¿¡]?[A-ZÁÉÍÓÚÑÜ0-9])")
+_ABBREVIATIONS = {
+    "sr", "sra", "srta", "dr", "dra", "ud", "uds", "etc", "ej", "pág", "núm",
+    "mr", "mrs", "ms", "st", "vs", "no", "fig", "aprox", "approx", "e.g", "i.e",
+}
+_STOPWORDS = frozenset("""
+de la que el en y a los del se las por un para con no una su al lo como mas pero
+sus le ya o este si porque esta entre cuando muy sin sobre tambien me hasta hay
+donde quien desde todo nos durante todos uno les ni contra otros ese eso ante
+ellos e esto mi antes algunos que unos yo otro otras otra el tanto esa estos
+mucho quienes nada muchos cual poco ella estar estas algunas algo nosotros es
+son ha han fue ser era puede pueden tu te ti
+the of and to in is that for it as was with be by on not he this are or his
+from at which but have an they you were her she there been has their its we
+will would can if more do no so also into than them these then
+""".split())
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Frases de `text` (espacios normalizados)."""
+    text = _SPACES.sub(" ", text or "").strip()
+    if not text:
+        return []
+    sentences: List[str] = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        piece = text[start:match.end()].strip()
+        last_word = piece.rstrip(".!?…\"'»”’)] ").rsplit(" ", 1)[-1].lower()
+        if match.group().startswith(".") and (last_word in _ABBREVIATIONS or len(last_word) == 1):
+            continue  # "Dr. Pérez", "p. ej. Madrid": no es fin de frase
+        sentences.append(piece)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD.findall(_fold(text)) if w not in _STOPWORDS]
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars - len(ELLIPSIS)]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:-") + ELLIPSIS
+
+
+def _pick(sentences: List[str], scores: np.ndarray, max_chars: int) -> str:
+    chosen: List[int] = []
+    used = 0
+    floor = float(scores.max()) * MIN_RELATIVE_SCORE
+    for idx in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+        if scores[idx] < floor:
+            break
+        extra = len(sentences[idx]) + (1 if chosen else 0)
+        if used + extra <= max_chars:
+            chosen.append(idx)
+            used += extra
+    if not chosen:
+        return _truncate(sentences[int(scores.argmax())], max_chars)
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def summarize_batch(
+    texts: Sequence[str],
+    max_chars: int = 280,
+    titles: Optional[Sequence[str]] = None,
+) -> List[str]:
+    """Resumen extractivo de cada texto en como mucho `max_chars` caracteres."""
+    results: List[Optional[str]] = [None] * len(texts)
+    titles = titles or [""] * len(texts)
+
+    # Textos a puntuar: los que no caben tal cual
+    docs: List[int] = []
+    doc_sentences: List[List[str]] = []
+    for i, (text, title) in enumerate(zip(texts, titles)):
+        clean = _SPACES.sub(" ", text or "").strip()
+        if not clean:
+            results[i] = _truncate(_SPACES.sub(" ", title or "").strip(), max_chars)
+        elif len(clean) <= max_chars:
+            results[i] = clean
+        else:
+            docs.append(i)
+            doc_sentences.append(split_sentences(clean))
+    if not docs:
+        return results  # type: ignore[return-value]
+
+    import numpy as np
+
+    vocab: Dict[str, int] = {}
+    tok_ids: List[int] = []
+    sent_ids: List[int] = []
+    doc_of_sent: List[int] = []
+    in_title: List[bool] = []
+    sent = 0
+    for d, (i, sentences) in enumerate(zip(docs, doc_sentences)):
+        title_terms = set(_terms(titles[i] or ""))
+        for sentence in sentences:
+            for term in _terms(sentence):
+                tok_ids.append(vocab.setdefault(term, len(vocab)))
+                sent_ids.append(sent)
+                in_title.append(term in title_terms)
+            doc_of_sent.append(d)
+            sent += 1
+
+    n_sent = sent
+    n_vocab = max(len(vocab), 1)
+    tok = np.asarray(tok_ids, dtype=np.int64)
+    sid = np.asarray(sent_ids, dtype=np.int64)
+    sent_doc = np.asarray(doc_of_sent, dtype=np.int64)
+
+    # Pares (frase, término) distintos y frecuencia del término en su texto
+    pairs, first = np.unique(sid * n_vocab + tok, return_index=True)
+    pair_sent = pairs // n_vocab
+    pair_tok = pairs % n_vocab
+    df = np.bincount(pair_tok, minlength=n_vocab)
+    idf = np.log((n_sent + 1) / (df + 1)) + 1.0
+    doc_terms, doc_tf = np.unique(sent_doc[sid] * n_vocab + tok, return_counts=True)
+    tf = doc_tf[np.searchsorted(doc_terms, sent_doc[pair_sent] * n_vocab + pair_tok)]
+
+    title_boost = np.where(np.asarray(in_title, dtype=bool)[first], TITLE_WEIGHT, 1.0)
+    weight = idf[pair_tok] * tf * title_boost
+    n_terms = np.bincount(pair_sent, minlength=n_sent)
+    scores = np.bincount(pair_sent, weights=weight, minlength=n_sent) / np.sqrt(np.maximum(n_terms, 1))
+    # Plus de entradilla: primera frase de cada texto
+    lead = np.ones(n_sent, dtype=bool)
+    lead[1:] = sent_doc[1:] != sent_doc[:-1]
+    scores = np.where(lead, scores * LEAD_BONUS, scores)
+
+    offset = 0
+    for i, sentences in zip(docs, doc_sentences):
+        n = len(sentences)
+        results[i] = _pick(sentences, scores[offset:offset + n], max_chars)
+        offset += n
+    return results  # type: ignore[return-value]
+
+
+def summarize(text: str, max_chars: int = 280, title: str = "") -> str:
+    return summarize_batch([text], max_chars, [title])[0]
@@ -1,15 +1,25 @@
 # app/services/tips.py
 
-from typing import Optional, Tuple, List
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple, List, TYPE_CHECKING
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func, delete
 from sqlalchemy.exc import IntegrityError
-from fastapi import HTTPException, status
 from app.db.models import Tip, Topic, Delivery
-from app.schemas.tip import TipCreate, TipUpdate
+from app.services import near_dup
+from app.services.quality import score_tips
+from app.services.topic_catalog import get_topic
 import hashlib
 
+if TYPE_CHECKING:
+    # Solo para anotaciones: los jobs (ingest, digest) importan este módulo
+    # y no deben pagar el arranque de FastAPI/Pydantic.
+    from app.schemas.tip import TipCreate, TipUpdate
+
 def _validate_tip_status(status: str) -> str:
     allowed = {"draft", "published", "hidden"}
     if status not in allowed:
@@ -31,9 +41,7 @@ def _validate_tip_status(status: str) -> str:
 
 def ensure_topic_exists(db: Session, topic_id: int) -> None:
     """Ensure that a topic with the given ID exists, otherwise raise ValueError."""
-    topic = db.execute(select(Topic.id).where(
-        Topic.id == topic_id)).scalar_one_or_none()
-    if not topic:
+    if get_topic(db, topic_id) is None:
         raise ValueError("Topic not found")
 
 
@@ -66,21 +74,144 @@ def create_tip(db: Session, data: TipCreate) -> Tip:
     if exists:
         raise ValueError("Duplicated tip (fingerprint)")
 
+    # Check for near-duplicates in the same topic (LSH index)
+    status = _validate_tip_status(data.status)
+    sig = near_dup.signature(data.title, data.body)
+    similar = near_dup.find_near_duplicate(db, data.topic_id, sig)
+    if similar is not None:
+        if near_dup.ACTION != "flag":
+            raise ValueError(f"Near-duplicate tip (similar to tip {similar})")
+        status = "draft"
+
     # Create and persist new tip
     tip = Tip(
         topic_id=data.topic_id,
         title=data.title,
         body=data.body,
-        status=_validate_tip_status(data.status),
+        status=status,
         source_url=str(data.source_url) if data.source_url else None,
         fingerprint=fp,
+        minhash=near_dup.pack_signature(sig),
+        quality_score=score_tips([data.title], [data.body])[0],
     )
     db.add(tip)
+    db.flush()
+    near_dup.index_tips(db, [(tip.id, tip.topic_id, tip.minhash)])
     db.commit()
     db.refresh(tip)
     return tip
 
 
+# ------------------------------
+# Bulk insert (ingestion)
+# ------------------------------
+# Filas por sentencia: 100 filas x 9 columnas queda por debajo del límite
+# clásico de 999 parámetros de SQLite.
+BULK_CHUNK_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "100"))
+
+
+@dataclass
+class BulkInsertResult:
+    inserted: int = 0
+    duplicates: int = 0
+    near_duplicates: int = 0
+    # Casi duplicados guardados como draft (NEAR_DUP_ACTION=flag)
+    flagged: int = 0
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    chunk: List[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _insert_ignoring_duplicates(db: Session, rows: List[dict]):
+    """
+    INSERT ... ON CONFLICT (fingerprint) DO NOTHING RETURNING para
+    SQLite/PostgreSQL; devuelve solo las filas realmente insertadas.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:  # pragma: no cover - solo usamos SQLite y PostgreSQL
+        raise RuntimeError(f"Bulk insert not supported for dialect {dialect!r}")
+    stmt = (
+        insert(Tip).values(rows)
+        .on_conflict_do_nothing(index_elements=[Tip.fingerprint])
+        .returning(Tip.id, Tip.topic_id, Tip.minhash)
+    )
+    return db.execute(stmt).all()
+
+
+def existing_fingerprints(db: Session, fingerprints: Iterable[str]) -> Set[str]:
+    """Return the subset of fingerprints already stored (one IN query per chunk)."""
+    wanted = list(dict.fromkeys(fingerprints))
+    found: Set[str] = set()
+    for start in range(0, len(wanted), BULK_CHUNK_SIZE):
+        chunk = wanted[start:start + BULK_CHUNK_SIZE]
+        found.update(db.execute(
+            select(Tip.fingerprint).where(Tip.fingerprint.in_(chunk))
+        ).scalars())
+    return found
+
+
+def bulk_insert_tips(
+    db: Session, rows: Iterable[dict], chunk_size: Optional[int] = None
+) -> BulkInsertResult:
+    """
+    Insert tip rows (dicts with Tip column values, fingerprint required) in chunks.
+    Per chunk: one IN query drops known fingerprints, one LSH lookup drops (or
+    flags as draft) near-duplicates, one INSERT ... ON CONFLICT DO NOTHING on
+    uq_tip_fingerprint writes the rest and indexes them, then one commit.
+    """
+    result = BulkInsertResult()
+    # Memoria acotada al lote: los lotes anteriores ya están en BD (commit) y
+    # los descarta la consulta IN, así que `rows` puede ser un generador enorme.
+    for chunk in _chunks(rows, chunk_size or BULK_CHUNK_SIZE):
+        # Duplicados dentro del propio lote (mismo fingerprint dos veces en un feed)
+        fresh: Dict[str, dict] = {}
+        for row in chunk:
+            fresh.setdefault(row["fingerprint"], row)
+        for fp in existing_fingerprints(db, fresh):
+            del fresh[fp]
+        result.duplicates += len(chunk) - len(fresh)
+
+        candidates: List[dict] = []
+        # La firma puede venir ya calculada (p. ej. por los workers del backfill)
+        sigs = [
+            near_dup.unpack_signature(r["minhash"]) if r.get("minhash")
+            else near_dup.signature(r["title"], r["body"])
+            for r in fresh.values()
+        ]
+        matches = near_dup.find_near_duplicates(
+            db, [(r["topic_id"], sig) for r, sig in zip(fresh.values(), sigs)])
+        for row, sig, match in zip(fresh.values(), sigs, matches):
+            row = {**row, "minhash": near_dup.pack_signature(sig)}
+            row.setdefault("status", "published")
+            if match is not None:
+                result.near_duplicates += 1
+                if near_dup.ACTION != "flag":
+                    continue
+                row["status"] = "draft"
+                result.flagged += 1
+            candidates.append(row)
+        if not candidates:
+            continue
+
+        inserted = _insert_ignoring_duplicates(db, candidates)
+        near_dup.index_tips(db, inserted)
+        db.commit()
+        result.inserted += len(inserted)
+    return result
+
+
 # ------------------------------
 # Retrieve a tip by ID
 # ------------------------------
@@ -159,9 +290,12 @@ def update_tip(db: Session, tip: Tip, data: TipUpdate) -> Tip:
     for field, value in payload.items():
         setattr(tip, field, value)
 
-    # Recompute fingerprint if content changed
+    # Recompute fingerprint and near-duplicate signature if content changed
     if "title" in payload or "body" in payload:
         tip.fingerprint = make_fingerprint(tip.topic_id, tip.title, tip.body)
+        tip.minhash = near_dup.pack_signature(near_dup.signature(tip.title, tip.body))
+        near_dup.unindex_tip(db, tip.id)
+        near_dup.index_tips(db, [(tip.id, tip.topic_id, tip.minhash)])
 
     db.add(tip)
     db.commit()
@@ -174,6 +308,7 @@ def update_tip(db: Session, tip: Tip, data: TipUpdate) -> Tip:
 # ------------------------------
 def hard_delete_tip(db: Session, tip_id: int) -> None:
     """Permanently delete a tip from the database."""
+    near_dup.unindex_tip(db, tip_id)
     db.execute(delete(Tip).where(Tip.id == tip_id))
     db.commit()
 
@@ -303,6 +438,8 @@ def mark_delivery_read(
     - Idempotent: repeated calls do not change the result.
     - Returns the same enriched structure as in the history response.
     """
+    from fastapi import HTTPException, status
+
     # 1) Retrieve the delivery belonging to the user
     delivery = db.execute(
         select(Delivery).where(
@@ -0,0 +1,144 @@
+"""
+Catálogo de topics en memoria: snapshot inmutable (id → name/slug/is_active)
+con número de versión.
+
+Los topics cambian muy poco, así que rutas y servicios leen de este snapshot
+en vez de consultar la tabla `topics` en cada llamada. Cada escritura de topics
+incrementa la fila "topics" de `catalog_versions` en la misma transacción; el
+resto de workers lo detectan con un SELECT de una sola fila como mucho cada
+TOPIC_CATALOG_POLL_SECONDS y recargan el snapshot completo.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import CatalogVersion, Topic
+
+CATALOG_NAME = "topics"
+
+# Intervalo mínimo entre dos consultas de versión en un mismo proceso.
+POLL_SECONDS = float(os.getenv("TOPIC_CATALOG_POLL_SECONDS", "2"))
+
+
+@dataclass(frozen=True)
+class TopicEntry:
+    id: int
+    name: str
+    slug: str
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class TopicCatalog:
+    version: int
+    entries: Tuple[TopicEntry, ...]  # ordenados por id
+    by_id: Mapping[int, TopicEntry]
+    by_slug: Mapping[str, TopicEntry]
+
+
+_lock = threading.Lock()
+_snapshot: Optional[TopicCatalog] = None
+_checked_at = 0.0
+
+
+def _read_version(db: Session) -> int:
+    version = db.execute(
+        select(CatalogVersion.version).where(
+            CatalogVersion.name == CATALOG_NAME)
+    ).scalar_one_or_none()
+    return int(version or 0)
+
+
+def _load_catalog(db: Session, version: int) -> TopicCatalog:
+    rows = db.execute(
+        select(Topic.id, Topic.name, Topic.slug, Topic.is_active)
+        .order_by(Topic.id.asc())
+    ).all()
+    entries = tuple(
+        TopicEntry(id=r.id, name=r.name, slug=r.slug,
+                   is_active=bool(r.is_active))
+        for r in rows
+    )
+    return TopicCatalog(
+        version=version,
+        entries=entries,
+        by_id=MappingProxyType({e.id: e for e in entries}),
+        by_slug=MappingProxyType({e.slug: e for e in entries}),
+    )
+
+
+def get_topic_catalog(db: Session, force_check: bool = False) -> TopicCatalog:
+    """
+    Devuelve el snapshot vigente. Solo consulta la versión en BD si han pasado
+    POLL_SECONDS desde la última comprobación (o si force_check=True), y solo
+    recarga los topics cuando la versión ha cambiado.
+    """
+    global _snapshot, _checked_at
+
+    snapshot = _snapshot
+    if (
+        snapshot is not None
+        and not force_check
+        and time.monotonic() - _checked_at < POLL_SECONDS
+    ):
+        return snapshot
+
+    with _lock:
+        version = _read_version(db)
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = _load_catalog(db, version)
+        _checked_at = time.monotonic()
+        return _snapshot
+
+
+def get_topic(db: Session, topic_id: int) -> Optional[TopicEntry]:
+    """Topic por id; ante un fallo, vuelve a comprobar la versión una vez."""
+    entry = get_topic_catalog(db).by_id.get(topic_id)
+    if entry is None:
+        entry = get_topic_catalog(db, force_check=True).by_id.get(topic_id)
+    return entry
+
+
+def get_topic_by_slug(db: Session, slug: str) -> Optional[TopicEntry]:
+    """Topic por slug; ante un fallo, vuelve a comprobar la versión una vez."""
+    entry = get_topic_catalog(db).by_slug.get(slug)
+    if entry is None:
+        entry = get_topic_catalog(db, force_check=True).by_slug.get(slug)
+    return entry
+
+
+def invalidate_topic_catalog() -> None:
+    """Descarta el snapshot local; la siguiente lectura lo recarga."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def bump_topic_catalog_version(db: Session) -> None:
+    """Incrementa la versión dentro de la transacción en curso (sin commit)."""
+    result = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.name == CATALOG_NAME)
+        .values(version=CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(CatalogVersion(name=CATALOG_NAME, version=1))
+
+
+def commit_topic_changes(db: Session) -> None:
+    """
+    Confirma cambios pendientes sobre topics junto con el incremento de versión
+    e invalida el snapshot local. Propaga IntegrityError como db.commit().
+    """
+    bump_topic_catalog_version(db)
+    db.commit()
+    invalidate_topic_catalog()
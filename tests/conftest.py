@@ -1,7 +1,11 @@
 import os
 import pathlib
 import shutil
+import threading
 import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
 import pytest
 from app.main import app
 from app.db.models import Base
@@ -70,6 +74,105 @@ def client():
         yield c
 
 
+# ------------------------------
+# Local HTTP fixture server
+# ------------------------------
+class FixtureHTTPServer:
+    """
+    Local HTTP server (127.0.0.1, random port) for network-facing services.
+    Routes are registered with server.route(path, handler); the handler gets
+    the request (with .path, .headers and .body) and returns
+    (status, headers, body). Requests per path are counted in server.hits.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = Counter()
+        fixture = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.body = self.rfile.read(length) if length else b""
+                path = urlsplit(self.path).path
+                fixture.hits[path] += 1
+                handler = fixture.routes.get(path)
+                if handler is None:
+                    status, headers, body = 404, {}, b"not found"
+                else:
+                    status, headers, body = handler(self)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_HEAD = _dispatch
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def route(self, path, handler):
+        self.routes[path] = handler
+
+
+@pytest.fixture
+def http_server():
+    """Provides a running FixtureHTTPServer, shut down after the test."""
+    server = FixtureHTTPServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+@pytest.fixture
+def smtp_sink():
+    """Provides a running local SMTP sink (app.scripts.smtp_sink), stopped after the test."""
+    from app.scripts.smtp_sink import SmtpSink
+
+    sink = SmtpSink(keep_messages=True).start()
+    yield sink
+    sink.stop()
+
+
+@pytest.fixture
+def make_rss():
+    """
+    Builds a small RSS 2.0 document. Each item is a dict with title, and
+    optionally description, link, guid and pubDate.
+    """
+    from xml.sax.saxutils import escape
+
+    def _build(items):
+        parts = ['<?xml version="1.0" encoding="utf-8"?>',
+                 "<rss version=\"2.0\"><channel><title>Fixture</title>"]
+        for item in items:
+            parts.append("<item>")
+            for key in ("title", "description", "link", "guid", "pubDate"):
+                if item.get(key) is not None:
+                    parts.append(f"<{key}>{escape(str(item[key]))}</{key}>")
+            parts.append("</item>")
+        parts.append("</channel></rss>")
+        return "".join(parts).encode("utf-8")
+
+    return _build
+
+
 # ==============================
 # Helper functions
 # ==============================
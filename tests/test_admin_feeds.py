@@ -0,0 +1,61 @@
+def test_admin_feed_crud(client, admin_headers):
+    r_topic = client.post(
+        "/topics",
+        headers=admin_headers,
+        json={"name": "Feeds Topic", "slug": "feeds-topic", "is_active": True},
+    )
+    assert r_topic.status_code in (200, 201), r_topic.text
+    topic_id = r_topic.json()["id"]
+
+    r = client.post(
+        "/admin/feeds",
+        headers=admin_headers,
+        json={"topic_id": topic_id, "url": "https://example.com/feeds-topic.xml"},
+    )
+    assert r.status_code == 201, r.text
+    feed = r.json()
+    assert feed["is_active"] is True and feed["poll_interval_minutes"] == 360
+
+    dup = client.post(
+        "/admin/feeds",
+        headers=admin_headers,
+        json={"topic_id": topic_id, "url": "https://example.com/feeds-topic.xml"},
+    )
+    assert dup.status_code == 409
+
+    bad_topic = client.post(
+        "/admin/feeds",
+        headers=admin_headers,
+        json={"topic_id": 999999, "url": "https://example.com/other.xml"},
+    )
+    assert bad_topic.status_code == 400
+
+    r = client.patch(
+        f"/admin/feeds/{feed['id']}",
+        headers=admin_headers,
+        json={"is_active": False, "poll_interval_minutes": 60},
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["is_active"] is False and r.json()["poll_interval_minutes"] == 60
+
+    r = client.get(f"/admin/feeds?topic_id={topic_id}", headers=admin_headers)
+    assert r.status_code == 200 and r.json()["total"] == 1
+
+    assert client.delete(f"/admin/feeds/{feed['id']}", headers=admin_headers).status_code == 204
+    assert client.get(f"/admin/feeds/{feed['id']}", headers=admin_headers).status_code == 404
+    r = client.get(f"/admin/feeds?topic_id={topic_id}", headers=admin_headers)
+    assert r.status_code == 200 and r.json()["total"] == 0
+
+    # La URL borrada se puede volver a dar de alta
+    r = client.post(
+        "/admin/feeds",
+        headers=admin_headers,
+        json={"topic_id": topic_id, "url": "https://example.com/feeds-topic.xml"},
+    )
+    assert r.status_code == 201, r.text
+    assert r.json()["is_active"] is True
+
+
+def test_feed_admin_requires_admin(client, user_headers):
+    r = client.get("/admin/feeds", headers=user_headers)
+    assert r.status_code in (401, 403)
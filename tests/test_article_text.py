@@ -0,0 +1,157 @@
+"""Fallback de primer párrafo HTML contra un servidor HTTP local."""
+
+import threading
+import time
+
+from app.db.models import Tip, Topic
+from app.db.session import SessionLocal
+from app.services import article_text, ingest
+from app.services.article_text import (
+    ArticleCache,
+    extract_first_paragraph,
+    fetch_first_paragraph,
+    fetch_first_paragraphs,
+)
+from app.services.feed_fetch import FetchResult
+from app.services.tips import make_fingerprint
+from app.services.topic_catalog import commit_topic_changes
+
+PARAGRAPH = "Beber agua a lo largo del día ayuda a mantener la concentración."
+ARTICLE = (
+    "<html><head><title>T</title><script>var p = '<p>no es esto</p>';</script></head>"
+    "<body><nav><p>Inicio | Noticias | Contacto y mucho más menú de navegación</p></nav>"
+    "<p>Corto.</p>"
+    f"<article><p>{PARAGRAPH.replace('á', '&aacute;')}</p><p>Segundo párrafo.</p></article>"
+    "</body></html>"
+).encode("utf-8")
+
+
+def test_extractor_skips_boilerplate_and_stops_early():
+    consumed = []
+
+    def chunks():
+        for i in range(0, len(ARTICLE), 16):
+            consumed.append(i)
+            yield ARTICLE[i:i + 16]
+        for _ in range(1000):  # cola enorme que nunca debería leerse
+            consumed.append(None)
+            yield b"<p>" + b"x" * 100 + b"</p>"
+
+    assert extract_first_paragraph(chunks()) == PARAGRAPH
+    assert None not in consumed
+
+
+def test_extractor_handles_split_multibyte_and_unclosed_paragraph():
+    html = f"<p>{PARAGRAPH}".encode("utf-8")
+    chunks = [html[i:i + 1] for i in range(len(html))]
+    assert extract_first_paragraph(chunks) == PARAGRAPH
+    assert extract_first_paragraph([b"<p>demasiado corto</p>"]) is None
+
+
+def test_cache_avoids_refetch_and_revalidates_with_etag(http_server, tmp_path):
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"a1"':
+            return 304, {"ETag": '"a1"'}, b""
+        return 200, {"ETag": '"a1"', "Content-Type": "text/html; charset=utf-8"}, ARTICLE
+
+    http_server.route("/articulo", handler)
+    url = http_server.url("/articulo")
+    cache = ArticleCache(tmp_path)
+
+    assert fetch_first_paragraph(url, cache) == PARAGRAPH
+    assert fetch_first_paragraph(url, ArticleCache(tmp_path)) == PARAGRAPH
+    assert http_server.hits["/articulo"] == 1  # segunda vez: de disco
+
+    stale = ArticleCache(tmp_path, ttl_hours=0)
+    assert fetch_first_paragraph(url, stale) == PARAGRAPH
+    assert http_server.hits["/articulo"] == 2 and stale.revalidated == 1
+
+
+def test_cache_drops_stale_blobs_and_stays_under_max_bytes(tmp_path):
+    cache = ArticleCache(tmp_path)
+    cache.put("https://example.com/a", '"v1"', PARAGRAPH)
+    cache.put("https://example.com/a", '"v2"', PARAGRAPH + " Editado.")
+    blobs = [p for p in (tmp_path / "blobs").rglob("*") if p.is_file()]
+    assert [p.name for p in blobs] == [ArticleCache.key("https://example.com/a", '"v2"')]
+    assert cache.get("https://example.com/a").paragraph == PARAGRAPH + " Editado."
+
+    small = ArticleCache(tmp_path / "small", max_bytes=2000)
+    urls = [f"https://example.com/p/{i}" for i in range(40)]
+    for url in urls:
+        small.put(url, None, PARAGRAPH)
+    on_disk = sum(p.stat().st_size for p in (tmp_path / "small").rglob("*") if p.is_file())
+    assert small.evictions > 0 and on_disk <= 2000
+    assert small.get(urls[-1]).paragraph == PARAGRAPH  # se desaloja lo más antiguo
+    assert small.get(urls[0]) is None
+
+
+def test_fetches_are_bounded(http_server, tmp_path):
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def handler(request):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.1)
+        with lock:
+            in_flight["now"] -= 1
+        return 200, {}, ARTICLE
+
+    urls = []
+    for i in range(8):
+        http_server.route(f"/a/{i}", handler)
+        urls.append(http_server.url(f"/a/{i}"))
+    urls.append(http_server.url("/no-existe"))
+
+    result = fetch_first_paragraphs(urls, ArticleCache(tmp_path),
+                                    max_concurrency=3, per_host_limit=3)
+    assert [result[u] for u in urls[:-1]] == [PARAGRAPH] * 8
+    assert result[urls[-1]] is None
+    assert in_flight["max"] <= 3
+
+
+def test_ingest_uses_first_paragraph_when_summary_is_missing(
+        http_server, make_rss, monkeypatch, tmp_path):
+    monkeypatch.setattr(article_text, "CACHE_DIR", str(tmp_path))
+    http_server.route("/nota", lambda request: (200, {}, ARTICLE))
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Articulos", slug="ingest-articulos", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        content = make_rss([
+            {"title": "Hidratación y foco", "link": http_server.url("/nota")},
+            {"title": "Sin enlace"},
+        ])
+        result = FetchResult(url="fixture://articulos", status=200, content=content)
+        assert ingest.ingest_fetch_result(db, topic, result) == 2
+
+        tips = {t.title: t for t in db.query(Tip).filter(Tip.topic_id == topic.id)}
+        assert {title: t.body for title, t in tips.items()} == \
+            {"Hidratación y foco": PARAGRAPH, "Sin enlace": "Sin enlace"}
+        # El fingerprint es el de la entrada del feed, no el del párrafo descargado
+        assert tips["Hidratación y foco"].fingerprint == make_fingerprint(
+            topic.id, "Hidratación y foco", "Hidratación y foco")
+    finally:
+        db.close()
+
+
+def test_known_entries_do_not_refetch_the_article(http_server, make_rss, monkeypatch, tmp_path):
+    monkeypatch.setattr(article_text, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(article_text, "CACHE_TTL_HOURS", 0)  # sin caché: cada descarga se nota
+    http_server.route("/repetida", lambda request: (200, {}, ARTICLE))
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Repetidas", slug="ingest-repetidas", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        content = make_rss([{"title": "Sin resumen otra vez", "link": http_server.url("/repetida")}])
+        result = FetchResult(url="fixture://repetidas", status=200, content=content)
+        assert ingest.ingest_fetch_result(db, topic, result) == 1
+        assert ingest.ingest_fetch_result(db, topic, result) == 0
+        assert http_server.hits["/repetida"] == 1
+    finally:
+        db.close()
@@ -0,0 +1,83 @@
+"""Backfill offline desde un directorio de volcados."""
+
+import json
+import queue
+import time
+
+import pytest
+
+from app.db.models import Tip, Topic
+from app.db.session import SessionLocal
+from app.services import backfill
+from app.services.backfill import MANIFEST_NAME, discover_files, parse_file, run_backfill
+from app.services.topic_catalog import commit_topic_changes
+
+
+def _items(prefix, n):
+    return [{"title": f"{prefix} consejo {i}",
+             "description": f"{prefix}: texto de archivo número {i}, detalle {i * 17}."}
+            for i in range(n)]
+
+
+def test_backfill_is_parallel_and_resumable(tmp_path, make_rss):
+    (tmp_path / "a.xml").write_bytes(make_rss(_items("Enero", 5)))
+    (tmp_path / "b.rss").write_bytes(make_rss(_items("Febrero", 4)))
+    (tmp_path / "roto.xml").write_bytes(b"<rss><channel><item>")
+    sub = tmp_path / "bundle"
+    sub.mkdir()
+    (sub / "marzo.data").write_bytes(make_rss(_items("Marzo", 3)))
+    (tmp_path / "bundle.opml").write_text(
+        '<opml version="2.0"><body>'
+        '<outline text="Marzo" xmlUrl="bundle/marzo.data"/>'
+        '<outline text="Remoto" xmlUrl="https://example.com/feed.xml"/>'
+        "</body></opml>"
+    )
+    assert len(discover_files(tmp_path)) == 4
+
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Backfill", slug="backfill-offline", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        stats = run_backfill(db, topic.id, tmp_path, workers=2)
+        assert (stats.files, stats.files_failed, stats.tips) == (3, 1, 12)
+        assert stats.tips_per_second > 0
+        manifest = [json.loads(line) for line in
+                    (tmp_path / MANIFEST_NAME).read_text().splitlines()]
+        assert len(manifest) == 3
+
+        # Reanudación: lo anotado se salta y solo se procesa lo nuevo
+        (tmp_path / "c.xml").write_bytes(make_rss(_items("Abril", 2)))
+        stats = run_backfill(db, topic.id, tmp_path, workers=2)
+        assert (stats.files, stats.files_skipped, stats.tips) == (1, 3, 2)
+
+        assert db.query(Tip).filter(Tip.topic_id == topic.id).count() == 14
+    finally:
+        db.close()
+
+
+def test_parse_file_sends_bounded_chunks(tmp_path, make_rss):
+    path = tmp_path / "grande.xml"
+    path.write_bytes(make_rss(_items("Mayo", 5)))
+    out = queue.Queue()
+    parse_file(str(path), 1, out, chunk_rows=2)
+
+    messages = [out.get_nowait() for _ in range(out.qsize())]
+    assert [kind for kind, _, _ in messages] == ["rows", "rows", "rows", "done"]
+    assert [len(rows) for kind, _, rows in messages if kind == "rows"] == [2, 2, 1]
+    assert messages[-1][2] == (5, None)
+
+
+def test_writer_failure_stops_the_workers(tmp_path, make_rss, monkeypatch):
+    for i in range(6):
+        (tmp_path / f"f{i}.xml").write_bytes(make_rss(_items(f"Lote {i}", 300)))
+
+    def broken(db, rows, chunk_size=None):
+        raise RuntimeError("BD caída")
+
+    monkeypatch.setattr(backfill, "bulk_insert_tips", broken)
+    started = time.perf_counter()
+    with pytest.raises(RuntimeError, match="BD caída"):
+        run_backfill(None, 1, tmp_path, workers=2, chunk_rows=10)
+    assert time.perf_counter() - started < 30
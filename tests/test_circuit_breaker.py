@@ -0,0 +1,106 @@
+"""Circuit breaker y presupuesto de tiempo del generador de tips."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import generate, generation_cache
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.services.generate import TipRequest, generate_tip_bodies, generation_run
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_on_failures_then_probes_and_closes():
+    clock = FakeClock()
+    changes = []
+    breaker = CircuitBreaker("test", window=10, min_calls=4, failure_ratio=0.5,
+                             open_seconds=30, clock=clock)
+    breaker.listeners.append(lambda old, new: changes.append((old, new)))
+
+    for ok in (True, False, True):
+        assert breaker.allow()
+        breaker.record(ok)
+    assert breaker.state == CLOSED  # aún por debajo de min_calls
+    breaker.allow()
+    breaker.record(False)  # 2 de 4 malas
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now = 31
+    assert breaker.allow()  # la prueba de half_open
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # solo una prueba a la vez
+    breaker.record(False)
+    assert breaker.state == OPEN
+
+    clock.now = 62
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert changes == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, OPEN),
+                       (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)]
+    assert breaker.transitions["closed->open"] == 1
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker("test", window=4, min_calls=2, failure_ratio=1.0,
+                             slow_seconds=1.0, clock=FakeClock())
+    breaker.record(True, elapsed=0.2)
+    breaker.record(True, elapsed=5.0)
+    assert breaker.state == CLOSED
+    breaker.record(True, elapsed=5.0)
+    breaker.record(True, elapsed=5.0)
+    breaker.record(True, elapsed=5.0)
+    assert breaker.state == OPEN
+
+
+@pytest.fixture
+def slow_client(monkeypatch):
+    """Cliente falso: cada petición tarda `delay` y falla si así se indica."""
+    behaviour = {"delay": 0.0, "fail": False, "calls": 0}
+
+    def create(**kwargs):
+        behaviour["calls"] += 1
+        time.sleep(min(behaviour["delay"], kwargs["timeout"]))
+        if behaviour["fail"] or behaviour["delay"] > kwargs["timeout"]:
+            raise TimeoutError("upstream timeout")
+        message = SimpleNamespace(content="Tip generado")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(generate, "_get_client", lambda: client)
+    monkeypatch.setattr(generation_cache, "ENABLED", False)
+    monkeypatch.setattr(generate, "_breaker", CircuitBreaker(
+        "test", window=10, min_calls=3, failure_ratio=0.5, open_seconds=60))
+    generate._breaker.listeners.append(generate._on_breaker_change)
+    return behaviour
+
+
+def test_open_breaker_skips_the_model(slow_client):
+    slow_client["fail"] = True
+    items = [TipRequest(f"T{i}", f"texto {i}", "futbol") for i in range(20)]
+    with generation_run() as run:
+        bodies = generate_tip_bodies(items, max_concurrency=1)
+    assert bodies == [f"texto {i}" for i in range(20)]
+    assert slow_client["calls"] == 3  # se abre tras min_calls fallos
+    assert run.breaker_opens == 1 and run.skipped_open == 17
+    assert run.fallbacks == 20 and generate.get_breaker().state == OPEN
+
+
+def test_run_budget_caps_total_time(slow_client):
+    slow_client["delay"] = 0.2
+    items = [TipRequest(f"T{i}", f"texto {i}", "futbol") for i in range(10)]
+    started = time.perf_counter()
+    with generation_run(budget_seconds=0.5) as run:
+        bodies = generate_tip_bodies(items, max_concurrency=1)
+    assert time.perf_counter() - started < 1.0  # sin presupuesto serían 2 s
+    assert bodies[0] == "Tip generado" and bodies[-1] == "texto 9"
+    assert run.skipped_budget >= 6 and run.requests + run.skipped_budget == 10
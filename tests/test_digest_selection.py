@@ -0,0 +1,116 @@
+"""Selección del digest por lotes: mismo resultado que pick_daily_bundle, sin N+1."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.db.models import Delivery, Subscription, Tip, Topic, User
+from app.db.session import SessionLocal, engine
+from app.services.plan_policy import apply_plan_policy, plan_topics
+from app.services.selector import (
+    BundleRequest,
+    DailyBundleSelector,
+    get_subscribed_topics_for_users,
+    pick_daily_bundle,
+)
+from app.services.tips import make_fingerprint
+from app.services.topic_catalog import commit_topic_changes
+
+
+def _seed(db):
+    topics = [Topic(name=f"Sel {i}", slug=f"digest-sel-{i}", is_active=True) for i in range(4)]
+    db.add_all(topics)
+    commit_topic_changes(db)
+
+    base = datetime(2026, 1, 1)
+    tips = []
+    for t_idx, topic in enumerate(topics):
+        for i in range(3 + t_idx):
+            status = "draft" if i == 1 else "published"
+            tip = Tip(topic_id=topic.id, title=f"{topic.slug} {i}", body="b", status=status,
+                      created_at=base + timedelta(hours=i % 2),  # empates en created_at
+                      fingerprint=make_fingerprint(topic.id, f"{topic.slug} {i}", "b"))
+            tips.append(tip)
+    db.add_all(tips)
+
+    users = []
+    for u in range(8):
+        user = User(email=f"digest-sel-{u}@example.com", hashed_password="x",
+                    is_admin=u % 3 == 0, email_digest_enabled=True,
+                    iana_timezone="America/New_York" if u % 2 else None)
+        for t_idx, topic in enumerate(topics):
+            if (u + t_idx) % 4 != 3:
+                user.subscriptions.append(Subscription(topic_id=topic.id, is_active=bool(u != 5 or t_idx)))
+        users.append(user)
+    db.add_all(users)
+    db.commit()
+
+    # Entregas previas: algunos usuarios ya vieron todos los tips de un tema
+    published = [t for t in tips if t.status == "published"]
+    for u, user in enumerate(users):
+        for tip in published[: u * 2]:
+            db.add(Delivery(user_id=user.id, tip_id=tip.id))
+    db.commit()
+    return users
+
+
+def test_bulk_selection_matches_pick_daily_bundle():
+    db = SessionLocal()
+    try:
+        users = _seed(db)
+        subscribed = get_subscribed_topics_for_users(db, [u.id for u in users])
+        for per_topic in (1, 2, 5):
+            requests, expected = [], {}
+            for user in users:
+                tz = user.iana_timezone or "Europe/Madrid"
+                topics, per_eff = plan_topics(user, subscribed[user.id], per_topic)
+                assert (topics, per_eff) == apply_plan_policy(db, user, per_topic)
+                requests.append(BundleRequest(user.id, topics, per_eff, tz))
+                expected[user.id] = pick_daily_bundle(
+                    db, user.id, per_topic=per_eff, strategy="latest", tz_name=tz,
+                    topics_override=topics)
+
+            got = DailyBundleSelector(db).pick(requests)
+            for user in users:
+                assert [(t.id, [tip.id for tip in tips]) for t, tips in got[user.id]] == \
+                    [(t.id, [tip.id for tip in tips]) for t, tips in expected[user.id]]
+    finally:
+        db.close()
+
+
+def test_bulk_selection_query_count_is_constant():
+    db = SessionLocal()
+    statements = []
+
+    def _count(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    try:
+        topic = Topic(name="Sel N", slug="digest-sel-n", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+        db.add_all([Tip(topic_id=topic.id, title=f"n{i}", body="b", status="published",
+                        fingerprint=make_fingerprint(topic.id, f"n{i}", "b")) for i in range(5)])
+        users = [User(email=f"digest-sel-n{u}@example.com", hashed_password="x") for u in range(40)]
+        for user in users:
+            user.subscriptions.append(Subscription(topic_id=topic.id))
+        db.add_all(users)
+        db.commit()
+        user_ids = [u.id for u in users]
+        db.expire_all()
+        get_subscribed_topics_for_users(db, user_ids[:1])  # catálogo de topics ya en memoria
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            subscribed = get_subscribed_topics_for_users(db, user_ids)
+            bundles = DailyBundleSelector(db).pick(
+                [BundleRequest(uid, subscribed[uid]) for uid in user_ids])
+            names = {tip.topic.name for b in bundles.values() for _, tips in b for tip in tips}
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+
+        assert names == {"Sel N"}
+        # suscripciones + tips del tema + entregas + tips elegidos + sus topics
+        assert len(statements) <= 5
+    finally:
+        db.close()
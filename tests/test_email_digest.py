@@ -1,10 +1,21 @@
 """Tests del digest por email (sin SMTP real)."""
 
+import time
 from datetime import date
 from unittest.mock import patch
 
+from app.db.models import Subscription, Tip, Topic, User
 from app.db.session import SessionLocal
-from app.services.email_digest import send_daily_email_digests, run_email_digest
+from app.services import mail
+from app.services.email_digest import (
+    DigestMessage,
+    deliver_messages,
+    run_email_digest,
+    send_daily_email_digests,
+)
+from app.services.mail import SmtpSettings, SmtpTransport
+from app.services.tips import make_fingerprint
+from app.services.topic_catalog import commit_topic_changes
 
 
 def test_send_digest_skips_without_smtp():
@@ -27,3 +38,82 @@ def test_run_email_digest_prints_when_no_smtp(capsys):
         assert "SMTP" in out or "omit" in out.lower()
     finally:
         db.close()
+
+
+# ------------------------------
+# Producer/consumer pipeline against a local SMTP sink
+# ------------------------------
+def _transport(sink, pool_size=4):
+    return SmtpTransport(SmtpSettings(host=sink.host, port=sink.port, from_addr="tips@example.com",
+                                      use_tls=False, timeout=5, pool_size=pool_size))
+
+
+def _messages(n):
+    return [DigestMessage(i, f"u{i}@example.com", "Subject: hola\r\n\r\nHola") for i in range(n)]
+
+
+def _timed_delivery(sink, workers, n=16, rate=0.0):
+    transport = _transport(sink, pool_size=workers)
+    started = time.perf_counter()
+    stats = deliver_messages(_messages(n), transport, workers=workers, rate_per_second=rate,
+                             queue_size=4)
+    elapsed = time.perf_counter() - started
+    transport.close()
+    assert stats.sent == n and stats.failed == 0
+    return elapsed
+
+
+def test_delivery_scales_with_workers_up_to_rate_limit(smtp_sink):
+    smtp_sink.latency = 0.05
+    one = _timed_delivery(smtp_sink, workers=1)
+    four = _timed_delivery(smtp_sink, workers=4)
+    assert one >= 16 * 0.05
+    assert four < one / 2.5  # ~4x con 4 hilos
+
+    # Con límite de 20 msg/s, 4 hilos no bajan de ~(16-1)/20 s
+    limited = _timed_delivery(smtp_sink, workers=4, rate=20)
+    assert limited >= 0.7
+
+
+def test_delivery_isolates_failures_per_user(smtp_sink):
+    class Flaky(SmtpTransport):
+        def send_message(self, to, message):
+            if to == "u3@example.com":
+                raise RuntimeError("boom")
+            super().send_message(to, message)
+
+    transport = Flaky(_transport(smtp_sink).settings)
+    stats = deliver_messages(_messages(8), transport, workers=3)
+    transport.close()
+    assert (stats.sent, stats.failed) == (7, 1)
+    assert smtp_sink.messages == 7
+
+
+def test_send_daily_email_digests_end_to_end(smtp_sink, monkeypatch):
+    monkeypatch.setenv("SMTP_HOST", smtp_sink.host)
+    monkeypatch.setenv("SMTP_PORT", str(smtp_sink.port))
+    monkeypatch.setenv("SMTP_FROM", "tips@example.com")
+    monkeypatch.setenv("SMTP_USE_TLS", "0")
+    monkeypatch.setattr("app.services.email_digest.EMAIL_USER_CHUNK", 2)  # varios lotes
+    mail.close_transport()
+
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Digest", slug="digest-pipeline", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+        db.add(Tip(topic_id=topic.id, title="Respira", body="Respira hondo tres veces.",
+                   status="published", fingerprint=make_fingerprint(topic.id, "Respira", "r")))
+        emails = [f"digest-pipeline-{i}@example.com" for i in range(3)]
+        for address in emails:
+            user = User(email=address, hashed_password="x", email_digest_enabled=True)
+            user.subscriptions.append(Subscription(topic_id=topic.id))
+            db.add(user)
+        db.commit()
+
+        n = run_email_digest(db, target_date=date.today())
+    finally:
+        db.close()
+    recipients = {rcpts[0].strip("<>") for _, rcpts, _ in smtp_sink.received}
+    assert set(emails) <= recipients and n == len(smtp_sink.received)
+    assert smtp_sink.connections <= 4
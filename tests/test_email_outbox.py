@@ -0,0 +1,168 @@
+"""Bandeja de salida del digest: reclamo con lease, reintentos y ejecuciones reanudables."""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.db.models import EmailOutbox, Subscription, Tip, Topic, User
+from app.db.session import SessionLocal
+from app.services import email_outbox
+from app.services.email_digest import send_daily_email_digests
+from app.services.email_outbox import (
+    STATUS_FAILED,
+    STATUS_PENDING,
+    STATUS_SENT,
+    claim_batch,
+    enqueue,
+    outbox_counts,
+    record_results,
+)
+from app.services.mail import SmtpSettings, SmtpTransport
+from app.services.selector import DailyBundleSelector
+from app.services.tips import make_fingerprint
+from app.services.topic_catalog import commit_topic_changes
+
+
+def _users(db, prefix, n, topic_id=None):
+    users = []
+    for i in range(n):
+        user = User(email=f"{prefix}-{i}@example.com", hashed_password="x",
+                    email_digest_enabled=topic_id is not None)
+        if topic_id is not None:
+            user.subscriptions.append(Subscription(topic_id=topic_id))
+        users.append(user)
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def test_claim_lease_and_backoff(monkeypatch):
+    monkeypatch.setattr(email_outbox, "EMAIL_MAX_ATTEMPTS", 2)
+    day = date(2026, 2, 1)
+    db = SessionLocal()
+    try:
+        users = _users(db, "outbox-claim", 3)
+        rows = [{"user_id": u.id, "digest_date": day, "email": u.email, "payload": "Subject: x\n\nx"}
+                for u in users]
+        now = datetime(2026, 2, 1, 8, 0)
+        assert enqueue(db, rows, now=now) == 3
+        assert enqueue(db, rows[:1], now=now) == 0  # idempotente por (usuario, día)
+        db.commit()
+
+        first = claim_batch(db, day, limit=2, lease_seconds=60, now=now)
+        second = claim_batch(db, day, limit=2, lease_seconds=600, now=now)
+        assert [c.user_id for c in first] == [users[0].id, users[1].id]
+        assert [c.user_id for c in second] == [users[2].id]
+        assert claim_batch(db, day, now=now) == []
+
+        # El proceso que tenía `first` murió: al vencer el lease se reclaman
+        retaken = claim_batch(db, day, now=now + timedelta(seconds=61))
+        assert [c.id for c in retaken] == [c.id for c in first]
+        assert all(c.attempts == 2 for c in retaken)
+
+        record_results(db, [second[0].id], [(retaken[0], "boom"), (retaken[1], "boom")], now=now)
+        assert outbox_counts(db, day) == {STATUS_SENT: 1, STATUS_FAILED: 2}
+
+        assert claim_batch(db, day, now=now + timedelta(days=1)) == []
+
+        # Un fallo con intentos restantes vuelve a pending con backoff
+        db.execute(update(EmailOutbox).where(EmailOutbox.id == retaken[0].id)
+                   .values(status=STATUS_PENDING, attempts=0, next_attempt_at=now))
+        db.commit()
+        retry = claim_batch(db, day, now=now)
+        record_results(db, [], [(retry[0], "temporal")], now=now)
+        row = db.get(EmailOutbox, retry[0].id)
+        db.refresh(row)
+        assert row.status == STATUS_PENDING and row.last_error == "temporal"
+        assert row.next_attempt_at == now + timedelta(seconds=email_outbox.EMAIL_RETRY_BASE_SECONDS)
+    finally:
+        db.close()
+
+
+def test_rerun_sends_only_the_remainder(smtp_sink, monkeypatch):
+    monkeypatch.setenv("SMTP_HOST", smtp_sink.host)
+    day = date(2026, 2, 2)
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Outbox", slug="email-outbox", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+        db.add(Tip(topic_id=topic.id, title="Camina", body="Diez minutos.", status="published",
+                   fingerprint=make_fingerprint(topic.id, "Camina", "d")))
+        users = _users(db, "outbox-run", 4, topic.id)
+        broken = users[1].email
+
+        class Flaky(SmtpTransport):
+            down = True
+
+            def send_message(self, to, message):
+                if to == broken and self.down:
+                    raise ConnectionError("421 try later")
+                super().send_message(to, message)
+
+        transport = Flaky(SmtpSettings(host=smtp_sink.host, port=smtp_sink.port,
+                                       from_addr="tips@example.com", use_tls=False, timeout=5))
+        monkeypatch.setattr("app.services.email_digest.get_transport", lambda: transport)
+        picks = []
+        real_pick = DailyBundleSelector.pick
+        monkeypatch.setattr(DailyBundleSelector, "pick",
+                            lambda self, reqs: picks.extend(reqs) or real_pick(self, reqs))
+
+        ours = {u.email for u in users}
+
+        def delivered():
+            return [r[0].strip("<>") for _, r, _ in smtp_sink.received if r[0].strip("<>") in ours]
+
+        send_daily_email_digests(db, day)
+        assert sorted(delivered()) == sorted(ours - {broken})
+        assert {r.user_id for r in picks} >= {u.id for u in users}
+
+        # Relanzar: ni selección ni reenvíos (el fallido espera su backoff)
+        picks.clear()
+        assert send_daily_email_digests(db, day) == 0
+        assert len(delivered()) == 3 and not picks
+
+        # Pasado el backoff, solo sale el que faltaba
+        transport.down = False
+        db.execute(update(EmailOutbox).where(EmailOutbox.digest_date == day)
+                   .values(next_attempt_at=datetime(2000, 1, 1)))
+        db.commit()
+        assert send_daily_email_digests(db, day) == 1
+        assert sorted(delivered()) == sorted(ours) and not picks
+        transport.close()
+    finally:
+        db.close()
+
+
+def test_slow_sends_do_not_outlive_the_lease(smtp_sink, monkeypatch):
+    # 10 msg/s con un lease de 0,3 s: lo que espera en cola vencería sin renovar
+    monkeypatch.setenv("SMTP_HOST", smtp_sink.host)
+    monkeypatch.setattr("app.services.email_digest.EMAIL_LEASE_SECONDS", 0.3)
+    monkeypatch.setattr("app.services.email_digest.EMAIL_RATE_PER_SECOND", 10.0)
+    monkeypatch.setattr("app.services.email_digest.EMAIL_QUEUE_SIZE", 3)
+    monkeypatch.setattr("app.services.email_digest.EMAIL_WORKERS", 1)
+    day = date(2026, 2, 3)
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Outbox lento", slug="email-outbox-slow", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+        db.add(Tip(topic_id=topic.id, title="Respira", body="Cuatro segundos.", status="published",
+                   fingerprint=make_fingerprint(topic.id, "Respira", "d")))
+        users = _users(db, "outbox-slow", 8, topic.id)
+        transport = SmtpTransport(SmtpSettings(host=smtp_sink.host, port=smtp_sink.port,
+                                               from_addr="tips@example.com", use_tls=False,
+                                               timeout=5))
+        monkeypatch.setattr("app.services.email_digest.get_transport", lambda: transport)
+
+        assert send_daily_email_digests(db, day) >= len(users)
+        ours = {u.email for u in users}
+        delivered = [r[0].strip("<>") for _, r, _ in smtp_sink.received
+                     if r[0].strip("<>") in ours]
+        assert sorted(delivered) == sorted(ours)
+        attempts = db.execute(select(EmailOutbox.attempts)
+                              .where(EmailOutbox.digest_date == day)).scalars().all()
+        assert attempts and set(attempts) == {1}
+        transport.close()
+    finally:
+        db.close()
@@ -0,0 +1,215 @@
+"""Descarga concurrente de feeds contra un servidor HTTP local."""
+
+import threading
+import time
+
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.db.models import Feed, Tip, Topic
+from app.db.session import SessionLocal
+from app.services import ingest
+from app.services.feed_fetch import fetch_feeds
+from app.services.topic_catalog import commit_topic_changes
+
+
+def _slow_feed(body, delay):
+    def handler(request):
+        time.sleep(delay)
+        return 200, {"Content-Type": "application/rss+xml"}, body
+    return handler
+
+
+def test_feeds_are_fetched_concurrently(http_server, make_rss):
+    body = make_rss([{"title": "Hola"}])
+    paths = [f"/feed/{i}" for i in range(4)]
+    for path in paths:
+        http_server.route(path, _slow_feed(body, 0.4))
+
+    started = time.perf_counter()
+    results = fetch_feeds([http_server.url(p) for p in paths],
+                          max_concurrency=4, per_host_limit=4)
+    elapsed = time.perf_counter() - started
+
+    assert [r.ok for r in results] == [True] * 4
+    assert [r.url for r in results] == [http_server.url(p) for p in paths]
+    assert elapsed < 1.2  # en serie serían >= 1.6 s
+
+
+def test_per_host_limit_caps_in_flight_requests(http_server, make_rss):
+    body = make_rss([{"title": "Hola"}])
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def handler(request):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.15)
+        with lock:
+            in_flight["now"] -= 1
+        return 200, {}, body
+
+    for i in range(6):
+        http_server.route(f"/h/{i}", handler)
+
+    results = fetch_feeds([http_server.url(f"/h/{i}") for i in range(6)],
+                          max_concurrency=6, per_host_limit=2)
+    assert all(r.ok for r in results)
+    assert in_flight["max"] <= 2
+    # `elapsed` es solo la petición; la cola del límite por host va en `waited`
+    assert all(r.elapsed < 0.3 for r in results)
+    assert max(r.waited for r in results) > 0.2
+
+
+def test_retries_with_backoff_then_succeeds(http_server, make_rss):
+    body = make_rss([{"title": "Hola"}])
+    calls = {"n": 0}
+
+    def flaky(request):
+        calls["n"] += 1
+        if calls["n"] < 3:
+            return 503, {}, b"busy"
+        return 200, {}, body
+
+    http_server.route("/flaky", flaky)
+    http_server.route("/gone", lambda request: (404, {}, b""))
+
+    ok, gone = fetch_feeds([http_server.url("/flaky"), http_server.url("/gone")],
+                           retries=3, backoff=0.01)
+    assert ok.ok and ok.attempts == 3
+    assert not gone.ok and gone.status == 404 and gone.attempts == 1
+
+
+def test_timeout_is_reported_as_error(http_server):
+    http_server.route("/slow", _slow_feed(b"", 1.0))
+    (result,) = fetch_feeds([http_server.url("/slow")], timeout=0.2, retries=0)
+    assert not result.ok
+    assert result.error
+
+
+def test_ingest_all_configured_feeds_parses_after_fetching(http_server, make_rss, monkeypatch):
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Fetch", slug="fetch-concurrente", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        http_server.route("/a", _slow_feed(make_rss([
+            {"title": "Primero", "description": "Uno", "link": "https://example.com/1"},
+            {"title": "Segundo", "description": "Dos"},
+        ]), 0.1))
+        http_server.route("/b", lambda request: (500, {}, b""))
+        monkeypatch.setattr(ingest, "FEEDS_BY_TOPIC_SLUG", {
+            "fetch-concurrente": [http_server.url("/a"), http_server.url("/b")],
+        })
+        monkeypatch.setattr("app.services.feed_fetch.BACKOFF_SECONDS", 0.0)
+
+        assert ingest.ingest_all_configured_feeds(db) == 2
+        titles = {t.title for t in db.query(Tip).filter(Tip.topic_id == topic.id)}
+        assert titles == {"Primero", "Segundo"}
+    finally:
+        db.close()
+
+
+def test_conditional_get_and_high_water_mark(http_server, make_rss, monkeypatch, capsys):
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Condicional", slug="fetch-condicional", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        items = [
+            {"title": "Viejo", "guid": "urn:1", "pubDate": "Mon, 05 Jan 2026 08:00:00 GMT"},
+        ]
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(dict(request.headers))
+            if request.headers.get("If-None-Match") == '"v%d"' % len(items):
+                return 304, {"ETag": '"v%d"' % len(items)}, b""
+            return 200, {"ETag": '"v%d"' % len(items)}, make_rss(items)
+
+        http_server.route("/cond", handler)
+        monkeypatch.setattr(ingest, "FEEDS_BY_TOPIC_SLUG", {
+            "fetch-condicional": [http_server.url("/cond")],
+        })
+
+        url = http_server.url("/cond")
+
+        def make_due():
+            db.execute(update(Feed).where(Feed.url == url)
+                       .values(next_fetch_at=datetime.utcnow()))
+            db.commit()
+
+        assert ingest.ingest_all_configured_feeds(db) == 1
+
+        # Sin cambios: el servidor responde 304 y no se parsea nada
+        make_due()
+        assert ingest.ingest_all_configured_feeds(db) == 0
+        assert seen_headers[-1].get("If-None-Match") == '"v1"'
+        assert "sin_cambios(304)=1" in capsys.readouterr().out
+
+        # Entrada nueva: solo se procesa lo que está por encima de la marca
+        items.insert(0, {"title": "Nuevo", "guid": "urn:2",
+                         "pubDate": "Tue, 06 Jan 2026 08:00:00 GMT"})
+        make_due()
+        assert ingest.ingest_all_configured_feeds(db) == 1
+        out = capsys.readouterr().out
+        assert "entradas=2 entradas_saltadas=1" in out
+
+        titles = {t.title for t in db.query(Tip).filter(Tip.topic_id == topic.id)}
+        assert titles == {"Viejo", "Nuevo"}
+    finally:
+        db.close()
+
+
+def _watermark_feed(db, http_server, make_rss, monkeypatch, slug, items):
+    topic = Topic(name=slug, slug=slug, is_active=True)
+    db.add(topic)
+    commit_topic_changes(db)
+    http_server.route(f"/{slug}", lambda request: (200, {}, make_rss(items)))
+    url = http_server.url(f"/{slug}")
+    monkeypatch.setattr(ingest, "FEEDS_BY_TOPIC_SLUG", {slug: [url]})
+
+    def run():
+        db.execute(update(Feed).where(Feed.url == url).values(next_fetch_at=datetime.utcnow()))
+        db.commit()
+        ingest.ingest_all_configured_feeds(db)
+        return {t.title for t in db.query(Tip).filter(Tip.topic_id == topic.id)}
+
+    return run
+
+
+def test_high_water_mark_on_oldest_first_feed(http_server, make_rss, monkeypatch):
+    db = SessionLocal()
+    try:
+        items = [
+            {"title": "Uno", "guid": "urn:o1", "pubDate": "Mon, 05 Jan 2026 08:00:00 GMT"},
+            {"title": "Dos", "guid": "urn:o2", "pubDate": "Tue, 06 Jan 2026 08:00:00 GMT"},
+        ]
+        run = _watermark_feed(db, http_server, make_rss, monkeypatch, "fetch-antiguo-primero", items)
+        assert run() == {"Uno", "Dos"}
+        feed = db.query(Feed).filter(Feed.url.like("%fetch-antiguo-primero")).one()
+        assert feed.last_entry_id == "urn:o2"
+
+        # La entrada nueva llega al final: no se corta en la primera (la más antigua)
+        items.append({"title": "Tres", "guid": "urn:o3", "pubDate": "Wed, 07 Jan 2026 08:00:00 GMT"})
+        assert run() == {"Uno", "Dos", "Tres"}
+    finally:
+        db.close()
+
+
+def test_high_water_mark_keeps_entries_with_the_same_timestamp(http_server, make_rss, monkeypatch):
+    db = SessionLocal()
+    try:
+        day = "Mon, 05 Jan 2026 00:00:00 GMT"  # feeds que solo dan el día
+        items = [{"title": "Mañana", "guid": "urn:d1", "pubDate": day}]
+        run = _watermark_feed(db, http_server, make_rss, monkeypatch, "fetch-misma-fecha", items)
+        assert run() == {"Mañana"}
+
+        items.insert(0, {"title": "Tarde", "guid": "urn:d2", "pubDate": day})
+        assert run() == {"Mañana", "Tarde"}
+    finally:
+        db.close()
@@ -0,0 +1,138 @@
+"""Planificación adaptativa de feeds y registro en BD."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert
+
+from app.db.models import Feed, Topic
+from app.db.session import SessionLocal
+from app.services import feed_schedule, ingest
+from app.services.feed_schedule import (
+    STATUS_ERROR,
+    STATUS_NOT_MODIFIED,
+    STATUS_OK,
+    due_feeds,
+    record_poll,
+)
+from app.services.feeds import delete_feed, get_feed
+from app.services.topic_catalog import commit_topic_changes
+
+
+def _feed(**kw):
+    values = dict(topic_id=1, url="https://example.com/rss", poll_interval_minutes=360,
+                  failure_streak=0, avg_new_entries=0.0)
+    values.update(kw)
+    return Feed(**values)
+
+
+def test_prolific_feeds_poll_more_often_and_quiet_ones_less():
+    now = datetime(2026, 1, 1, 12, 0)
+    busy = _feed(avg_new_entries=4.0)
+    record_poll(busy, STATUS_OK, new_entries=10, now=now)
+    assert busy.poll_interval_minutes == 180
+    assert busy.next_fetch_at == now + timedelta(minutes=180)
+
+    quiet = _feed()
+    record_poll(quiet, STATUS_NOT_MODIFIED, now=now)
+    assert quiet.poll_interval_minutes == 540
+
+    for _ in range(20):
+        record_poll(quiet, STATUS_OK, new_entries=0, now=now)
+    assert quiet.poll_interval_minutes == feed_schedule.MAX_POLL_MINUTES
+
+
+def test_failures_back_off_without_forgetting_interval():
+    now = datetime(2026, 1, 1, 12, 0)
+    feed = _feed(poll_interval_minutes=60)
+    record_poll(feed, STATUS_ERROR, error="HTTP 500", now=now)
+    record_poll(feed, STATUS_ERROR, error="HTTP 500", now=now)
+    assert feed.failure_streak == 2
+    assert feed.last_error == "HTTP 500"
+    assert feed.next_fetch_at == now + timedelta(minutes=240)
+    assert feed.poll_interval_minutes == 60
+
+    record_poll(feed, STATUS_OK, new_entries=1, now=now)
+    assert feed.failure_streak == 0 and feed.last_error is None
+
+
+def test_run_touches_only_due_feeds(http_server, make_rss, monkeypatch):
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Programados", slug="feeds-programados", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+        topic_id = topic.id
+
+        future = datetime.utcnow() + timedelta(days=1)
+        db.execute(insert(Feed), [
+            {"topic_id": topic_id, "url": f"https://idle.example.com/{i}",
+             "next_fetch_at": future, "created_at": datetime.utcnow()}
+            for i in range(10_000)
+        ])
+        for i in range(3):
+            http_server.route(f"/due/{i}", lambda request, i=i: (
+                200, {}, make_rss([{"title": f"Vencido {i}"}])))
+            db.add(Feed(topic_id=topic_id, url=http_server.url(f"/due/{i}"),
+                        next_fetch_at=datetime.utcnow() - timedelta(minutes=1)))
+        db.commit()
+        monkeypatch.setattr(ingest, "FEEDS_BY_TOPIC_SLUG", {})
+
+        assert ingest.ingest_all_configured_feeds(db) == 3
+        assert sum(http_server.hits.values()) == 3
+
+        polled = db.query(Feed).filter(Feed.url.like(f"{http_server.url('/due')}%")).all()
+        assert all(f.last_status == STATUS_OK and f.next_fetch_at > datetime.utcnow()
+                   for f in polled)
+        # Nada más vence en la siguiente ejecución
+        assert ingest.ingest_all_configured_feeds(db) == 0
+        assert sum(http_server.hits.values()) == 3
+    finally:
+        db.execute(delete(Feed).where(Feed.topic_id == topic_id))
+        db.commit()
+        db.close()
+
+
+def test_deleted_seed_feed_is_not_registered_again(monkeypatch):
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Semillas", slug="feeds-semillas", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+        topic_id = topic.id
+        url = "https://seed.example.com/rss"
+        monkeypatch.setattr(ingest, "FEEDS_BY_TOPIC_SLUG", {"feeds-semillas": [url]})
+
+        ingest.sync_configured_feeds(db)
+        seeded = db.query(Feed).filter(Feed.url == url).one()
+        delete_feed(db, seeded)
+
+        ingest.sync_configured_feeds(db)
+        assert db.query(Feed).filter(Feed.url == url).count() == 1
+        assert get_feed(db, seeded.id) is None
+        assert seeded not in due_feeds(db, datetime.utcnow() + timedelta(days=365))
+    finally:
+        db.execute(delete(Feed).where(Feed.topic_id == topic_id))
+        db.commit()
+        db.close()
+
+
+def test_feeds_of_inactive_topics_are_not_due():
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Pausado", slug="feeds-pausado", is_active=False)
+        db.add(topic)
+        commit_topic_changes(db)
+        topic_id = topic.id
+        feed = Feed(topic_id=topic_id, url="https://paused.example.com/rss",
+                    next_fetch_at=datetime.utcnow() - timedelta(minutes=1))
+        db.add(feed)
+        db.commit()
+
+        assert feed not in due_feeds(db)
+        topic.is_active = True
+        commit_topic_changes(db)
+        assert feed in due_feeds(db)
+    finally:
+        db.execute(delete(Feed).where(Feed.topic_id == topic_id))
+        db.commit()
+        db.close()
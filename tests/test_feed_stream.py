@@ -0,0 +1,103 @@
+"""Lector incremental de feeds: normalización y memoria acotada."""
+
+import io
+import os
+import tracemalloc
+from datetime import datetime
+
+import pytest
+
+from app.db.models import Tip, Topic
+from app.db.session import SessionLocal
+from app.services.feed_stream import iter_feed_entries
+from app.services.ingest import ingest_feed_file
+from app.services.topic_catalog import commit_topic_changes
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom</title>
+  <entry>
+    <id>tag:example.com,2026:1</id>
+    <title>Entrada Atom</title>
+    <link rel="self" href="https://example.com/self"/>
+    <link rel="alternate" href="https://example.com/atom/1"/>
+    <published>2026-01-05T08:00:00+01:00</published>
+    <summary>Resumen Atom</summary>
+  </entry>
+</feed>"""
+
+
+def test_rss_and_atom_entries_are_normalized(make_rss):
+    rss = make_rss([{"title": "Entrada RSS", "description": "Resumen RSS",
+                     "link": "https://example.com/rss/1",
+                     "pubDate": "Mon, 05 Jan 2026 08:00:00 GMT"}])
+    (entry,) = iter_feed_entries(io.BytesIO(rss))
+    assert (entry.id, entry.title, entry.summary) == (
+        "https://example.com/rss/1", "Entrada RSS", "Resumen RSS")
+    assert entry.published == datetime(2026, 1, 5, 8, 0)
+
+    (entry,) = iter_feed_entries(io.BytesIO(ATOM))
+    assert entry.id == "tag:example.com,2026:1"
+    assert entry.link == "https://example.com/atom/1"
+    assert entry.summary == "Resumen Atom"
+    assert entry.published == datetime(2026, 1, 5, 7, 0)
+
+
+def _write_big_feed(path, target_bytes):
+    item = (
+        "<item><title>Consejo {i}</title><guid>urn:tip:{i}</guid>"
+        "<link>https://example.com/{i}</link>"
+        "<description>" + "Texto de relleno para el archivo de pruebas. " * 20 +
+        "</description><pubDate>Mon, 05 Jan 2026 08:00:00 GMT</pubDate></item>\n"
+    )
+    written = 0
+    count = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+                 "<title>Archivo</title>\n")
+        while written < target_bytes:
+            written += fh.write(item.format(i=count))
+            count += 1
+        fh.write("</channel></rss>")
+    return count
+
+
+# 16 MB por defecto; FEED_STREAM_TEST_BYTES=1073741824 para la prueba de 1 GB
+BIG_FEED_BYTES = int(os.getenv("FEED_STREAM_TEST_BYTES", str(16 * 1024 * 1024)))
+
+
+@pytest.mark.skipif(BIG_FEED_BYTES <= 0, reason="FEED_STREAM_TEST_BYTES=0")
+def test_peak_memory_is_independent_of_feed_size(tmp_path):
+    path = tmp_path / "archive.xml"
+    expected = _write_big_feed(path, BIG_FEED_BYTES)
+
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_feed_entries(str(path)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert count == expected
+    # ~100 KB medidos, tanto con 16 MB como con 1 GB
+    assert peak < 1024 * 1024, peak
+
+
+def test_ingest_feed_file_streams_into_batched_insert(tmp_path, make_rss):
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Archivo", slug="ingest-archivo", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        path = tmp_path / "feed.xml"
+        path.write_bytes(make_rss([
+            {"title": f"Consejo de archivo {i}",
+             "description": f"Texto número {i} del volcado, con detalle {i * 13}."}
+            for i in range(25)
+        ]))
+        assert ingest_feed_file(db, topic, str(path), batch_size=10) == 25
+        assert ingest_feed_file(db, topic, str(path), batch_size=10) == 0
+        assert db.query(Tip).filter(Tip.topic_id == topic.id).count() == 25
+    finally:
+        db.close()
@@ -0,0 +1,124 @@
+"""Generación de cuerpos por lotes contra un servidor local con la forma de chat-completions."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app.services import generate, generation_cache
+from app.services.generate import TipRequest, generate_tip_bodies
+
+
+def test_batch_without_api_key_falls_back(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    items = [TipRequest("Título", "Texto\ndel artículo", "nutricion", max_chars=9),
+             TipRequest("Solo título", "", "nutricion")]
+    # Sin API key: resumen extractivo local, sin cortar palabras
+    assert generate_tip_bodies(items) == ["Texto…", "Solo título"]
+    assert generate_tip_bodies([]) == []
+
+
+@pytest.fixture
+def chat_stub(http_server, monkeypatch):
+    pytest.importorskip("openai")
+    lock = threading.Lock()
+    state = {"now": 0, "max": 0}
+
+    def handler(request):
+        payload = json.loads(request.body)
+        prompt = payload["messages"][-1]["content"]
+        with lock:
+            state["now"] += 1
+            state["max"] = max(state["max"], state["now"])
+        time.sleep(0.1)
+        with lock:
+            state["now"] -= 1
+        if "FALLA" in prompt:
+            return 500, {"Content-Type": "application/json"}, b'{"error": {"message": "boom"}}'
+        title = prompt.split("Article title: ", 1)[1].split("\n", 1)[0]
+        body = json.dumps({
+            "id": "chatcmpl-test", "object": "chat.completion", "created": 0,
+            "model": payload["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": f"Tip: {title}"}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode("utf-8")
+        return 200, {"Content-Type": "application/json"}, body
+
+    http_server.route("/v1/chat/completions", handler)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", http_server.url("/v1"))
+    monkeypatch.setattr(generate, "AI_MAX_RETRIES", 0)
+    # Sin caché persistente por defecto: cada test ve peticiones reales
+    monkeypatch.setattr(generation_cache, "ENABLED", False)
+    generate.reset_client()
+    # Crea el cliente aquí: el import del SDK no entra en los tiempos de los tests
+    generate._get_client()
+    yield state
+    generate.reset_client()
+
+
+def test_batch_is_concurrent_bounded_and_isolates_failures(chat_stub):
+    items = [TipRequest(f"Consejo {i}", "texto", "futbol") for i in range(8)]
+    items[3] = TipRequest("FALLA", "texto original", "futbol")
+
+    started = time.perf_counter()
+    bodies = generate_tip_bodies(items, max_concurrency=4)
+    elapsed = time.perf_counter() - started
+
+    assert bodies[3] == "texto original"
+    assert [b for i, b in enumerate(bodies) if i != 3] == [
+        f"Tip: Consejo {i}" for i in range(8) if i != 3]
+    assert chat_stub["max"] <= 4
+    assert elapsed < 0.8  # en serie serían >= 0.8 s
+
+
+def test_cache_makes_repeat_batches_free(chat_stub, http_server, tmp_path):
+    cache = generation_cache.GenerationCache(tmp_path / "ai.sqlite3")
+    items = [TipRequest(f"Consejo {i}", "texto", "futbol") for i in range(5)]
+    items.append(TipRequest("Consejo 0", "  texto ", "futbol"))  # misma clave normalizada
+
+    first = generate_tip_bodies(items, cache=cache)
+    assert http_server.hits["/v1/chat/completions"] == 5
+    assert first[-1] == first[0] == "Tip: Consejo 0"
+
+    reopened = generation_cache.GenerationCache(tmp_path / "ai.sqlite3")
+    assert generate_tip_bodies(items, cache=reopened) == first
+    assert http_server.hits["/v1/chat/completions"] == 5
+    assert reopened.stats()["hits"] == 5 and reopened.stats()["misses"] == 0
+
+
+def test_client_is_reused(chat_stub):
+    first = generate._get_client()
+    generate.generate_tip_body("Uno", "texto", "manga")
+    assert generate._get_client() is first
+
+
+def test_ingest_rewrites_only_new_rows(chat_stub, make_rss, monkeypatch):
+    from app.db.models import Tip, Topic
+    from app.db.session import SessionLocal
+    from app.services import ingest
+    from app.services.feed_fetch import FetchResult
+    from app.services.topic_catalog import commit_topic_changes
+
+    monkeypatch.setattr(ingest, "AI_REWRITE", True)
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Reescritura", slug="ingest-reescritura", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        items = [{"title": "Estira antes de correr",
+                  "description": "Cinco minutos de estiramientos reducen lesiones."}]
+        result = FetchResult(url="fixture://ia", status=200, content=make_rss(items))
+        assert ingest.ingest_fetch_result(db, topic, result) == 1
+        tip = db.query(Tip).filter(Tip.topic_id == topic.id).one()
+        assert tip.body == "Tip: Estira antes de correr"
+
+        # Misma entrada: el fingerprint (del texto original) ya existe, sin llamada
+        stats = ingest.IngestStats()
+        assert ingest.ingest_fetch_result(db, topic, result, stats=stats) == 0
+        assert stats.ai_rewrites == 0
+    finally:
+        db.close()
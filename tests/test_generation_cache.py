@@ -0,0 +1,60 @@
+"""Caché persistente de cuerpos generados (SQLite local)."""
+
+import time
+
+from app.services.generation_cache import GenerationCache, cache_key
+
+
+def test_key_normalizes_inputs_and_includes_model():
+    base = cache_key("Título", "Texto  del\nartículo", "nutricion", 280, "m1")
+    assert cache_key(" Título ", "Texto del artículo", "nutricion", 280, "m1") == base
+    assert cache_key("Título", "Texto del artículo" + "x" * 2000, "nutricion", 280, "m1") != base
+    assert cache_key("Título", "Texto del artículo", "nutricion", 280, "m2") != base
+    assert cache_key("Título", "Texto del artículo", "nutricion", 200, "m1") != base
+    # Solo cuenta lo que llega al prompt (raw_text[:1500])
+    long_a = "a" * 1500 + "cola uno"
+    long_b = "a" * 1500 + "cola dos"
+    assert cache_key("T", long_a, "s", 280, "m") == cache_key("T", long_b, "s", 280, "m")
+
+
+def test_persists_and_counts(tmp_path):
+    path = tmp_path / "ai.sqlite3"
+    cache = GenerationCache(path)
+    assert cache.get("k1") is None
+    cache.put("k1", "cuerpo uno")
+    assert cache.get("k1") == "cuerpo uno"
+    cache.close()
+
+    reopened = GenerationCache(path)
+    assert reopened.get_many(["k1", "k2"]) == {"k1": "cuerpo uno"}
+    stats = reopened.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["bytes"] == len("cuerpo uno")
+
+
+def test_evicts_least_recently_used_when_over_budget(tmp_path):
+    cache = GenerationCache(tmp_path / "ai.sqlite3", max_bytes=100)
+    cache.put_many({f"k{i}": "x" * 20 for i in range(4)})  # 80 bytes
+    time.sleep(0.01)
+    assert cache.get("k0")  # k0 pasa a ser la más reciente
+    time.sleep(0.01)
+    cache.put("k4", "y" * 35)  # 115 > 100: fuera k1 y k2 (queda en 75 <= 90)
+
+    assert set(cache.get_many([f"k{i}" for i in range(5)])) == {"k0", "k3", "k4"}
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["bytes"] == 75 and stats["entries"] == 3
+
+
+def test_hits_cost_microseconds(tmp_path):
+    cache = GenerationCache(tmp_path / "ai.sqlite3")
+    keys = [cache_key(f"T{i}", "texto", "s", 280, "m") for i in range(2000)]
+    cache.put_many({k: "cuerpo generado" for k in keys})
+
+    started = time.perf_counter()
+    for key in keys:
+        assert cache.get(key) is not None
+    per_hit = (time.perf_counter() - started) / len(keys)
+    assert per_hit < 500e-6
+    started = time.perf_counter()
+    assert len(cache.get_many(keys)) == len(keys)
+    assert (time.perf_counter() - started) / len(keys) < 50e-6
@@ -0,0 +1,48 @@
+"""Deduplicado por lotes e inserción masiva de tips en la ingesta."""
+
+from sqlalchemy import event
+
+from app.db.models import Tip, Topic
+from app.db.session import SessionLocal, engine
+from app.services.tips import bulk_insert_tips, make_fingerprint
+from app.services.topic_catalog import commit_topic_changes
+
+
+def _rows(topic_id, titles):
+    return [
+        {"topic_id": topic_id, "title": t, "body": f"Cuerpo {t}",
+         "source_url": None, "fingerprint": make_fingerprint(topic_id, t, f"Cuerpo {t}")}
+        for t in titles
+    ]
+
+
+def test_bulk_insert_dedups_with_one_query_per_chunk():
+    db = SessionLocal()
+    statements = []
+
+    def _count(conn, cursor, statement, params, context, executemany):
+        statements.append(" ".join(statement.split()[:4]).upper())
+
+    try:
+        topic = Topic(name="Bulk", slug="ingest-bulk", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        topic_id = topic.id
+        assert bulk_insert_tips(db, _rows(topic_id, ["a", "b"])).inserted == 2
+
+        # 250 filas: 2 ya existen y una está repetida dentro del lote
+        titles = ["a", "b"] + [f"t{i}" for i in range(247)] + ["t0"]
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            inserted = bulk_insert_tips(db, _rows(topic_id, titles), chunk_size=100)
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+
+        assert inserted.inserted == 247 and inserted.duplicates == 3
+        # por lote: un IN de fingerprints y un INSERT multi-fila de tips
+        assert statements.count("SELECT TIPS.FINGERPRINT FROM TIPS") == 3
+        assert statements.count("INSERT INTO TIPS (TOPIC_ID,") == 3
+        assert db.query(Tip).filter(Tip.topic_id == topic_id).count() == 249
+    finally:
+        db.close()
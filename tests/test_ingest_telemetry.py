@@ -0,0 +1,108 @@
+"""Telemetría de la ingesta: filas por ejecución/feed y el informe de admin."""
+
+import time
+
+from sqlalchemy import select
+
+from app.db.models import Feed, IngestFetch, IngestRun, Topic
+from app.db.session import SessionLocal
+from app.services import article_text, ingest
+from app.services.feed_fetch import FetchResult
+from app.services.ingest_telemetry import FetchTelemetry, percentile
+from app.services.topic_catalog import commit_topic_changes
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) == 0
+
+
+def test_ingest_run_is_recorded_and_reported(client, admin_headers, http_server, make_rss, monkeypatch):
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Telemetria", slug="ingest-telemetria", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        body = make_rss([
+            {"title": "Uno", "description": "Primer consejo del feed lento"},
+            {"title": "Dos", "description": "Segundo consejo del feed lento"},
+        ])
+
+        def slow(request):
+            time.sleep(0.2)
+            return 200, {}, body
+
+        http_server.route("/lento", slow)
+        http_server.route("/roto", lambda request: (500, {}, b""))
+        monkeypatch.setattr(ingest, "FEEDS_BY_TOPIC_SLUG", {
+            "ingest-telemetria": [http_server.url("/lento"), http_server.url("/roto")],
+        })
+        monkeypatch.setattr("app.services.feed_fetch.BACKOFF_SECONDS", 0.0)
+
+        assert ingest.ingest_all_configured_feeds(db) == 2
+
+        run = db.execute(select(IngestRun).order_by(IngestRun.id.desc())).scalars().first()
+        assert run.status == "ok" and run.finished_at is not None
+        assert run.feeds == 2 and run.new_tips == 2
+
+        fetches = {
+            f.feed_id: f for f in db.execute(
+                select(IngestFetch).where(IngestFetch.run_id == run.id)).scalars()
+        }
+        slow_feed = db.execute(
+            select(Feed).where(Feed.url == http_server.url("/lento"))).scalar_one()
+        ok = fetches[slow_feed.id]
+        assert ok.http_status == 200 and ok.bytes == len(body)
+        assert ok.entries_seen == 2 and ok.new_tips == 2 and ok.duplicates == 0
+        assert ok.fetch_ms >= 200
+        broken = [f for f in fetches.values() if f.feed_id != slow_feed.id][0]
+        assert broken.error and broken.new_tips == 0
+    finally:
+        db.close()
+
+    r = client.get("/admin/ingest/runs?runs=1", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    report = r.json()
+    assert [item["id"] for item in report["runs"]] == [run.id]
+    assert len(report["feeds"]) == 2
+    slowest = report["slowest_feeds"][0]
+    assert slowest["url"] == http_server.url("/lento")
+    assert slowest["p50_fetch_ms"] >= 200 and slowest["errors"] == 0
+    assert report["feeds"][1]["errors"] == 1
+
+
+def test_article_and_ai_time_is_not_counted_as_parse(make_rss, monkeypatch):
+    def slow_paragraphs(urls, cache=None):
+        time.sleep(0.3)
+        return {url: "Un párrafo descargado del artículo, con texto suficiente." for url in urls}
+
+    def slow_bodies(requests):
+        time.sleep(0.3)
+        return [None for _ in requests]
+
+    monkeypatch.setattr(article_text, "fetch_first_paragraphs", slow_paragraphs)
+    monkeypatch.setattr(ingest, "generate_tip_bodies", slow_bodies)
+    monkeypatch.setattr(ingest, "AI_REWRITE", True)
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Fases", slug="ingest-fases", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+        content = make_rss([{"title": "Sin resumen", "link": "https://example.com/a"}])
+        telemetry = FetchTelemetry()
+        result = FetchResult(url="fixture://fases", status=200, content=content)
+        ingest.ingest_fetch_result(db, topic, result, telemetry=telemetry)
+
+        assert telemetry.article_seconds >= 0.3 and telemetry.ai_seconds >= 0.3
+        assert telemetry.parse_seconds < 0.3
+    finally:
+        db.close()
+
+
+def test_ingest_runs_requires_admin(client, user_headers):
+    r = client.get("/admin/ingest/runs", headers=user_headers)
+    assert r.status_code in (401, 403)
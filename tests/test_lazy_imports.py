@@ -0,0 +1,30 @@
+"""Los jobs y scripts no deben cargar integraciones pesadas al importarse."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+def _loaded_modules(module: str) -> set[str]:
+    code = f"import {module}, sys; print('\\n'.join(sys.modules))"
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(out.split())
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["app.jobs.daily", "app.scripts.run_ingest", "app.scripts.seed_demo"],
+)
+def test_job_entry_points_skip_heavy_imports(module):
+    loaded = _loaded_modules(module)
+    assert "feedparser" not in loaded
+    assert "openai" not in loaded
+    assert "fastapi" not in loaded
+
+
+def test_generate_does_not_import_openai_without_key():
+    loaded = _loaded_modules("app.services.generate")
+    assert "openai" not in loaded
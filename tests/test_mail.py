@@ -0,0 +1,137 @@
+"""Pool de sesiones SMTP contra un sumidero SMTP local."""
+
+import email
+import re
+import smtplib
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.scripts.smtp_sink import SmtpSink
+from app.services import mail
+from app.services.mail import SmtpSettings, SmtpTransport
+
+
+def _settings(sink, **overrides):
+    values = dict(host=sink.host, port=sink.port, from_addr="tips@example.com",
+                  use_tls=False, timeout=5, pool_size=2)
+    values.update(overrides)
+    return SmtpSettings(**values)
+
+
+def test_sessions_are_reused_with_rset_between_messages(smtp_sink):
+    transport = SmtpTransport(_settings(smtp_sink, user="tips", password="x"))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda i: transport.send(f"u{i}@example.com", f"Asunto {i}", "Hola"),
+                      range(20)))
+    transport.close()
+
+    assert smtp_sink.messages == 20
+    assert transport.connects == smtp_sink.connections <= 2
+    assert smtp_sink.rsets == 20 - smtp_sink.connections
+
+    mail_from, rcpts, data = smtp_sink.received[0]
+    assert mail_from == "<tips@example.com>" and len(rcpts) == 1
+    msg = email.message_from_bytes(data)
+    assert msg["To"] in rcpts[0] and msg["Subject"].startswith("Asunto")
+
+
+def test_reconnects_when_session_drops(smtp_sink):
+    transport = SmtpTransport(_settings(smtp_sink, pool_size=1))
+    transport.send("a@example.com", "Uno", "Hola")
+    # El servidor (o la red) cierra la sesión inactiva
+    idle = transport._idle.get_nowait()
+    idle.smtp.sock.shutdown(socket.SHUT_RDWR)
+    transport._idle.put(idle)
+
+    transport.send("b@example.com", "Dos", "Hola")
+    transport.close()
+    assert smtp_sink.messages == 2 and transport.connects == 2
+
+
+def test_session_renewed_after_max_messages(smtp_sink):
+    transport = SmtpTransport(_settings(smtp_sink, pool_size=1, max_messages_per_session=3))
+    for i in range(7):
+        transport.send(f"u{i}@example.com", "Asunto", "Hola")
+    transport.close()
+    assert smtp_sink.messages == 7 and transport.connects == 3
+
+
+def test_session_in_use_is_closed_when_returned_after_close(smtp_sink):
+    transport = SmtpTransport(_settings(smtp_sink, pool_size=1))
+    smtp_sink.latency = 0.3
+    sending = threading.Thread(target=transport.send, args=("a@example.com", "Uno", "Hola"))
+    sending.start()
+    time.sleep(0.1)
+    transport.close()  # el envío sigue en curso con su sesión
+    sending.join()
+
+    assert smtp_sink.messages == 1
+    assert transport._idle.empty()
+
+
+def test_send_email_reads_env_once(smtp_sink, monkeypatch):
+    monkeypatch.setenv("SMTP_HOST", smtp_sink.host)
+    monkeypatch.setenv("SMTP_PORT", str(smtp_sink.port))
+    monkeypatch.setenv("SMTP_FROM", "tips@example.com")
+    monkeypatch.setenv("SMTP_USE_TLS", "0")
+    mail.close_transport()
+    try:
+        mail.send_email("a@example.com", "Uno", "Hola", "<p>Hola</p>")
+        monkeypatch.setenv("SMTP_HOST", "no-existe.invalid")  # ya no se relee
+        mail.send_email("b@example.com", "Dos", "Hola")
+    finally:
+        mail.close_transport()
+    assert smtp_sink.messages == 2 and smtp_sink.connections == 1
+
+
+def test_digest_renderer_matches_build_message():
+    topic = SimpleNamespace(name="Salud & deporte")
+    tips = [
+        SimpleNamespace(id=1, title="Bebe <agua>", body="Mucha " * 120 + "\nagua.", topic=topic),
+        SimpleNamespace(id=2, title="Duerme", body="Ocho horas.", topic=None),
+    ]
+    subject = "Tips — 2026-01-01 (2 tip(s))"
+    renderer = mail.DigestRenderer()
+
+    def unbound(message):
+        return re.sub(r"=+\d+==", "BOUNDARY", message)
+
+    for to in ("a@example.com", "b@example.com"):
+        expected = mail.build_message("tips@example.com", to, subject,
+                                      *mail.build_tip_digest_bodies(tips, "2026-01-01"))
+        got = renderer.message("tips@example.com", to, subject, tips, "2026-01-01")
+        assert unbound(got) == unbound(expected)
+
+    # Segundo destinatario: mismos fragmentos y mismo cuerpo MIME
+    assert renderer.body_hits == 1
+    assert renderer.bodies(tips[1:], "2026-01-01") == mail.build_tip_digest_bodies(tips[1:], "2026-01-01")
+    assert renderer.fragment_hits == 1
+
+
+def test_sink_failure_injection():
+    with SmtpSink(fail_rate=1.0, fail_code=451) as sink:
+        transport = SmtpTransport(_settings(sink, pool_size=1))
+        with pytest.raises(smtplib.SMTPDataError):
+            transport.send("a@example.com", "Uno", "Hola")
+        transport.close()
+        assert sink.messages == 0 and sink.failures == 1
+
+    # 421 y cortes: el transporte reconecta y reintenta una vez
+    with SmtpSink(fail_rate=0.5, fail_code=421, drop_rate=0.2, seed=3) as sink:
+        transport = SmtpTransport(_settings(sink, pool_size=1))
+        outcomes = []
+        for i in range(30):
+            try:
+                transport.send(f"u{i}@example.com", "Asunto", "Hola")
+                outcomes.append(True)
+            except (smtplib.SMTPException, OSError):
+                outcomes.append(False)
+        transport.close()
+        assert sink.messages == sum(outcomes) > 0
+        assert sink.failures > outcomes.count(False)  # parte se recuperó al reintentar
+        assert transport.connects > 1
@@ -0,0 +1,109 @@
+"""Detección de casi duplicados con MinHash + LSH."""
+
+import pytest
+
+from app.db.models import Tip, Topic
+from app.db.session import SessionLocal
+from app.services import near_dup
+from app.services.tips import bulk_insert_tips, create_tip, make_fingerprint
+from app.services.topic_catalog import commit_topic_changes
+
+STORY = (
+    "Un estudio con 12.000 adultos concluye que caminar 30 minutos al día "
+    "después de comer reduce los picos de glucosa y mejora la digestión, "
+    "sobre todo en personas con resistencia a la insulina o prediabetes."
+)
+
+
+def _row(topic_id, title, body):
+    return {"topic_id": topic_id, "title": title, "body": body, "source_url": None,
+            "fingerprint": make_fingerprint(topic_id, title, body)}
+
+
+@pytest.fixture
+def topic_id():
+    db = SessionLocal()
+    try:
+        count = db.query(Topic).count()
+        topic = Topic(name=f"NearDup {count}", slug=f"near-dup-{count}", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+        return topic.id
+    finally:
+        db.close()
+
+
+def test_signature_similarity_tracks_text_overlap():
+    base = near_dup.signature("Caminar tras comer baja la glucosa", STORY)
+    tweaked = near_dup.signature("Caminar tras comer baja la glucosa (estudio)", STORY)
+    other = near_dup.signature("Cómo elegir zapatillas", "Fíjate en la amortiguación y la talla.")
+    assert near_dup.similarity(base, tweaked) >= near_dup.THRESHOLD
+    assert near_dup.similarity(base, other) < 0.2
+
+
+def test_bulk_insert_rejects_syndicated_copies(topic_id):
+    db = SessionLocal()
+    try:
+        result = bulk_insert_tips(db, [
+            _row(topic_id, "Caminar tras comer baja la glucosa", STORY),
+            # Misma noticia sindicada con el título retocado, en el mismo lote
+            _row(topic_id, "Caminar tras comer baja la glucosa (estudio)", STORY),
+        ])
+        assert result.inserted == 1 and result.near_duplicates == 1
+
+        # Y en una ingesta posterior, contra lo ya guardado
+        later = bulk_insert_tips(db, [
+            _row(topic_id, "CAMINAR tras comer baja la glucosa!", STORY),
+            _row(topic_id, "Dormir bien", "Acuéstate y levántate siempre a la misma hora."),
+        ])
+        assert later.inserted == 1 and later.near_duplicates == 1
+        assert db.query(Tip).filter(Tip.topic_id == topic_id).count() == 2
+    finally:
+        db.close()
+
+
+def test_flag_mode_keeps_near_duplicates_as_draft(topic_id, monkeypatch):
+    monkeypatch.setattr(near_dup, "ACTION", "flag")
+    db = SessionLocal()
+    try:
+        bulk_insert_tips(db, [_row(topic_id, "Caminar tras comer baja la glucosa", STORY)])
+        result = bulk_insert_tips(
+            db, [_row(topic_id, "Caminar tras comer baja la glucosa (estudio)", STORY)])
+        assert result.inserted == 1 and result.flagged == 1
+        statuses = sorted(t.status for t in db.query(Tip).filter(Tip.topic_id == topic_id))
+        assert statuses == ["draft", "published"]
+    finally:
+        db.close()
+
+
+def test_create_tip_rejects_near_duplicate_and_other_topics_are_independent(topic_id):
+    from app.schemas.tip import TipCreate
+
+    db = SessionLocal()
+    try:
+        create_tip(db, TipCreate(topic_id=topic_id, title="Caminar tras comer", body=STORY))
+        with pytest.raises(ValueError, match="Near-duplicate"):
+            create_tip(db, TipCreate(topic_id=topic_id, title="Caminar después de comer", body=STORY))
+
+        other = Topic(name=f"Otro {topic_id}", slug=f"near-dup-otro-{topic_id}", is_active=True)
+        db.add(other)
+        commit_topic_changes(db)
+        create_tip(db, TipCreate(topic_id=other.id, title="Caminar tras comer", body=STORY))
+    finally:
+        db.close()
+
+
+def test_lookup_only_reads_bucket_candidates(topic_id):
+    db = SessionLocal()
+    try:
+        bulk_insert_tips(db, [
+            _row(topic_id, f"Consejo {i}", f"Texto distinto número {i} sobre el tema {i * 7}")
+            for i in range(300)
+        ])
+        sig = near_dup.signature("Caminar tras comer", STORY)
+        buckets = near_dup.band_buckets(topic_id, sig)
+        stored, signatures = near_dup._stored_candidates(db, buckets)
+        assert len(signatures) < 10
+        assert near_dup.find_near_duplicate(db, topic_id, sig) is None
+    finally:
+        db.close()
@@ -0,0 +1,65 @@
+"""Puntuación de calidad por lotes."""
+
+from app.db.models import Tip, Topic
+from app.db.session import SessionLocal
+from app.services import ingest, quality
+from app.services.quality import score_tips, status_for_score
+from app.services.topic_catalog import commit_topic_changes
+
+GOOD = "Bebe un vaso de agua al levantarte para empezar el día bien hidratado."
+
+
+def test_rules_from_quality_doc():
+    titles = ["Agua", "Infusión", "Largo", "Sin resumen", "Gritos", "Corto"]
+    bodies = [
+        GOOD,
+        "Esta infusión CURA la ansiedad y es un remedio MILAGROSO para dormir.",
+        GOOD * 6,
+        "Sin resumen",
+        "¡¡¡ESTE TRUCO TE CAMBIA LA VIDA, PRUÉBALO HOY MISMO!!!",
+        "Duerme más.",
+    ]
+    scores = score_tips(titles, bodies)
+    assert scores[0] == quality.BASE_SCORE
+    assert scores[1] == quality.BASE_SCORE - 2 * quality.CLAIM_PENALTY
+    assert scores[2] == quality.BASE_SCORE - quality.LONG_PENALTY
+    assert scores[3] == (quality.BASE_SCORE - quality.SHORT_PENALTY
+                         - quality.NO_SUMMARY_PENALTY)
+    assert scores[4] == (quality.BASE_SCORE - quality.SHOUTING_PENALTY
+                         - quality.EXCLAMATION_PENALTY)
+    assert scores[5] == quality.BASE_SCORE - quality.SHORT_PENALTY
+    assert [status_for_score(s) for s in scores] == [
+        "published", "draft", "published", "draft", "published", "published"]
+
+
+def test_batch_matches_one_by_one_and_claims_stay_with_their_tip():
+    titles = ["Detox", "", "Normal", "Garantía"]
+    bodies = ["", "", "Nada de curas: curiosidades sobre el curry.", "Resultados GARANTIZADOS."]
+    batch = score_tips(titles, bodies)
+    assert batch == [score_tips([t], [b])[0] for t, b in zip(titles, bodies)]
+    assert score_tips([], []) == []
+
+
+def test_ingest_persists_score_and_drafts_low_quality(http_server, make_rss, monkeypatch):
+    db = SessionLocal()
+    try:
+        topic = Topic(name="Calidad", slug="ingest-calidad", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        http_server.route("/q", lambda request: (200, {}, make_rss([
+            {"title": "Agua al despertar", "description": GOOD},
+            {"title": "Cura milagrosa", "description": "Resultados garantizados: cura todo."},
+        ])))
+        monkeypatch.setattr(ingest, "FEEDS_BY_TOPIC_SLUG", {
+            "ingest-calidad": [http_server.url("/q")],
+        })
+
+        assert ingest.ingest_all_configured_feeds(db) == 2
+        tips = {t.title: t for t in db.query(Tip).filter(Tip.topic_id == topic.id)}
+        assert tips["Agua al despertar"].status == "published"
+        assert tips["Agua al despertar"].quality_score == quality.BASE_SCORE
+        assert tips["Cura milagrosa"].status == "draft"
+        assert tips["Cura milagrosa"].quality_score < quality.PUBLISH_THRESHOLD
+    finally:
+        db.close()
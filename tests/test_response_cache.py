@@ -0,0 +1,67 @@
+"""Tests de la caché HTTP en proceso para los GET públicos."""
+
+from app.api.routes import topics as topics_routes
+from app.core.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    invalidate_public_cache,
+    response_cache,
+)
+
+
+def _entry(size: int) -> CachedResponse:
+    return CachedResponse(body=b"x" * size, headers=(), etag='"e"', stored_at=0.0)
+
+
+def test_lru_evicts_oldest_when_over_byte_budget():
+    cache = ResponseCache(max_bytes=100, ttl=10**9)
+    cache.put("/a", _entry(40))
+    cache.put("/b", _entry(40))
+    assert cache.get("/a") is not None  # /a pasa a ser el más reciente
+    cache.put("/c", _entry(40))
+
+    assert cache.get("/b") is None
+    assert cache.get("/a") is not None
+    assert cache.get("/c") is not None
+    assert cache.current_bytes == 80
+    assert cache.evictions == 1
+
+
+def test_invalidate_by_prefix():
+    cache = ResponseCache(max_bytes=1000, ttl=10**9)
+    cache.put("/tips?page=1", _entry(10))
+    cache.put("/tips/3", _entry(10))
+    cache.put("/topics", _entry(10))
+    cache.invalidate("/tips")
+    assert len(cache) == 1
+    assert cache.get("/topics") is not None
+
+
+def test_get_topics_etag_304_and_hit_skips_route(client, monkeypatch):
+    invalidate_public_cache()
+
+    r1 = client.get("/topics?limit=5&skip=0")
+    assert r1.status_code == 200
+    etag = r1.headers["etag"]
+    assert "max-age" in r1.headers["cache-control"]
+
+    r304 = client.get("/topics?skip=0&limit=5", headers={"If-None-Match": etag})
+    assert r304.status_code == 304
+    assert r304.content == b""
+
+    def _boom(*args, **kwargs):
+        raise AssertionError("cache hit should not reach the route")
+
+    monkeypatch.setattr(topics_routes, "get_topic_catalog", _boom)
+    r2 = client.get("/topics?limit=5&skip=0")
+    assert r2.status_code == 200
+    assert r2.content == r1.content
+    assert r2.headers["etag"] == etag
+    assert response_cache.hits >= 2
+
+
+def test_not_found_responses_are_not_cached(client):
+    invalidate_public_cache()
+    r = client.get("/tips/999999")
+    assert r.status_code == 404
+    assert len(response_cache) == 0
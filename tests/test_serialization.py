@@ -0,0 +1,48 @@
+"""El camino rápido (dict + orjson) produce los mismos bytes que los esquemas."""
+
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.serialize import FastJSONResponse, tip_read_dicts
+from app.schemas.tip import TipList, TipRead, TodayTips
+
+
+def _tips():
+    return [
+        SimpleNamespace(
+            id=1, topic_id=2, title="Ñandú \"comillas\"", body="línea 1\nlínea 2 /  ",
+            status="published", source_url=None, fingerprint=None,
+            created_at=datetime(2026, 3, 1, 9, 0, 0), quality_score=None,
+        ),
+        SimpleNamespace(
+            id=2, topic_id=2, title="Tip", body="Cuerpo",
+            status="draft", source_url="https://example.com/a", fingerprint="ab" * 32,
+            created_at=datetime(2026, 3, 1, 9, 0, 0, 500, tzinfo=timezone.utc),
+            quality_score=72,
+        ),
+    ]
+
+
+def test_tip_list_bytes_match_schema_path():
+    tips = _tips()
+    legacy = JSONResponse(jsonable_encoder(TipList(
+        total=2, page=1, size=20, items=[TipRead.model_validate(t) for t in tips],
+    ))).body
+    fast = FastJSONResponse({
+        "total": 2, "page": 1, "size": 20, "items": tip_read_dicts(tips),
+    }).body
+    assert fast == legacy
+
+
+def test_today_bytes_match_schema_path():
+    tips = _tips()
+    legacy = JSONResponse(jsonable_encoder(TodayTips(
+        date=date(2026, 3, 1), count=2, items=[TipRead.model_validate(t) for t in tips],
+    ))).body
+    fast = FastJSONResponse({
+        "date": date(2026, 3, 1), "count": 2, "items": tip_read_dicts(tips),
+    }).body
+    assert fast == legacy
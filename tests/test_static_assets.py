@@ -0,0 +1,83 @@
+"""Estáticos con hash de contenido, copias precomprimidas y compresión negociada."""
+
+import gzip
+import os
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+from app.core.static_assets import AssetManifest, PrecompressedStaticFiles
+from app.main import _ASSETS
+from app.scripts.build_static import build
+
+
+def _static_app(directory):
+    manifest = AssetManifest(directory)
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=directory, manifest=manifest))
+    return app, manifest
+
+
+def test_index_references_hashed_assets(client):
+    r = client.get("/")
+    assert r.status_code == 200
+    assert _ASSETS.url("app.js") in r.text
+    assert _ASSETS.url("app.js") != "/static/app.js"
+    assert r.headers["cache-control"] == "no-cache"
+
+    r304 = client.get("/", headers={"If-None-Match": r.headers["etag"]})
+    assert r304.status_code == 304
+
+
+def test_hashed_url_is_immutable_and_served_precompressed(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('hola');\n" * 200)
+    build(tmp_path)
+    app, manifest = _static_app(tmp_path)
+
+    with TestClient(app) as c:
+        r = c.get(manifest.url("app.js"), headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200
+        assert r.headers["content-encoding"] == "gzip"
+        assert "immutable" in r.headers["cache-control"]
+        assert r.headers["content-type"].startswith(("application/javascript", "text/javascript"))
+        assert r.text.startswith("console.log")  # httpx descomprime
+
+        plain = c.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.headers["cache-control"] == "no-cache"
+
+
+def test_stale_precompressed_copy_is_ignored(tmp_path):
+    source = tmp_path / "styles.css"
+    source.write_text("body{}")
+    (tmp_path / "styles.css.gz").write_bytes(gzip.compress(b"old"))
+    newer = source.stat().st_mtime + 10
+    os.utime(source, (newer, newer))
+
+    app, manifest = _static_app(tmp_path)
+    with TestClient(app) as c:
+        r = c.get("/static/styles.css", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in r.headers
+        assert r.text == "body{}"
+
+
+def test_json_compressed_only_above_threshold():
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    def big():
+        return {"items": ["tip"] * 500}
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    with TestClient(app) as c:
+        r = c.get("/big", headers={"Accept-Encoding": "gzip"})
+        assert r.headers["content-encoding"] == "gzip"
+        assert r.json()["items"][0] == "tip"
+        assert "content-encoding" not in c.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+        assert "content-encoding" not in c.get("/big", headers={"Accept-Encoding": "identity"}).headers
@@ -0,0 +1,56 @@
+"""Resumen extractivo local (motor sin API y fallback del generador)."""
+
+import random
+import time
+
+from app.services.summarize import split_sentences, summarize, summarize_batch
+
+ARTICLE = (
+    "El Dr. Pérez explica que dormir ocho horas mejora la memoria. "
+    "Según un estudio de la universidad, p. ej. en estudiantes, el sueño profundo "
+    "consolida lo aprendido durante el día. "
+    "Además, la siesta corta de veinte minutos ayuda a recuperar la atención por la tarde. "
+    "El informe se publicó el martes. "
+    "Los autores piden más investigación sobre el sueño y la memoria en adultos mayores."
+)
+
+
+def test_split_sentences_keeps_abbreviations():
+    sentences = split_sentences(ARTICLE)
+    assert len(sentences) == 5
+    assert sentences[0] == "El Dr. Pérez explica que dormir ocho horas mejora la memoria."
+    assert sentences[1].startswith("Según") and "p. ej. en estudiantes" in sentences[1]
+    assert split_sentences("¿Duermes bien? ¡Prueba esto! Funciona.") == [
+        "¿Duermes bien?", "¡Prueba esto!", "Funciona."]
+
+
+def test_picks_whole_informative_sentences_within_limit():
+    summary = summarize(ARTICLE, 200, title="Dormir bien mejora la memoria")
+    assert len(summary) <= 200
+    assert summary.startswith("El Dr. Pérez explica")
+    assert "El informe se publicó el martes." not in summary
+    assert all(s in split_sentences(ARTICLE) for s in split_sentences(summary))
+
+
+def test_short_text_untouched_and_long_sentence_cut_on_word():
+    assert summarize("  Bebe agua\nal levantarte. ", 280) == "Bebe agua al levantarte."
+    assert summarize("", 280, title="Solo título") == "Solo título"
+    cut = summarize(ARTICLE, 60, title="Dormir bien mejora la memoria")
+    assert len(cut) <= 60 and cut.endswith("…")
+    assert cut.startswith("El Dr. Pérez explica") and not cut[:-1].endswith(" ")
+
+
+def test_batch_length_bound_and_throughput():
+    rng = random.Random(3)
+    words = ("agua rutina sueño proteína verdura paseo estiramiento respiración "
+             "fibra descanso hidratación fruta legumbres caminar").split()
+    texts = [
+        " ".join(" ".join(rng.choices(words, k=rng.randint(5, 20))).capitalize() + "."
+                 for _ in range(rng.randint(1, 10)))
+        for _ in range(2000)
+    ]
+    started = time.perf_counter()
+    out = summarize_batch(texts, 280)
+    elapsed = time.perf_counter() - started
+    assert all(0 < len(s) <= 280 for s in out)
+    assert len(texts) / elapsed > 1000  # miles por segundo, sin red
@@ -0,0 +1,67 @@
+"""Tests del snapshot en memoria del catálogo de topics."""
+
+from app.db.models import Topic
+from app.db.session import SessionLocal
+from app.services import topic_catalog
+from app.services.topic_catalog import (
+    bump_topic_catalog_version,
+    commit_topic_changes,
+    get_topic,
+    get_topic_by_slug,
+    get_topic_catalog,
+)
+
+
+def test_commit_topic_changes_bumps_version_and_refreshes_snapshot():
+    db = SessionLocal()
+    try:
+        before = get_topic_catalog(db, force_check=True)
+        topic = Topic(name="Catálogo", slug="catalogo-a", is_active=True)
+        db.add(topic)
+        commit_topic_changes(db)
+
+        after = get_topic_catalog(db)
+        assert after.version == before.version + 1
+        assert after.by_slug["catalogo-a"].id == topic.id
+        assert get_topic(db, topic.id).name == "Catálogo"
+    finally:
+        db.close()
+
+
+def test_other_worker_changes_are_seen_after_poll(monkeypatch):
+    db = SessionLocal()
+    try:
+        snapshot = get_topic_catalog(db, force_check=True)
+
+        # Otro worker: escribe y sube la versión sin tocar nuestro snapshot.
+        topic = Topic(name="Remoto", slug="catalogo-remoto", is_active=False)
+        db.add(topic)
+        bump_topic_catalog_version(db)
+        db.commit()
+
+        monkeypatch.setattr(topic_catalog, "POLL_SECONDS", 3600)
+        assert get_topic_catalog(db) is snapshot  # aún dentro del intervalo
+
+        monkeypatch.setattr(topic_catalog, "POLL_SECONDS", 0)
+        refreshed = get_topic_catalog(db)
+        assert refreshed.version == snapshot.version + 1
+        assert refreshed.by_id[topic.id].is_active is False
+    finally:
+        db.close()
+
+
+def test_lookup_miss_forces_version_check(monkeypatch):
+    db = SessionLocal()
+    try:
+        get_topic_catalog(db, force_check=True)
+        monkeypatch.setattr(topic_catalog, "POLL_SECONDS", 3600)
+
+        topic = Topic(name="Nuevo", slug="catalogo-nuevo", is_active=True)
+        db.add(topic)
+        bump_topic_catalog_version(db)
+        db.commit()
+
+        assert get_topic_by_slug(db, "catalogo-nuevo").id == topic.id
+        assert get_topic(db, 10**9) is None
+    finally:
+        db.close()